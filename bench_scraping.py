@@ -0,0 +1,93 @@
+"""
+Benchmark dos backends de scraping (ver scraping.py).
+
+Compara, em páginas sintéticas com a estrutura do steamcharts e da página
+"About" da Twitch, o tempo de cada backend instalado analisando o documento
+inteiro e apenas os trechos de interesse (extração direcionada).
+
+Uso:
+    python bench_scraping.py [--repeat N] [--rows N] [--panels N]
+"""
+import argparse
+import time
+
+import scraping
+
+def build_steamcharts_page(rows=150, noise=400):
+    """Página com a tabela common-table cercada de marcação irrelevante."""
+    parts = ["<html><head><title>Steam Charts</title>"]
+    parts.extend(f"<script>var x{i} = {{a: {i}, b: '<div>'}};</script>" for i in range(noise // 10))
+    parts.append("</head><body><div id='nav'>")
+    parts.extend(f"<div class='app'><a href='/app/{i}'><img src='/img/{i}.jpg'> Jogo {i}</a></div>" for i in range(noise))
+    parts.append("</div><table class='common-table'><thead><tr><th>Month</th><th>Avg. Players</th>"
+                 "<th>Gain</th><th>% Gain</th><th>Peak Players</th></tr></thead><tbody>")
+    parts.append("<tr><td class='month-cell left'>Last 30 Days</td><td class='right num-f'>12,345.67</td>"
+                 "<td class='right num-p gainorloss'>-</td><td class='right gainorloss'>-</td><td class='right num'>23,456</td></tr>")
+    months = ["January", "February", "March", "April", "May", "June", "July", "August",
+              "September", "October", "November", "December"]
+    for i in range(rows):
+        parts.append(f"<tr><td class='month-cell left'>{months[i % 12]} {2026 - i // 12}</td>"
+                     f"<td class='right num-f'>{10000 + i:,}.5</td><td class='right num-p gainorloss'>+{i}.2</td>"
+                     f"<td class='right gainorloss'>+{i % 10}.1%</td><td class='right num'>{20000 + i:,}</td></tr>")
+    parts.append("</tbody></table>")
+    parts.extend(f"<div class='footer'><p>Texto {i}</p></div>" for i in range(noise))
+    parts.append("</body></html>")
+    return "".join(parts)
+
+def build_twitch_about_page(panels=12, noise=2000):
+    """Página com alguns painéis panel-description no meio de muita marcação."""
+    parts = ["<html><head>"]
+    parts.extend(f"<script>window.__state{i} = {{\"k\": \"{'x' * 40}\"}};</script>" for i in range(noise // 20))
+    parts.append("</head><body><div id='root'>")
+    for i in range(noise):
+        parts.append(f"<div class='tw-flex'><span class='tw-title'>Item {i}</span><a href='/c/{i}'>link</a></div>")
+        if i % (noise // panels) == 0:
+            parts.append(f"<div class='default-panel'><div class='panel-description'><p>CPU: Ryzen {i}</p>"
+                         f"<div><p>GPU: RTX {i}</p></div><ul><li>Mic</li><li>Cam</li></ul></div></div>")
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+def measure(function, repeat):
+    """Melhor tempo (em ms) entre repeat execuções."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=150)
+    parser.add_argument("--panels", type=int, default=12)
+    args = parser.parse_args()
+
+    pages = {
+        "steamcharts (common-table)": (
+            build_steamcharts_page(args.rows),
+            lambda html, backend, targeted: scraping.find_table_rows(html, "common-table", backend, targeted),
+        ),
+        "twitch about (panel-description)": (
+            build_twitch_about_page(args.panels),
+            lambda html, backend, targeted: scraping.find_texts(html, "div", "panel-description", backend, targeted),
+        ),
+    }
+
+    print(f"Backends disponíveis: {', '.join(scraping.available_backends())}")
+    for name, (html, extract) in pages.items():
+        print(f"\n{name}: {len(html) / 1024:.0f} KB")
+        print(f"{'backend':<12}{'modo':<12}{'ms/página':>12}{'vs bs4':>10}")
+        reference = extract(html, "bs4", False)
+        baseline = measure(lambda: extract(html, "bs4", False), args.repeat)
+        for backend in scraping.available_backends():
+            for targeted in (False, True):
+                if extract(html, backend, targeted) != reference:
+                    print(f"{backend:<12}{'direcionado' if targeted else 'completo':<12}  resultado diferente do bs4!")
+                    continue
+                elapsed = measure(lambda: extract(html, backend, targeted), args.repeat)
+                mode = "direcionado" if targeted else "completo"
+                print(f"{backend:<12}{mode:<12}{elapsed:>12.2f}{baseline / elapsed:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark dos coletores de vários jogos do steam.py.
+
+Compara a coleta antiga (um jogo por vez, com pd.concat a cada jogo) com os
+coletores em streaming (jogos em paralelo, registros acumulados em colunas e
+um único DataFrame no final), medindo tempo e pico de memória alocada.
+
+As respostas da rede são simuladas com uma latência fixa, então o resultado
+mede só o custo de coleta e montagem dos dados.
+
+Uso:
+    python bench_steam_collectors.py [--apps N] [--months N] [--latency MS]
+"""
+import argparse
+import time
+import tracemalloc
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+import steam
+
+def fake_historical_data(months, latency):
+    """get_historical_data simulado: months meses por jogo após latency segundos."""
+    dates = pd.date_range(end="2026-10-01", periods=months, freq="MS")[::-1]
+    rng = np.random.default_rng(0)
+
+    def fetch(app_id):
+        time.sleep(latency)
+        return pd.DataFrame({
+            "Mês": dates,
+            "Jogadores Médios": rng.uniform(0, 10000, months),
+            "Jogadores Pico": rng.integers(0, 20000, months),
+            "Alteração": rng.normal(0, 100, months),
+            "Alteração (%)": rng.normal(0, 5, months),
+            "Parcial": np.arange(months) == 0,
+        })
+    return fetch
+
+def fake_get_json(players, games_per_player, latency):
+    """_get_json simulado para as APIs de reviews e de jogos recentes."""
+    def fetch(url, params=None):
+        time.sleep(latency)
+        if "appreviews" in url:
+            return {"reviews": [{"author": {"steamid": str(i)}} for i in range(players)]}
+        seed = int(params["steamid"])
+        return {"response": {"games": [
+            {"name": f"Jogo {(seed + i) % 500}", "appid": (seed + i) % 500} for i in range(games_per_player)
+        ]}}
+    return fetch
+
+def legacy_historical_data_for_games(app_ids):
+    """Implementação anterior: sequencial, com pd.concat a cada jogo."""
+    aggregated_data = pd.DataFrame()
+    for app_id in app_ids:
+        game_data = steam.get_historical_data(app_id)
+        game_data["AppID"] = app_id
+        aggregated_data = pd.concat([aggregated_data, game_data], ignore_index=True)
+    return aggregated_data
+
+def legacy_recent_games_for_multiple_apps(app_ids, api_key, num_players=10):
+    """Implementação anterior: sequencial, um DataFrame por jogo."""
+    all_data = []
+    for app_id in app_ids:
+        counts = steam._count_recent_games(app_id, api_key, num_players) or Counter()
+        df = pd.DataFrame(
+            [{"Nome do jogo": name, "ID_steam do jogo": appid, "Contagem de jogadores": count}
+             for (name, appid), count in counts.items()],
+            columns=["Nome do jogo", "ID_steam do jogo", "Contagem de jogadores"],
+        )
+        if not df.empty:
+            df["Origem do App"] = app_id
+            all_data.append(df)
+    return pd.concat(all_data, ignore_index=True)
+
+def measure(function):
+    """Executa a função e retorna (resultado, segundos, pico de memória em MB)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", type=int, default=1000)
+    parser.add_argument("--months", type=int, default=120)
+    parser.add_argument("--players", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=2.0, help="Latência simulada por requisição (ms)")
+    args = parser.parse_args()
+
+    latency = args.latency / 1000
+    app_ids = list(range(args.apps))
+    steam.get_historical_data = fake_historical_data(args.months, latency)
+    steam._get_json = fake_get_json(args.players, 5, latency)
+
+    benchmarks = [
+        ("histórico", lambda: legacy_historical_data_for_games(app_ids),
+         lambda: steam.get_historical_data_for_games(app_ids)),
+        ("jogos recentes", lambda: legacy_recent_games_for_multiple_apps(app_ids, "key", args.players),
+         lambda: steam.get_recent_games_for_multiple_apps(app_ids, "key", args.players)),
+    ]
+
+    print(f"{args.apps} apps, latência simulada de {args.latency} ms por requisição")
+    print(f"{'coletor':<16}{'versão':<12}{'linhas':>10}{'tempo (s)':>12}{'pico (MB)':>12}")
+    for name, legacy, current in benchmarks:
+        for version, function in (("anterior", legacy), ("streaming", current)):
+            result, elapsed, peak = measure(function)
+            print(f"{name:<16}{version:<12}{len(result):>10}{elapsed:>12.2f}{peak:>12.1f}")
+
+if __name__ == "__main__":
+    main()
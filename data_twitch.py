@@ -1,6 +1,7 @@
-import requests
+import http_client
+import scraping
+import token_cache
 import pandas as pd
-from bs4 import BeautifulSoup
 import os
 from dotenv import load_dotenv
 
@@ -11,18 +12,18 @@ load_dotenv()
 TWITCH_TOKEN_URL = os.getenv('TWITCH_TOKEN_URL', 'https://id.twitch.tv/oauth2/token')
 TWITCH_API_BASE_URL = os.getenv('TWITCH_API_BASE_URL', 'https://api.twitch.tv/helix')
 
-def get_twitch_auth_token(client_id, client_secret):
+def _request_twitch_auth_token(client_id, client_secret):
     """
-    Obtém token de autenticação da API da Twitch.
+    Solicita um novo token de autenticação à API da Twitch.
     
     Args:
         client_id (str): Client ID da aplicação registrada na Twitch
         client_secret (str): Client Secret da aplicação registrada na Twitch
         
     Returns:
-        str: Token de acesso ou None se falhar
+        tuple: (token de acesso ou None se falhar, validade em segundos)
     """
-    response = requests.post(TWITCH_TOKEN_URL, {
+    response = http_client.post(TWITCH_TOKEN_URL, {
         'client_id': client_id,
         'client_secret': client_secret,
         'grant_type': 'client_credentials'
@@ -30,9 +31,52 @@ def get_twitch_auth_token(client_id, client_secret):
     
     if response.status_code != 200:
         print(f"Falha ao obter token: {response.status_code} - {response.text}")
-        return None
+        return None, None
+        
+    data = response.json()
+    return data['access_token'], data.get('expires_in')
+
+def get_twitch_auth_token(client_id, client_secret):
+    """
+    Obtém token de autenticação da API da Twitch.
+    
+    O token fica em cache no processo até expirar e é renovado em segundo
+    plano pouco antes da expiração.
+    
+    Args:
+        client_id (str): Client ID da aplicação registrada na Twitch
+        client_secret (str): Client Secret da aplicação registrada na Twitch
+        
+    Returns:
+        str: Token de acesso ou None se falhar
+    """
+    return token_cache.get_token(
+        "twitch", client_id, client_secret, None,
+        lambda: _request_twitch_auth_token(client_id, client_secret)
+    )
+
+def _helix_get(url, headers):
+    """
+    Faz um GET na API Helix da Twitch.
+    
+    Em caso de HTTP 401 (token revogado ou trocado) renova o token e tenta
+    novamente uma vez. Os headers são atualizados no lugar, então as
+    chamadas seguintes com o mesmo dicionário já usam o token novo.
+    
+    Args:
+        url (str): URL da requisição
+        headers (dict): Headers com Client-ID e Authorization
         
-    return response.json()['access_token']
+    Returns:
+        requests.Response: Resposta da requisição
+    """
+    response = http_client.get(url, headers=headers)
+    if response.status_code == 401:
+        renewed = token_cache.refresh_authorization(headers)
+        if renewed is not None:
+            headers.update(renewed)
+            response = http_client.get(url, headers=headers)
+    return response
 
 def search_game_ids(game_names, client_id, client_secret):
     """
@@ -63,7 +107,7 @@ def search_game_ids(game_names, client_id, client_secret):
     # Buscar IDs para cada jogo pelo nome
     for game_name in game_names:
         url = f'{TWITCH_API_BASE_URL}/games?name={game_name}'
-        response = requests.get(url, headers=headers)
+        response = _helix_get(url, headers)
         
         if response.status_code == 200:
             games = response.json().get('data', [])
@@ -110,7 +154,7 @@ def get_twitch_channel_data_bulk(channel_names, client_id, client_secret):
         try:
             # Buscar dados básicos do canal pela API
             url = f'{TWITCH_API_BASE_URL}/users?login={channel_name}'
-            response = requests.get(url, headers=headers)
+            response = _helix_get(url, headers)
             
             if response.status_code != 200:
                 print(f"Erro ao buscar dados do canal '{channel_name}': {response.status_code}")
@@ -126,7 +170,7 @@ def get_twitch_channel_data_bulk(channel_names, client_id, client_secret):
             
             # Adicionar `view_count` corretamente (API de streams)
             streams_url = f"{TWITCH_API_BASE_URL}/streams?user_id={channel_info['id']}"
-            streams_response = requests.get(streams_url, headers=headers)
+            streams_response = _helix_get(streams_url, headers)
             
             if streams_response.status_code == 200:
                 stream_data = streams_response.json().get('data', [])
@@ -141,12 +185,11 @@ def get_twitch_channel_data_bulk(channel_names, client_id, client_secret):
             setup_texts = []
             try:
                 about_url = f"https://www.twitch.tv/{channel_name}/about"
-                about_response = requests.get(about_url)
+                about_response = http_client.get(about_url)
                 
                 if about_response.status_code == 200:
-                    soup = BeautifulSoup(about_response.text, 'html.parser')
-                    panels = soup.find_all('div', class_='panel-description')  # Atualizar classe conforme necessário
-                    setup_texts = [panel.get_text(strip=True) for panel in panels]
+                    # Atualizar classe conforme necessário
+                    setup_texts = scraping.find_texts(about_response.text, 'div', 'panel-description')
                 else:
                     print(f"Erro ao acessar página 'About' do canal '{channel_name}': {about_response.status_code}")
             except Exception as e:
@@ -189,7 +232,7 @@ def get_twitch_game_data(game_name, client_id, client_secret):
         'Authorization': f'Bearer {access_token}'
     }
     
-    response = requests.get(url, headers=headers)
+    response = _helix_get(url, headers)
     
     # Verificar se a chamada foi bem-sucedida
     if response.status_code == 200:
@@ -241,7 +284,7 @@ def get_live_streams_for_games(game_ids, client_id, client_secret, language='pt'
             if pagination_cursor:
                 paginated_url += f'&after={pagination_cursor}'
                 
-            response = requests.get(paginated_url, headers=headers)
+            response = _helix_get(paginated_url, headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -309,7 +352,7 @@ def get_top_games(client_id, client_secret, first=100):
         if pagination_cursor:
             paginated_url += f'&after={pagination_cursor}'
             
-        response = requests.get(paginated_url, headers=headers)
+        response = _helix_get(paginated_url, headers)
         
         if response.status_code == 200:
             data = response.json()
@@ -0,0 +1,139 @@
+import os
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Configurações padrão do pool de conexões (podem ser alteradas com configure)
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+
+_settings = {
+    "pool_size": HTTP_POOL_SIZE,
+    "timeout": (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT),
+    "max_retries": HTTP_MAX_RETRIES,
+}
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def _host_key(url):
+    """Retorna a chave (esquema, host, porta) usada para agrupar as sessões."""
+    parts = urlsplit(url)
+    return (parts.scheme, parts.hostname, parts.port)
+
+def _new_session():
+    """Cria uma sessão com um pool de conexões keep-alive."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=_settings["pool_size"],
+        max_retries=_settings["max_retries"],
+        pool_block=False,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def configure(pool_size=None, timeout=None, max_retries=None):
+    """
+    Altera a configuração do pool de conexões. As sessões existentes são
+    fechadas e recriadas com a nova configuração no próximo uso.
+
+    Args:
+        pool_size (int): Número máximo de conexões mantidas por host
+        timeout (float | tuple): Timeout padrão (conexão, leitura) em segundos
+        max_retries (int): Número de novas tentativas em falhas de conexão
+    """
+    if pool_size is not None:
+        _settings["pool_size"] = pool_size
+    if timeout is not None:
+        _settings["timeout"] = timeout
+    if max_retries is not None:
+        _settings["max_retries"] = max_retries
+    close_all()
+
+def get_session(url):
+    """
+    Retorna a sessão compartilhada para o host da URL.
+
+    Args:
+        url (str): URL da requisição
+
+    Returns:
+        requests.Session: Sessão com pool de conexões para o host
+    """
+    key = _host_key(url)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _new_session()
+            _sessions[key] = session
+    return session
+
+def request(method, url, **kwargs):
+    """
+    Faz uma requisição HTTP reaproveitando as conexões abertas com o host.
+
+    Aceita os mesmos argumentos de requests.request. Se timeout não for
+    informado, usa o timeout padrão configurado.
+
+    Returns:
+        requests.Response: Resposta da requisição
+    """
+    kwargs.setdefault("timeout", _settings["timeout"])
+    return get_session(url).request(method, url, **kwargs)
+
+def get(url, params=None, **kwargs):
+    """Faz um GET usando o pool de conexões compartilhado."""
+    return request("GET", url, params=params, **kwargs)
+
+def post(url, data=None, json=None, **kwargs):
+    """Faz um POST usando o pool de conexões compartilhado."""
+    return request("POST", url, data=data, json=json, **kwargs)
+
+def get_pool_stats():
+    """
+    Retorna estatísticas de uso dos pools de conexões por host.
+
+    Um "hit" é uma requisição que reaproveitou uma conexão já aberta e um
+    "miss" é uma requisição que precisou abrir uma nova conexão (TCP + TLS).
+
+    Returns:
+        dict: Estatísticas por host (requests, hits, misses, hit_rate)
+    """
+    with _sessions_lock:
+        sessions = list(_sessions.items())
+
+    stats = {}
+    for (scheme, host, port), session in sessions:
+        adapter = session.get_adapter(f"{scheme}://{host}")
+        pools = adapter.poolmanager.pools
+        total_requests = 0
+        total_connections = 0
+        for pool_key in pools.keys():
+            pool = pools.get(pool_key)
+            if pool is None:
+                continue
+            total_requests += pool.num_requests
+            total_connections += pool.num_connections
+
+        label = f"{scheme}://{host}" + (f":{port}" if port else "")
+        hits = max(total_requests - total_connections, 0)
+        stats[label] = {
+            "requests": total_requests,
+            "hits": hits,
+            "misses": total_connections,
+            "hit_rate": hits / total_requests if total_requests else 0.0,
+        }
+    return stats
+
+def close_all():
+    """Fecha todas as sessões e conexões abertas."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
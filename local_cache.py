@@ -0,0 +1,314 @@
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+# Diretório base dos caches locais (snapshots, índices, etc.)
+CACHE_DIR = os.getenv("AGENT_GAMES_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "agent-games"))
+# Intervalo em segundos entre as limpezas das entradas expiradas de um KeyValueStore
+CACHE_PURGE_INTERVAL = float(os.getenv("AGENT_GAMES_CACHE_PURGE_INTERVAL", "3600"))
+
+def cache_path(*parts):
+    """
+    Retorna um caminho dentro do diretório de cache, criando o diretório pai.
+
+    Args:
+        *parts (str): Partes do caminho relativas a CACHE_DIR
+
+    Returns:
+        str: Caminho absoluto
+    """
+    path = os.path.join(CACHE_DIR, *[str(part) for part in parts])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+def read_json(path, default=None):
+    """
+    Lê um arquivo JSON do cache.
+
+    Args:
+        path (str): Caminho do arquivo
+        default: Valor retornado se o arquivo não existir ou estiver corrompido
+
+    Returns:
+        Conteúdo do arquivo ou default
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return default
+
+def write_json(path, data):
+    """
+    Grava um arquivo JSON de forma atômica (arquivo temporário + rename).
+
+    Args:
+        path (str): Caminho do arquivo
+        data: Conteúdo serializável em JSON
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+@contextmanager
+def atomic_directory(directory):
+    """
+    Prepara a gravação atômica de um diretório.
+
+    Os arquivos são escritos no diretório temporário retornado, que ao final
+    do bloco substitui o destino com os.replace. Se o bloco falhar, o destino
+    não é alterado.
+
+    Args:
+        directory (str): Diretório de destino
+
+    Yields:
+        str: Diretório temporário onde os arquivos devem ser escritos
+    """
+    directory = os.path.normpath(directory)
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    tmp_directory = tempfile.mkdtemp(dir=parent, prefix=f".{os.path.basename(directory)}.", suffix=".tmp")
+    try:
+        yield tmp_directory
+        _replace_directory(tmp_directory, directory)
+    except BaseException:
+        remove_tree(tmp_directory)
+        raise
+
+def save_columns(directory, frame):
+    """
+    Grava um DataFrame como um arquivo .npy por coluna, para leitura com memory-map.
+
+    Colunas categóricas são gravadas como códigos, e as categorias ficam em columns.json.
+
+    A gravação é atômica (ver atomic_directory): leitores com memory-map de
+    uma versão anterior continuam lendo os arquivos antigos, que nunca são
+    sobrescritos no lugar.
+
+    Args:
+        directory (str): Diretório de destino (criado se não existir)
+        frame (DataFrame): Dados a gravar
+    """
+    with atomic_directory(directory) as tmp_directory:
+        schema = []
+        for position, column in enumerate(frame.columns):
+            values = frame[column]
+            entry = {"name": column, "file": f"{position}.npy"}
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                entry["categories"] = [str(category) for category in values.cat.categories]
+                array = values.cat.codes.to_numpy()
+            else:
+                array = values.to_numpy()
+            np.save(os.path.join(tmp_directory, entry["file"]), array, allow_pickle=False)
+            schema.append(entry)
+        write_json(os.path.join(tmp_directory, "columns.json"), schema)
+
+def _replace_directory(source, target):
+    """Move source para target, substituindo um diretório target já existente."""
+    try:
+        os.replace(source, target)
+        return
+    except OSError:
+        if not os.path.isdir(target):
+            raise
+    # os.replace não substitui diretórios não vazios: o antigo é renomeado e removido depois
+    stale = tempfile.mkdtemp(dir=os.path.dirname(target), prefix=f".{os.path.basename(target)}.", suffix=".old")
+    os.rmdir(stale)
+    os.replace(target, stale)
+    os.replace(source, target)
+    remove_tree(stale)
+
+def load_columns(directory, mmap=True):
+    """
+    Lê um DataFrame gravado com save_columns.
+
+    Args:
+        directory (str): Diretório com os arquivos das colunas
+        mmap (bool): Se True, mapeia os arquivos em memória em vez de lê-los
+
+    Returns:
+        DataFrame: Dados gravados (ou None se o diretório não existir)
+    """
+    schema = read_json(os.path.join(directory, "columns.json"))
+    if schema is None:
+        return None
+
+    columns = {}
+    for entry in schema:
+        array = np.load(os.path.join(directory, entry["file"]), mmap_mode="r" if mmap else None, allow_pickle=False)
+        if "categories" in entry:
+            columns[entry["name"]] = pd.Categorical.from_codes(array, categories=entry["categories"])
+        else:
+            columns[entry["name"]] = array
+    return pd.DataFrame(columns, copy=False)
+
+def remove_tree(directory):
+    """Remove um diretório do cache, ignorando arquivos ainda em uso."""
+    shutil.rmtree(directory, ignore_errors=True)
+
+class SQLiteStore:
+    """
+    Base dos armazenamentos persistentes em SQLite do cache local.
+
+    Cada thread usa sua própria conexão (em modo WAL), então a mesma instância
+    pode ser usada por vários workers. As subclasses definem as tabelas em
+    SCHEMA, criadas na primeira conexão.
+    """
+
+    # Comandos executados ao abrir cada conexão (CREATE TABLE/INDEX IF NOT EXISTS)
+    SCHEMA = ()
+    # Número máximo de parâmetros por consulta em _select_in
+    _BATCH_SIZE = 500
+
+    def __init__(self, name):
+        """
+        Args:
+            name (str): Nome do arquivo de cache (sem extensão)
+        """
+        self.name = name
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(cache_path(f"{self.name}.sqlite3"), timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+            self._local.connection = connection
+        return connection
+
+    def _select_in(self, query, keys, *params):
+        """
+        Executa uma consulta com uma lista IN em lotes de _BATCH_SIZE chaves.
+
+        Args:
+            query (str): Consulta com "{placeholders}" no lugar da lista IN
+            keys (iterable): Valores da lista IN
+            *params: Parâmetros da consulta após a lista IN
+
+        Yields:
+            tuple: Linhas de todos os lotes
+        """
+        keys = list(keys)
+        connection = self._connection()
+        for start in range(0, len(keys), self._BATCH_SIZE):
+            batch = keys[start:start + self._BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            yield from connection.execute(query.format(placeholders=placeholders), (*batch, *params))
+
+class KeyValueStore(SQLiteStore):
+    """
+    Cache persistente chave/valor em SQLite, com validade opcional.
+
+    Os valores são serializados em JSON. Com ttl, as entradas expiradas são
+    removidas do arquivo na primeira conexão e depois a cada
+    CACHE_PURGE_INTERVAL segundos.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS entries_by_updated_at ON entries (updated_at)",
+    )
+
+    def __init__(self, name, ttl=None):
+        """
+        Args:
+            name (str): Nome do arquivo de cache (sem extensão)
+            ttl (float): Validade das entradas em segundos (None = sem expiração)
+        """
+        super().__init__(name)
+        self.ttl = ttl
+        self._next_purge = 0.0
+
+    def _connection(self):
+        connection = super()._connection()
+        if self.ttl is not None and time.time() >= self._next_purge:
+            self._next_purge = time.time() + CACHE_PURGE_INTERVAL
+            self._purge_expired(connection)
+        return connection
+
+    def _purge_expired(self, connection):
+        with connection:
+            return connection.execute("DELETE FROM entries WHERE updated_at < ?", (self._min_updated_at(),)).rowcount
+
+    def purge_expired(self):
+        """
+        Remove as entradas expiradas do arquivo de cache.
+
+        Returns:
+            int: Número de entradas removidas
+        """
+        if self.ttl is None:
+            return 0
+        return self._purge_expired(self._connection())
+
+    def _min_updated_at(self):
+        return time.time() - self.ttl if self.ttl is not None else float("-inf")
+
+    def get(self, key, default=None):
+        """
+        Retorna o valor de uma chave (ou default se ausente/expirado).
+        """
+        row = self._connection().execute(
+            "SELECT value FROM entries WHERE key = ? AND updated_at >= ?", (key, self._min_updated_at())
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def get_many(self, keys):
+        """
+        Retorna os valores de várias chaves de uma vez.
+
+        Args:
+            keys (iterable): Chaves a consultar
+
+        Returns:
+            dict: Valores encontrados (chaves ausentes ou expiradas são omitidas)
+        """
+        rows = self._select_in(
+            "SELECT key, value FROM entries WHERE key IN ({placeholders}) AND updated_at >= ?",
+            keys, self._min_updated_at(),
+        )
+        return {key: json.loads(value) for key, value in rows}
+
+    def set(self, key, value):
+        """Grava o valor de uma chave."""
+        self.set_many({key: value})
+
+    def set_many(self, items):
+        """
+        Grava vários valores em uma única transação.
+
+        Args:
+            items (dict): Valores por chave
+        """
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, updated_at) VALUES (?, ?, ?)",
+                [(key, json.dumps(value, ensure_ascii=False), now) for key, value in items.items()],
+            )
+
+    def delete(self, key):
+        """Remove uma chave."""
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM entries WHERE key = ?", (key,))
@@ -0,0 +1,183 @@
+import threading
+import time
+from contextlib import contextmanager
+
+class TokenBucket:
+    """
+    Limitador de taxa do tipo token bucket, seguro para uso entre threads.
+
+    Cada requisição consome um token. Os tokens são repostos continuamente à
+    taxa `rate` por segundo, até o máximo de `capacity`.
+
+    Chamadas prioritárias (ver priority e consume) não esperam pelo bucket,
+    mas descontam do mesmo saldo; chamadas em segundo plano
+    (acquire(background=True)) esperam enquanto houver chamadas prioritárias
+    em andamento e só usam o saldo que sobrar.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._priority_active = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens=1, background=False):
+        """
+        Bloqueia até que haja tokens disponíveis e os consome.
+
+        Args:
+            tokens (int): Número de tokens a consumir
+            background (bool): Se True, também espera enquanto houver chamadas prioritárias em andamento
+        """
+        while True:
+            with self._lock:
+                while background and self._priority_active:
+                    self._idle.wait()
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                else:
+                    wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def consume(self, tokens=1):
+        """
+        Desconta tokens sem esperar (o saldo pode ficar negativo).
+
+        Usado por chamadas prioritárias: elas não são atrasadas pelo bucket,
+        mas o saldo negativo faz as chamadas em segundo plano esperarem mais.
+
+        Args:
+            tokens (int): Número de tokens a descontar
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+
+    @contextmanager
+    def priority(self):
+        """
+        Marca um trecho com chamadas prioritárias (interativas) em andamento.
+
+        Enquanto houver algum trecho ativo, acquire(background=True) fica
+        bloqueado, então um aquecimento de cache em segundo plano cede a vez
+        às consultas interativas.
+        """
+        with self._lock:
+            self._priority_active += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._priority_active -= 1
+                if not self._priority_active:
+                    self._idle.notify_all()
+
+    def set_rate(self, rate, capacity=None):
+        """
+        Altera a taxa (e opcionalmente a capacidade) do limitador.
+
+        Args:
+            rate (float): Novos tokens por segundo
+            capacity (float): Capacidade máxima do bucket (padrão: rate)
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+            self.capacity = float(capacity or rate)
+            self._tokens = min(self._tokens, self.capacity)
+
+    def pause(self, seconds):
+        """
+        Suspende a liberação de tokens por um período (ex: após HTTP 429).
+
+        Args:
+            seconds (float): Duração da pausa em segundos
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+
+    def update_from_headers(self, headers, status_code=None):
+        """
+        Ajusta o limitador a partir dos cabeçalhos de cota da API da Blizzard.
+
+        Usa X-Plan-Qps-Allotted como taxa por segundo, pausa até a renovação
+        da cota horária (X-Plan-Quota-Reset) quando ela se esgota
+        (X-Plan-Quota-Allotted / X-Plan-Quota-Current) e respeita Retry-After
+        em respostas 429.
+
+        Args:
+            headers (dict): Cabeçalhos da resposta HTTP
+            status_code (int): Código de status da resposta
+        """
+        qps = _header_number(headers, "X-Plan-Qps-Allotted")
+        if qps and qps != self.rate:
+            self.set_rate(qps)
+
+        quota_allotted = _header_number(headers, "X-Plan-Quota-Allotted")
+        quota_current = _header_number(headers, "X-Plan-Quota-Current")
+        quota_exhausted = quota_allotted is not None and quota_current is not None and quota_current >= quota_allotted
+
+        pause = _header_number(headers, "Retry-After")
+        if quota_exhausted:
+            pause = max(pause or 0.0, _quota_reset_seconds(headers) or 0.0)
+        if status_code == 429 or quota_exhausted:
+            self.pause(pause or 1.0)
+
+def _header_number(headers, name):
+    """Converte um cabeçalho numérico em float (ou None se ausente/inválido)."""
+    value = headers.get(name) if headers else None
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def _quota_reset_seconds(headers):
+    """
+    Segundos até a renovação da cota, a partir de X-Plan-Quota-Reset.
+
+    A Blizzard informa os milissegundos restantes; valores com cara de
+    timestamp (epoch em milissegundos) também são aceitos.
+    """
+    reset = _header_number(headers, "X-Plan-Quota-Reset")
+    if reset is None:
+        return None
+    if reset > 1e12:
+        reset -= time.time() * 1000
+    return max(reset / 1000, 0.0)
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(name, rate, capacity=None):
+    """
+    Retorna o limitador compartilhado com o nome informado, criando-o se necessário.
+
+    Args:
+        name (str): Nome do limitador (ex: "blizzard-us")
+        rate (float): Tokens por segundo usados na criação
+        capacity (float): Capacidade máxima usada na criação (padrão: rate)
+
+    Returns:
+        TokenBucket: Limitador compartilhado
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = TokenBucket(rate, capacity)
+            _limiters[name] = limiter
+    return limiter
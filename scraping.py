@@ -0,0 +1,194 @@
+import os
+import re
+
+from bs4 import BeautifulSoup
+
+# Backends rápidos são opcionais: na falta deles é usado o BeautifulSoup com html.parser
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        HTMLParser = None
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# Backends na ordem de preferência (o primeiro instalado é o padrão)
+BACKEND_PREFERENCE = ["selectolax", "lxml", "bs4"]
+
+def available_backends():
+    """
+    Lista os backends de parsing instalados.
+
+    Returns:
+        list: Nomes dos backends disponíveis, na ordem de preferência
+    """
+    installed = {"selectolax": HTMLParser is not None, "lxml": lxml is not None, "bs4": True}
+    return [name for name in BACKEND_PREFERENCE if installed[name]]
+
+def _default_backend():
+    configured = os.getenv("SCRAPING_BACKEND")
+    if configured:
+        if configured not in available_backends():
+            print(f"Backend de scraping '{configured}' não está disponível; usando o padrão")
+        else:
+            return configured
+    return available_backends()[0]
+
+_backend = _default_backend()
+
+def get_backend():
+    """Retorna o nome do backend de parsing em uso."""
+    return _backend
+
+def set_backend(name):
+    """
+    Define o backend de parsing usado por padrão.
+
+    Args:
+        name (str): selectolax, lxml ou bs4
+    """
+    global _backend
+    if name not in available_backends():
+        raise ValueError(f"Backend de scraping indisponível: {name} (disponíveis: {available_backends()})")
+    _backend = name
+
+def iter_fragments(html, tag, class_name):
+    """
+    Localiza os elementos com uma classe sem montar a árvore do documento.
+
+    Procura a tag de abertura com a classe e avança até a tag de fechamento
+    correspondente, contando as tags de mesmo nome aninhadas.
+
+    Args:
+        html (str): Documento HTML
+        tag (str): Nome da tag (ex: table, div)
+        class_name (str): Classe CSS procurada
+
+    Yields:
+        str: Trecho HTML de cada elemento encontrado (incluindo a própria tag)
+    """
+    opening = re.compile(
+        rf"<{tag}\b[^>]*\bclass\s*=\s*(?:\"[^\"]*|'[^']*|)(?<![\w-]){re.escape(class_name)}(?![\w-])[^>]*>",
+        re.IGNORECASE,
+    )
+    nested = re.compile(rf"<(/?){tag}\b[^>]*>", re.IGNORECASE)
+
+    position = 0
+    while True:
+        match = opening.search(html, position)
+        if match is None:
+            return
+        depth = 1
+        end = len(html)
+        for tag_match in nested.finditer(html, match.end()):
+            depth += -1 if tag_match.group(1) else 1
+            if depth == 0:
+                end = tag_match.end()
+                break
+        yield html[match.start():end]
+        position = end
+
+def _parse(html, backend):
+    if backend == "selectolax":
+        return HTMLParser(html)
+    if backend == "lxml":
+        return lxml.html.fromstring(html) if html.strip() else None
+    return BeautifulSoup(html, "html.parser")
+
+def _class_xpath(tag, class_name):
+    return f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+def _find_all(tree, tag, class_name, backend):
+    """Elementos com a classe informada, no formato do backend."""
+    if tree is None:
+        return []
+    if backend == "selectolax":
+        return tree.css(f"{tag}.{class_name}")
+    if backend == "lxml":
+        return tree.xpath(_class_xpath(tag, class_name))
+    return tree.find_all(tag, class_=class_name)
+
+def _text(node, backend):
+    """Texto do elemento com cada trecho sem espaços nas pontas (como get_text(strip=True))."""
+    if backend == "selectolax":
+        return "".join(part.strip() for part in node.text(deep=True, separator="\0").split("\0"))
+    if backend == "lxml":
+        return "".join(part.strip() for part in node.itertext())
+    return node.get_text(strip=True)
+
+def _children(node, tag, backend):
+    if backend == "selectolax":
+        return node.css(tag)
+    if backend == "lxml":
+        return node.iter(tag)
+    return node.find_all(tag)
+
+def _cell_text(node, backend):
+    """Texto completo do elemento sem espaços nas pontas (como .text.strip())."""
+    if backend == "selectolax":
+        return node.text(deep=True).strip()
+    if backend == "lxml":
+        return node.text_content().strip()
+    return node.text.strip()
+
+def find_texts(html, tag, class_name, backend=None, targeted=True):
+    """
+    Extrai o texto de todos os elementos com uma classe.
+
+    Args:
+        html (str): Documento HTML
+        tag (str): Nome da tag (ex: div)
+        class_name (str): Classe CSS (ex: panel-description)
+        backend (str): Backend de parsing (padrão: get_backend())
+        targeted (bool): Se True, analisa só os trechos dos elementos (ver iter_fragments)
+
+    Returns:
+        list: Texto de cada elemento
+    """
+    backend = backend or _backend
+    if targeted:
+        texts = []
+        for fragment in iter_fragments(html, tag, class_name):
+            texts.extend(_text(node, backend) for node in _find_all(_parse(fragment, backend), tag, class_name, backend))
+        return texts
+    return [_text(node, backend) for node in _find_all(_parse(html, backend), tag, class_name, backend)]
+
+def find_table_rows(html, class_name, backend=None, targeted=True):
+    """
+    Extrai as células das linhas de dados da primeira tabela com uma classe.
+
+    Linhas sem células td (cabeçalho) são ignoradas.
+
+    Args:
+        html (str): Documento HTML
+        class_name (str): Classe CSS da tabela (ex: common-table)
+        backend (str): Backend de parsing (padrão: get_backend())
+        targeted (bool): Se True, analisa só o trecho da tabela (ver iter_fragments)
+
+    Returns:
+        list: Texto das células de cada linha
+    """
+    backend = backend or _backend
+    if targeted:
+        fragment = next(iter_fragments(html, "table", class_name), None)
+        if fragment is None:
+            return []
+        tree = _parse(fragment, backend)
+    else:
+        tree = _parse(html, backend)
+
+    tables = _find_all(tree, "table", class_name, backend)
+    if not tables:
+        return []
+
+    rows = []
+    for row in _children(tables[0], "tr", backend):
+        cells = [_cell_text(cell, backend) for cell in _children(row, "td", backend)]
+        if cells:
+            rows.append(cells)
+    return rows
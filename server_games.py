@@ -54,6 +54,14 @@ try:
         print(f"Erro ao importar wordpress: {e}", file=sys.stderr)
         traceback.print_exc(file=sys.stderr)
     
+    # Importando o cliente HTTP compartilhado
+    try:
+        import http_client
+        print("Módulo http_client importado com sucesso", file=sys.stderr)
+    except ImportError as e:
+        print(f"Erro ao importar http_client: {e}", file=sys.stderr)
+        traceback.print_exc(file=sys.stderr)
+    
     # Carregar variáveis de ambiente
     load_dotenv()
     STEAM_API_KEY = os.getenv("STEAM_API_KEY")
@@ -100,6 +108,52 @@ try:
             traceback.print_exc(file=sys.stderr)
             return {"success": False, "error": str(e)}
     
+    @mcp.tool()
+    def steam_warm_app_details(
+        app_ids: List[int],
+        language: str = "portuguese"
+    ) -> dict:
+        """
+        Pré-carrega em segundo plano o cache de detalhes (appdetails) de jogos da Steam.
+        
+        Args:
+            app_ids: Lista de IDs de jogos na Steam
+            language: Idioma das descrições (padrão: portuguese)
+            
+        Returns:
+            dict: Número de jogos que serão baixados (os demais já estavam em cache)
+        """
+        try:
+            missing = steam.warm_app_details(app_ids, language)
+            return {"success": True, "data": {"requested": len(app_ids), "to_fetch": missing}}
+        except Exception as e:
+            print(f"Erro em steam_warm_app_details: {str(e)}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            return {"success": False, "error": str(e)}
+    
+    @mcp.tool()
+    def steam_search_apps(
+        names: List[str],
+        limit: int = 5
+    ) -> dict:
+        """
+        Procura IDs de jogos da Steam pelo nome (aceita nomes parciais, sem acentos e com erros de digitação).
+        
+        Args:
+            names: Lista de nomes (ou partes de nomes) de jogos
+            limit: Número máximo de resultados por nome (padrão: 5)
+            
+        Returns:
+            dict: Apps encontrados (app_id, name e score de 0 a 1) por nome procurado
+        """
+        try:
+            result = steam.search_apps(names, limit, STEAM_API_KEY)
+            return {"success": True, "data": result}
+        except Exception as e:
+            print(f"Erro em steam_search_apps: {str(e)}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            return {"success": False, "error": str(e)}
+    
     @mcp.tool()
     def current_players(
         app_id: int
@@ -136,6 +190,8 @@ try:
         """
         try:
             result = steam.get_historical_data_for_games(app_ids)
+            result["Mês"] = result["Mês"].dt.strftime("%Y-%m-%d")
+            result = result.astype(object).where(result.notna(), None)
             return {"success": True, "data": result.to_dict("records")}
         except Exception as e:
             print(f"Erro em historical_data: {str(e)}", file=sys.stderr)
@@ -146,7 +202,8 @@ try:
     def game_reviews(
         app_ids: List[int],
         language: str = "portuguese",
-        max_reviews: int = 50
+        max_reviews: int = 50,
+        incremental: bool = False
     ) -> dict:
         """
         Obtém avaliações de jogos da Steam.
@@ -155,12 +212,14 @@ try:
             app_ids: Lista de IDs de jogos na Steam
             language: Idioma das avaliações (padrão: portuguese)
             max_reviews: Número máximo de avaliações por jogo
+            incremental: Se True, baixa só as avaliações novas desde a última sincronização
+                         e responde a partir do armazenamento local
             
         Returns:
             dict: Avaliações de jogos
         """
         try:
-            result = steam.get_steam_game_reviews(app_ids, language, max_reviews)
+            result = steam.get_steam_game_reviews(app_ids, language, max_reviews, incremental=incremental)
             return {"success": True, "data": result.to_dict("records")}
         except Exception as e:
             print(f"Erro em game_reviews: {str(e)}", file=sys.stderr)
@@ -253,6 +312,71 @@ try:
             traceback.print_exc(file=sys.stderr)
             return {"success": False, "error": str(e)}
     
+    @mcp.tool()
+    def wow_characters_batch(
+        characters: List[Dict[str, str]],
+        region: str = "us",
+        columnar: bool = True
+    ) -> dict:
+        """
+        Obtém o perfil básico de muitos personagens de World of Warcraft, de vários reinos, em uma única chamada.
+        
+        Args:
+            characters: Lista de personagens no formato {"realm": "...", "name": "..."}
+            region: Região do servidor (padrão: "us")
+            columnar: Se True, retorna os perfis por coluna (uma lista por campo) (padrão: True)
+            
+        Returns:
+            dict: Perfis encontrados e falhas por personagem
+        """
+        try:
+            result = wow.get_characters_batch(
+                BLIZZARD_CLIENT_ID, 
+                BLIZZARD_CLIENT_SECRET, 
+                region, 
+                characters,
+                columnar=columnar
+            )
+            return result
+        except Exception as e:
+            print(f"Erro em wow_characters_batch: {str(e)}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            return {"success": False, "error": str(e)}
+    
+    @mcp.tool()
+    def wow_achievement_completion(
+        achievement_ids: List[int],
+        characters: List[Dict[str, str]],
+        region: str = "us",
+        refresh: bool = False
+    ) -> dict:
+        """
+        Verifica quais personagens de World of Warcraft concluíram determinadas conquistas.
+        
+        Args:
+            achievement_ids: IDs das conquistas
+            characters: Lista de personagens no formato {"realm": "...", "name": "..."}
+            region: Região do servidor (padrão: "us")
+            refresh: Se True, baixa novamente as conquistas de todos os personagens (padrão: False)
+            
+        Returns:
+            dict: Personagens que concluíram cada conquista
+        """
+        try:
+            result = wow.get_achievement_completion(
+                BLIZZARD_CLIENT_ID, 
+                BLIZZARD_CLIENT_SECRET, 
+                region, 
+                achievement_ids,
+                characters,
+                refresh=refresh
+            )
+            return result
+        except Exception as e:
+            print(f"Erro em wow_achievement_completion: {str(e)}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            return {"success": False, "error": str(e)}
+    
     @mcp.tool()
     def wow_guild_info(
         guild_name: str,
@@ -284,6 +408,114 @@ try:
             traceback.print_exc(file=sys.stderr)
             return {"success": False, "error": str(e)}
     
+    @mcp.tool()
+    def wow_guild_profile(
+        guild_name: str,
+        realm: str,
+        region: str = "us",
+        include_equipment: bool = True,
+        max_members: Optional[int] = None
+    ) -> dict:
+        """
+        Obtém o perfil de todos os membros de uma guilda de World of Warcraft.
+        
+        Args:
+            guild_name: Nome da guilda
+            realm: Nome do reino (servidor)
+            region: Região do servidor (padrão: "us")
+            include_equipment: Se True, inclui os equipamentos de cada membro (padrão: True)
+            max_members: Número máximo de membros a analisar, pelos ranks mais altos (opcional)
+            
+        Returns:
+            dict: Perfil (nível de item, conquistas, especialização) e equipamentos de cada membro
+        """
+        try:
+            result = wow.get_guild_profile(
+                BLIZZARD_CLIENT_ID, 
+                BLIZZARD_CLIENT_SECRET, 
+                region, 
+                realm, 
+                guild_name,
+                include_equipment=include_equipment,
+                max_members=max_members
+            )
+            return result
+        except Exception as e:
+            print(f"Erro em wow_guild_profile: {str(e)}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            return {"success": False, "error": str(e)}
+    
+    @mcp.tool()
+    def wow_guild_roster_changes(
+        guild_name: str,
+        realm: str,
+        region: str = "us",
+        since: Optional[str] = None
+    ) -> dict:
+        """
+        Obtém as mudanças no roster de uma guilda de World of Warcraft desde um snapshot anterior.
+        
+        Args:
+            guild_name: Nome da guilda
+            realm: Nome do reino (servidor)
+            region: Região do servidor (padrão: "us")
+            since: ID do snapshot de referência, retornado por wow_guild_info ou por esta ferramenta (padrão: o mais recente)
+            
+        Returns:
+            dict: Novo snapshot e membros que entraram, saíram ou mudaram de rank/nível
+        """
+        try:
+            result = wow.get_guild_roster_changes(
+                BLIZZARD_CLIENT_ID, 
+                BLIZZARD_CLIENT_SECRET, 
+                region, 
+                realm, 
+                guild_name,
+                since=since
+            )
+            return result
+        except Exception as e:
+            print(f"Erro em wow_guild_roster_changes: {str(e)}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            return {"success": False, "error": str(e)}
+    
+    @mcp.tool()
+    def wow_gear_audit(
+        region: str = "us",
+        characters: Optional[List[Dict[str, str]]] = None,
+        guild_name: Optional[str] = None,
+        realm: Optional[str] = None,
+        max_members: Optional[int] = None
+    ) -> dict:
+        """
+        Audita os equipamentos de vários personagens ou de uma guilda de World of Warcraft.
+        
+        Args:
+            region: Região do servidor (padrão: "us")
+            characters: Lista de personagens no formato {"realm": "...", "name": "..."} (opcional)
+            guild_name: Nome da guilda a auditar (opcional)
+            realm: Nome do reino da guilda (obrigatório com guild_name)
+            max_members: Número máximo de membros da guilda, pelos ranks mais altos (opcional)
+            
+        Returns:
+            dict: Nível de item médio, slots vazios, slot mais fraco e peças de conjunto por personagem, e resumo por slot
+        """
+        try:
+            result = wow.get_gear_audit(
+                BLIZZARD_CLIENT_ID, 
+                BLIZZARD_CLIENT_SECRET, 
+                region, 
+                characters=characters,
+                realm=realm,
+                guild_name=guild_name,
+                max_members=max_members
+            )
+            return result
+        except Exception as e:
+            print(f"Erro em wow_gear_audit: {str(e)}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            return {"success": False, "error": str(e)}
+    
     @mcp.tool()
     def wow_search_guilds(
         guild_names: List[str],
@@ -319,7 +551,9 @@ try:
     def wow_auction_data(
         realm: str,
         region: str = "us",
-        limit: int = 100
+        limit: int = 100,
+        include_item_details: bool = True,
+        prefetch_items: bool = False
     ) -> dict:
         """
         Obtém dados do leilão (mercado) de World of Warcraft.
@@ -328,6 +562,9 @@ try:
             realm: Nome do reino (servidor)
             region: Região do servidor (padrão: "us")
             limit: Número máximo de itens a retornar (padrão: 100)
+            include_item_details: Se True, adiciona os detalhes de cada item; itens fora do cache
+                exigem uma requisição cada, então use False para uma resposta rápida (padrão: True)
+            prefetch_items: Se True, preenche em segundo plano o cache com todos os itens do leilão (padrão: False)
             
         Returns:
             dict: Dados do leilão, incluindo preços e informações de itens
@@ -338,13 +575,157 @@ try:
                 BLIZZARD_CLIENT_SECRET, 
                 region, 
                 realm, 
-                limit=limit
+                limit=limit,
+                prefetch_items=prefetch_items,
+                include_item_details=include_item_details
             )
             return result
         except Exception as e:
             print(f"Erro em wow_auction_data: {str(e)}", file=sys.stderr)
             traceback.print_exc(file=sys.stderr)
             return {"success": False, "error": str(e)}
+    
+    @mcp.tool()
+    def wow_auction_price_index(
+        realm: str,
+        region: str = "us",
+        item_ids: Optional[List[int]] = None,
+        limit: int = 100
+    ) -> dict:
+        """
+        Obtém o índice de preços do leilão de World of Warcraft para um reino.
+        
+        Args:
+            realm: Nome do reino (servidor)
+            region: Região do servidor (padrão: "us")
+            item_ids: IDs de itens a consultar (opcional; padrão: itens com mais unidades à venda)
+            limit: Número máximo de itens a retornar (padrão: 100)
+            
+        Returns:
+            dict: Preço mínimo, mediana, percentis 10/90, quantidade total e número de leilões por item
+        """
+        try:
+            result = wow.get_auction_price_index(
+                BLIZZARD_CLIENT_ID, 
+                BLIZZARD_CLIENT_SECRET, 
+                region, 
+                realm, 
+                item_ids=item_ids,
+                limit=limit
+            )
+            return result
+        except Exception as e:
+            print(f"Erro em wow_auction_price_index: {str(e)}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            return {"success": False, "error": str(e)}
+    
+    @mcp.tool()
+    def wow_auction_price_spreads(
+        region: str = "us",
+        realms: Optional[List[str]] = None,
+        item_ids: Optional[List[int]] = None,
+        min_realms: int = 2,
+        limit: int = 100
+    ) -> dict:
+        """
+        Compara os preços do leilão de World of Warcraft entre vários reinos.
+        
+        Args:
+            region: Região do servidor (padrão: "us")
+            realms: Nomes dos reinos a comparar (opcional; padrão: todos os reinos da região)
+            item_ids: IDs de itens a comparar (opcional)
+            min_realms: Número mínimo de reinos com o item à venda (padrão: 2)
+            limit: Número máximo de itens a retornar (padrão: 100)
+            
+        Returns:
+            dict: Reino mais barato, mais caro e diferença de preço por item
+        """
+        try:
+            result = wow.get_auction_price_spreads(
+                BLIZZARD_CLIENT_ID, 
+                BLIZZARD_CLIENT_SECRET, 
+                region, 
+                realms=realms,
+                item_ids=item_ids,
+                min_realms=min_realms,
+                limit=limit
+            )
+            return result
+        except Exception as e:
+            print(f"Erro em wow_auction_price_spreads: {str(e)}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            return {"success": False, "error": str(e)}
+    
+    @mcp.tool()
+    def wow_commodity_prices(
+        region: str = "us",
+        item_ids: Optional[List[int]] = None,
+        limit: int = 100,
+        depth_buckets: int = 10
+    ) -> dict:
+        """
+        Obtém os preços dos leilões de commodities de World of Warcraft (toda a região).
+        
+        Args:
+            region: Região do servidor (padrão: "us")
+            item_ids: IDs de itens a consultar (opcional; padrão: itens com mais unidades à venda)
+            limit: Número máximo de itens a retornar (padrão: 100)
+            depth_buckets: Faixas de preço por item no histograma de profundidade (padrão: 10; 0 = sem profundidade)
+            
+        Returns:
+            dict: Preço mínimo, mediana, percentis, quantidade e profundidade de preço por item
+        """
+        try:
+            result = wow.get_commodity_prices(
+                BLIZZARD_CLIENT_ID, 
+                BLIZZARD_CLIENT_SECRET, 
+                region, 
+                item_ids=item_ids,
+                limit=limit,
+                depth_buckets=depth_buckets
+            )
+            return result
+        except Exception as e:
+            print(f"Erro em wow_commodity_prices: {str(e)}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            return {"success": False, "error": str(e)}
+    
+    @mcp.tool()
+    def wow_auction_price_history(
+        realm: str,
+        item_ids: List[int],
+        region: str = "us",
+        days: int = 30,
+        resolution: str = "daily"
+    ) -> dict:
+        """
+        Obtém a evolução dos preços de itens no leilão de World of Warcraft (série histórica local).
+        
+        Args:
+            realm: Nome do reino (servidor), ou "commodities" para as commodities da região
+            item_ids: IDs dos itens
+            region: Região do servidor (padrão: "us")
+            days: Número de dias a consultar (padrão: 30)
+            resolution: "daily" (um ponto por dia) ou "hourly" (pontos dos últimos dias)
+            
+        Returns:
+            dict: Série de preço mínimo, mediana e quantidade por item
+        """
+        try:
+            result = wow.get_auction_price_history(
+                BLIZZARD_CLIENT_ID, 
+                BLIZZARD_CLIENT_SECRET, 
+                region, 
+                realm, 
+                item_ids,
+                days=days,
+                resolution=resolution
+            )
+            return result
+        except Exception as e:
+            print(f"Erro em wow_auction_price_history: {str(e)}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            return {"success": False, "error": str(e)}
             
     # Ferramentas Twitch
     @mcp.tool()
@@ -1116,6 +1497,23 @@ try:
             return {"success": False, "error": str(e)}
         
     
+    # Ferramentas de diagnóstico
+    @mcp.tool()
+    def http_pool_stats() -> dict:
+        """
+        Obtém estatísticas de reaproveitamento de conexões HTTP por host.
+        
+        Returns:
+            dict: Requisições, hits (conexão reaproveitada) e misses (nova conexão) por host
+        """
+        try:
+            result = http_client.get_pool_stats()
+            return {"success": True, "data": result}
+        except Exception as e:
+            print(f"Erro em http_pool_stats: {str(e)}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            return {"success": False, "error": str(e)}
+    
     # Não precisamos mais registrar ferramentas Twitch separadamente, pois já as implementamos diretamente
     
     if __name__ == "__main__":
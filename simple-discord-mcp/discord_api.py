@@ -1,8 +1,15 @@
 # discord_api.py
+import os
 import requests
 import json
 import sys
 
+# Timeout padrão (conexão, leitura) das requisições à API do Discord
+DISCORD_TIMEOUT = (
+    float(os.getenv("DISCORD_CONNECT_TIMEOUT", "5")),
+    float(os.getenv("DISCORD_READ_TIMEOUT", "30")),
+)
+
 class DiscordAPI:
     def __init__(self, token):
         self.token = token
@@ -11,6 +18,9 @@ class DiscordAPI:
             "Authorization": f"Bot {self.token}",
             "Content-Type": "application/json"
         }
+        # Sessão própria: reaproveita a conexão keep-alive com discord.com entre chamadas
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
         print(f"DiscordAPI inicializado com token: {token[:5]}...", file=sys.stderr)
 
     def send_message(self, channel_id, content):
@@ -30,7 +40,7 @@ class DiscordAPI:
         }
         
         try:
-            response = requests.post(url, headers=self.headers, json=data)
+            response = self.session.post(url, json=data, timeout=DISCORD_TIMEOUT)
             response.raise_for_status()
             print(f"Mensagem enviada com sucesso para o canal {channel_id}", file=sys.stderr)
             return response.json()
@@ -52,7 +62,7 @@ class DiscordAPI:
         url = f"{self.api_base}/channels/{channel_id}/messages?limit={limit}"
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, timeout=DISCORD_TIMEOUT)
             response.raise_for_status()
             print(f"Obtidas {len(response.json())} mensagens do canal {channel_id}", file=sys.stderr)
             return response.json()
@@ -73,7 +83,7 @@ class DiscordAPI:
         url = f"{self.api_base}/guilds/{guild_id}/channels"
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, timeout=DISCORD_TIMEOUT)
             response.raise_for_status()
             print(f"Obtidos {len(response.json())} canais do servidor {guild_id}", file=sys.stderr)
             return response.json()
@@ -1,8 +1,69 @@
-import requests
+import array
+import os
+import threading
+import http_client
+import local_cache
+import rate_limit
+import scraping
+import steam_catalog
+import steam_charts
+import steam_reviews
 import pandas as pd
-from bs4 import BeautifulSoup
 import numpy as np
-from collections import Counter
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# Número máximo de requisições simultâneas por host (configurável via set_host_concurrency)
+HOST_CONCURRENCY_LIMITS = {
+    "store.steampowered.com": int(os.getenv("STEAM_STORE_CONCURRENCY", "4")),
+    "api.steampowered.com": int(os.getenv("STEAM_API_CONCURRENCY", "8")),
+}
+DEFAULT_HOST_CONCURRENCY = 4
+STEAM_MAX_WORKERS = int(os.getenv("STEAM_MAX_WORKERS", "16"))
+# Máximo de reviews por página aceito pelo endpoint appreviews
+REVIEWS_PER_PAGE = 100
+# Validade do cache de appdetails (nome, gêneros, categorias, requisitos, preço)
+STEAM_APPDETAILS_TTL = float(os.getenv("STEAM_APPDETAILS_TTL", str(24 * 3600)))
+# Requisições por segundo ao appdetails (a loja aceita cerca de 200 a cada 5 minutos) e rajada permitida.
+# Só o aquecimento em segundo plano espera por esse limite; as consultas interativas descontam do mesmo saldo
+STEAM_APPDETAILS_RATE = float(os.getenv("STEAM_APPDETAILS_RATE", str(200 / 300)))
+STEAM_APPDETAILS_BURST = float(os.getenv("STEAM_APPDETAILS_BURST", "40"))
+
+_host_semaphores = {}
+_host_semaphores_lock = threading.Lock()
+_review_store = steam_reviews.ReviewStore()
+_appdetails_cache = local_cache.KeyValueStore("steam_appdetails", ttl=STEAM_APPDETAILS_TTL)
+_catalog = None
+_catalog_lock = threading.Lock()
+_catalog_refreshing = False
+
+def set_host_concurrency(host, limit):
+    """
+    Define o número máximo de requisições simultâneas para um host.
+    
+    Args:
+        host (str): Nome do host (ex: store.steampowered.com)
+        limit (int): Número máximo de requisições simultâneas
+    """
+    with _host_semaphores_lock:
+        HOST_CONCURRENCY_LIMITS[host] = limit
+        _host_semaphores[host] = threading.BoundedSemaphore(limit)
+
+def _host_slot(url):
+    """Retorna o semáforo que limita as requisições simultâneas ao host da URL."""
+    host = urlsplit(url).hostname
+    with _host_semaphores_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(HOST_CONCURRENCY_LIMITS.get(host, DEFAULT_HOST_CONCURRENCY))
+            _host_semaphores[host] = semaphore
+    return semaphore
+
+def _get_json(url, params=None):
+    """Faz um GET respeitando o limite de concorrência do host e retorna o JSON."""
+    with _host_slot(url):
+        return http_client.get(url, params=params).json()
 
 def get_current_players(app_id):
     """
@@ -15,274 +76,881 @@ def get_current_players(app_id):
         int: Número atual de jogadores
     """
     url = f"http://api.steampowered.com/ISteamUserStats/GetNumberOfCurrentPlayers/v1/?appid={app_id}"
-    response = requests.get(url).json()
+    response = http_client.get(url).json()
     if response and 'response' in response:
         return response['response'].get('player_count', 0)
     return 0
 
-def get_historical_data(game_id):
+def _fetch_steamcharts_rows(game_id, known_months=()):
     """
-    Obtém dados históricos de jogadores para um jogo específico da Steam.
+    Baixa a tabela de histórico mensal de um jogo no steamcharts.
+    
+    A leitura das linhas para no primeiro mês fechado já conhecido, já que os
+    meses seguintes (mais antigos) não mudam.
     
     Args:
         game_id (int): ID do jogo na Steam
+        known_months (set): Meses fechados já gravados
     
     Returns:
-        DataFrame: Dados históricos formatados
+        list: Células de cada linha nova (mês, média, variação, variação %, pico)
     """
     base_url = f"https://steamcharts.com/app/{game_id}"
-    response = requests.get(base_url)
-    soup = BeautifulSoup(response.text, 'html.parser')
+    response = http_client.get(base_url)
 
-    table = soup.find('table', {'class': 'common-table'})
+    # Analisa apenas a tabela common-table (o cabeçalho é ignorado)
     data = []
+    for cells in scraping.find_table_rows(response.text, 'common-table'):
+        if known_months:
+            month, partial = steam_charts.parse_month(cells[0])
+            if not partial and month in known_months:
+                break
+        data.append(cells)
 
-    if table:
-        rows = table.find_all('tr')[1:]  # Ignorar o cabeçalho
-        for row in rows:
-            cols = row.find_all('td')
-            data.append([col.text.strip() for col in cols])
+    return data
 
-    headers = ['Mês', 'Jogadores Médios', 'Jogadores Pico', 'Alteração', 'Jogadores Delta']
-    return pd.DataFrame(data, columns=headers)
+def get_historical_data(game_id, refresh=False):
+    """
+    Obtém dados históricos de jogadores para um jogo específico da Steam.
+    
+    O histórico mensal fica gravado localmente com colunas tipadas. Os meses
+    fechados nunca são baixados de novo; só o mês corrente é atualizado, após
+    steam_charts.STEAMCHARTS_CURRENT_TTL segundos.
+    
+    Args:
+        game_id (int): ID do jogo na Steam
+        refresh (bool): Se True, atualiza o mês corrente mesmo dentro da validade
+    
+    As colunas seguem a ordem real da tabela do steamcharts. Antes, os rótulos
+    estavam deslocados: 'Jogadores Pico' trazia a variação absoluta,
+    'Alteração' a variação percentual e 'Jogadores Delta' o pico. Agora o pico
+    fica em 'Jogadores Pico', a variação em 'Alteração' e 'Alteração (%)', e a
+    coluna 'Jogadores Delta' deixou de existir. O período "Last 30 Days" deixou
+    de ser um rótulo de texto em 'Mês': vem com a data do mês corrente e
+    'Parcial' = True.
+    
+    Returns:
+        DataFrame: Mês (data do primeiro dia), Jogadores Médios, Jogadores Pico,
+                   Alteração, Alteração (%) e Parcial (bool, True no mês corrente
+                   ainda em andamento), do mês mais recente ao mais antigo
+    """
+    history, meta = steam_charts.load_history(game_id)
+    if refresh or not steam_charts.is_fresh(history, meta):
+        try:
+            rows = _fetch_steamcharts_rows(game_id, steam_charts.closed_months(history))
+            history = steam_charts.save_history(game_id, history, steam_charts.rows_to_frame(rows))
+        except Exception as e:
+            print(f"Erro ao atualizar o histórico do jogo {game_id}: {e}")
+            if history is None:
+                raise
+
+    return pd.DataFrame({
+        'Mês': history['month'],
+        'Jogadores Médios': history['avg_players'],
+        'Jogadores Pico': history['peak_players'],
+        'Alteração': history['gain'],
+        'Alteração (%)': history['gain_pct'],
+        'Parcial': history['partial'],
+    })
+
+class _ColumnsBuilder:
+    """
+    Acumula registros em colunas e monta um único DataFrame no final.
+
+    Aceita registros avulsos (append) e blocos de colunas já prontos
+    (append_chunk); os blocos são concatenados uma única vez em to_frame.
+    """
+
+    def __init__(self, columns):
+        """
+        Args:
+            columns (list): Pares (nome da coluna, dtype numpy ou None para objetos)
+        """
+        self.names = [name for name, _ in columns]
+        self.dtypes = [dtype for _, dtype in columns]
+        self._chunks = [[] for _ in columns]
+        self._rows = [[] for _ in columns]
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def append(self, record):
+        """Adiciona um registro (tupla na ordem das colunas)."""
+        for column, value in zip(self._rows, record):
+            column.append(value)
+        self._length += 1
+
+    def extend(self, records):
+        """Adiciona vários registros."""
+        for record in records:
+            self.append(record)
+
+    def append_chunk(self, arrays):
+        """Adiciona um bloco de linhas (uma sequência por coluna, na ordem das colunas)."""
+        self._flush_rows()
+        for chunks, values, dtype in zip(self._chunks, arrays, self.dtypes):
+            chunks.append(np.asarray(values, dtype=dtype))
+        self._length += len(arrays[0]) if arrays else 0
+
+    def _flush_rows(self):
+        if self._rows and self._rows[0]:
+            for chunks, rows, dtype in zip(self._chunks, self._rows, self.dtypes):
+                chunks.append(np.asarray(rows, dtype=dtype))
+                rows.clear()
+
+    def to_frame(self):
+        """Converte os blocos acumulados em um DataFrame (os blocos são liberados coluna a coluna)."""
+        self._flush_rows()
+        columns = {}
+        for name, chunks, dtype in zip(self.names, self._chunks, self.dtypes):
+            columns[name] = np.concatenate(chunks) if chunks else np.array([], dtype=dtype)
+            chunks.clear()
+        self._length = 0
+        return pd.DataFrame(columns, copy=False)
+
+def _bounded_map(function, items, max_workers=None):
+    """
+    Aplica uma função em paralelo, na ordem dos itens, com no máximo
+    2 * max_workers resultados pendentes em memória.
 
-def get_historical_data_for_games(app_ids):
+    Yields:
+        tuple: (item, resultado ou None, exceção ou None)
+    """
+    max_workers = max_workers or STEAM_MAX_WORKERS
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append((item, executor.submit(function, item)))
+            if len(pending) >= 2 * max_workers:
+                item, future = pending.popleft()
+                yield (item, *_future_outcome(future))
+        while pending:
+            item, future = pending.popleft()
+            yield (item, *_future_outcome(future))
+
+def _future_outcome(future):
+    try:
+        return future.result(), None
+    except Exception as e:
+        return None, e
+
+# Colunas de get_historical_data_for_games e seus tipos
+HISTORICAL_COLUMNS = [
+    ("Mês", "datetime64[ns]"),
+    ("Jogadores Médios", np.float64),
+    ("Jogadores Pico", np.int64),
+    ("Alteração", np.float64),
+    ("Alteração (%)", np.float64),
+    ("Parcial", bool),
+    ("AppID", np.int64),
+]
+
+def iter_historical_records(app_ids, max_workers=None):
+    """
+    Percorre o histórico mensal de vários jogos, baixando-os em paralelo.
+    
+    Args:
+        app_ids (list): Lista de IDs de jogos na Steam
+        max_workers (int): Número máximo de jogos consultados ao mesmo tempo (padrão: STEAM_MAX_WORKERS)
+    
+    Yields:
+        list: Bloco com os meses de um jogo, uma sequência por coluna de HISTORICAL_COLUMNS
+    """
+    for app_id, game_data, error in _bounded_map(get_historical_data, app_ids, max_workers):
+        if error is not None:
+            print(f"Erro ao coletar dados para o AppID {app_id}: {error}")
+            continue
+        yield [
+            game_data['Mês'].to_numpy(),
+            game_data['Jogadores Médios'].to_numpy(),
+            game_data['Jogadores Pico'].to_numpy(),
+            game_data['Alteração'].to_numpy(),
+            game_data['Alteração (%)'].to_numpy(),
+            game_data['Parcial'].to_numpy(),
+            np.full(len(game_data), app_id),  # Adiciona o AppID como uma coluna para identificar o jogo
+        ]
+
+def get_historical_data_for_games(app_ids, max_workers=None):
     """
     Obtém dados históricos para múltiplos jogos da Steam.
     
+    Os jogos são consultados em paralelo e seus meses são acumulados em
+    blocos de colunas, formando um único DataFrame no final.
+    
     Args:
         app_ids (list): Lista de IDs de jogos na Steam
+        max_workers (int): Número máximo de jogos consultados ao mesmo tempo (padrão: STEAM_MAX_WORKERS)
     
     Returns:
         DataFrame: Dados históricos consolidados
     """
-    aggregated_data = pd.DataFrame()
+    builder = _ColumnsBuilder(HISTORICAL_COLUMNS)
+    for chunk in iter_historical_records(app_ids, max_workers):
+        builder.append_chunk(chunk)
+    return builder.to_frame()
 
-    for app_id in app_ids:
-        print(f"Coletando dados para o AppID: {app_id}...")
-        game_data = get_historical_data(app_id)
-        game_data['AppID'] = app_id  # Adiciona o AppID como uma coluna para identificar o jogo
-        aggregated_data = pd.concat([aggregated_data, game_data], ignore_index=True)
+def iter_review_pages(app_id, language="portuguese", review_filter="recent", cursor="*", num_per_page=REVIEWS_PER_PAGE):
+    """
+    Percorre as páginas de reviews de um jogo na Steam a partir de um cursor.
+    
+    Cada página depende do cursor da anterior, então as páginas de um mesmo
+    jogo são sempre pedidas em sequência.
+    
+    Args:
+        app_id (int): ID do jogo na Steam
+        language (str): Idioma dos reviews (padrão: portuguese)
+        review_filter (str): Ordenação da API (recent, updated ou all)
+        cursor (str): Cursor inicial ("*" = primeira página)
+        num_per_page (int): Reviews por página (máximo REVIEWS_PER_PAGE)
+    
+    Yields:
+        tuple: (reviews da página, cursor da página seguinte ou None se não houver mais páginas)
+    """
+    reviews_url = f"https://store.steampowered.com/appreviews/{app_id}?json=1"
+    params = {
+        "filter": review_filter,
+        "language": language,
+        "review_type": "all",
+        "purchase_type": "all",
+        "num_per_page": min(num_per_page, REVIEWS_PER_PAGE),
+        "cursor": cursor,
+    }
+    seen_cursors = {cursor}
+
+    while True:
+        reviews_response = _get_json(reviews_url, params)
+        reviews = reviews_response.get("reviews") or []
+
+        # A API repete o último cursor quando não há mais páginas
+        next_cursor = reviews_response.get("cursor")
+        if not reviews or not next_cursor or next_cursor in seen_cursors:
+            next_cursor = None
+
+        yield reviews, next_cursor
+        if next_cursor is None:
+            return
+        seen_cursors.add(next_cursor)
+        params["cursor"] = next_cursor
+
+def iter_app_reviews(app_id, language="portuguese", max_reviews=None, review_filter="recent"):
+    """
+    Percorre os reviews de um jogo na Steam, um por vez (ver iter_review_pages).
+    
+    Args:
+        app_id (int): ID do jogo na Steam
+        language (str): Idioma dos reviews (padrão: portuguese)
+        max_reviews (int): Número máximo de reviews (None = todos)
+        review_filter (str): Ordenação da API (recent, updated ou all)
+    
+    Yields:
+        dict: Um review por vez, no formato da API
+    """
+    num_per_page = min(REVIEWS_PER_PAGE, max_reviews) if max_reviews else REVIEWS_PER_PAGE
+    collected = 0
+    for reviews, _ in iter_review_pages(app_id, language, review_filter, num_per_page=num_per_page):
+        for review in reviews:
+            yield review
+            collected += 1
+            if max_reviews is not None and collected >= max_reviews:
+                return
+
+def _collect_app_reviews(app_id, language, max_reviews):
+    """
+    Coleta os reviews de um jogo em colunas.
+    
+    Returns:
+        tuple: (textos, IDs dos usuários, horas jogadas, avaliações positivas)
+    """
+    texts = []
+    user_ids = []
+    hours_played = array.array("d")
+    voted_up = array.array("b")
 
-    return aggregated_data
+    try:
+        for review in iter_app_reviews(app_id, language, max_reviews):
+            author = review.get("author", {})
+            texts.append(review.get("review"))
+            user_ids.append(author.get("steamid"))
+            hours_played.append(author.get("playtime_forever", 0) / 60.0)  # Convertendo minutos para horas
+            voted_up.append(bool(review.get("voted_up")))
+    except Exception as e:
+        print(f"Erro ao processar os reviews do jogo {app_id}: {e}")
+
+    return texts, user_ids, hours_played, voted_up
+
+def _valid_app_ids(app_ids):
+    """
+    Converte os IDs de jogos em inteiros, ignorando (com aviso) os que não são numéricos.
+    
+    Returns:
+        list: IDs válidos, na ordem recebida
+    """
+    valid = []
+    for app_id in app_ids:
+        try:
+            valid.append(int(app_id))
+        except (TypeError, ValueError):
+            print(f"AppID inválido ignorado: {app_id!r}")
+    return valid
 
-def get_steam_game_reviews(app_ids, language="portuguese", max_reviews=50):
+def get_steam_game_reviews(app_ids, language="portuguese", max_reviews=50, max_workers=None, incremental=False):
     """
     Coleta reviews, ID do usuário, horas jogadas e classificação (positiva ou negativa)
     para uma lista de jogos na Steam.
     
+    Os jogos são paginados em paralelo (as páginas de um mesmo jogo seguem em
+    sequência, encadeadas pelo cursor), respeitando HOST_CONCURRENCY_LIMITS. Os
+    reviews são guardados em colunas à medida que chegam, e cada página é
+    descartada logo após a leitura.
+    
     Args:
-        app_ids (list): Lista de IDs de jogos na Steam
+        app_ids (list): Lista de IDs de jogos na Steam (IDs não numéricos são ignorados)
         language (str): Idioma dos reviews a serem coletados (padrão: portuguese)
         max_reviews (int): Número máximo de reviews a coletar por jogo
+        max_workers (int): Número máximo de jogos paginados ao mesmo tempo (padrão: STEAM_MAX_WORKERS)
+        incremental (bool): Se True, sincroniza o armazenamento local de reviews
+                            (baixando só os reviews novos) e lê os reviews dele
     
     Returns:
         DataFrame: DataFrame com colunas: app_id, review, user_id, hours_played, sentiment
     """
-    reviews_data = []
+    app_ids = _valid_app_ids(app_ids)
+    if incremental:
+        return sync_steam_game_reviews(app_ids, language, max_reviews, max_workers)
 
-    for app_id in app_ids:
-        try:
-            # Obter reviews
-            reviews_url = f"https://store.steampowered.com/appreviews/{app_id}?json=1"
-            cursor = "*"
-            reviews_collected = 0
-
-            while reviews_collected < max_reviews:
-                params = {
-                    "filter": "recent",
-                    "language": language,
-                    "review_type": "all",
-                    "purchase_type": "all",
-                    "num_per_page": 10,
-                    "cursor": cursor,
-                }
-                reviews_response = requests.get(reviews_url, params=params).json()
-
-                if "reviews" in reviews_response:
-                    for review in reviews_response.get("reviews", []):
-                        author = review.get("author", {})
-                        voted_up = review.get("voted_up")
-
-                        sentiment = "positivo" if voted_up else "negativo"
-
-                        reviews_data.append({
-                            "app_id": app_id,
-                            "review": review.get("review"),
-                            "user_id": author.get("steamid"),
-                            "hours_played": author.get("playtime_forever", 0) / 60.0,  # Convertendo minutos para horas
-                            "sentiment": sentiment,
-                        })
-                        reviews_collected += 1
-                        if reviews_collected >= max_reviews:
-                            break
-
-                if "cursor" in reviews_response:
-                    cursor = reviews_response["cursor"]
-                else:
-                    break
+    with ThreadPoolExecutor(max_workers=max_workers or STEAM_MAX_WORKERS) as executor:
+        collected = list(executor.map(lambda app_id: _collect_app_reviews(app_id, language, max_reviews), app_ids))
 
-        except Exception as e:
-            print(f"Erro ao processar os reviews do jogo {app_id}: {e}")
+    counts = [len(texts) for texts, _, _, _ in collected]
+    voted_up = np.concatenate([np.frombuffer(columns[3], dtype=np.int8) for columns in collected] or [np.array([], dtype=np.int8)])
 
     # Converter para DataFrame
-    reviews_detail_df = pd.DataFrame(reviews_data)
+    reviews_detail_df = pd.DataFrame({
+        "app_id": np.repeat(np.asarray(app_ids, dtype=np.int64), counts),
+        "review": [text for columns in collected for text in columns[0]],
+        "user_id": [user_id for columns in collected for user_id in columns[1]],
+        "hours_played": np.concatenate([np.frombuffer(columns[2], dtype=np.float64) for columns in collected] or [np.array([])]),
+        "sentiment": pd.Series(np.where(voted_up.astype(bool), "positivo", "negativo"), dtype=object),
+    })
     return reviews_detail_df
 
-def get_steam_game_data(app_ids, language="portuguese", max_reviews=100):
+def sync_app_reviews(app_id, language="portuguese", max_reviews=None, store=None):
     """
-    Obtém dados detalhados de jogos da Steam.
+    Sincroniza os reviews de um jogo com o armazenamento local.
+    
+    Com um checkpoint gravado, percorre o filtro recent apenas até chegar ao
+    review mais recente da sincronização anterior. Em seguida, se o jogo
+    tiver menos de max_reviews reviews armazenados, continua baixando os mais
+    antigos a partir do cursor salvo. O checkpoint só avança depois que a
+    sincronização termina, então uma sincronização interrompida é retomada
+    sem deixar lacunas.
+    
+    Args:
+        app_id (int): ID do jogo na Steam
+        language (str): Idioma dos reviews (padrão: portuguese)
+        max_reviews (int): Número mínimo de reviews a manter armazenados (None = histórico completo)
+        store (ReviewStore): Armazenamento a usar (padrão: o armazenamento do módulo)
+    
+    Returns:
+        int: Número de reviews novos armazenados
+    """
+    store = store or _review_store
+    checkpoint = store.get_checkpoint(app_id, language)
+    new_reviews = 0
+    head = None
+
+    def save(reviews):
+        known = store.known_ids((review.get("recommendationid") for review in reviews), language)
+        store.store(app_id, language, reviews)
+        return sum(1 for review in reviews if str(review.get("recommendationid")) not in known)
+
+    if checkpoint is not None:
+        # Reviews publicados depois da última sincronização
+        for reviews, next_cursor in iter_review_pages(app_id, language, "recent"):
+            if head is None and reviews:
+                head = reviews[0]
+            fresh = []
+            for review in reviews:
+                if (str(review.get("recommendationid")) == checkpoint["newest_id"]
+                        or (review.get("timestamp_created") or 0) < (checkpoint["newest_timestamp"] or 0)):
+                    break
+                fresh.append(review)
+            new_reviews += save(fresh)
+            if len(fresh) < len(reviews) or next_cursor is None:
+                break
+
+    # Reviews mais antigos ainda não baixados (na primeira sincronização, a partir do início)
+    backfill_cursor = checkpoint["backfill_cursor"] if checkpoint is not None else "*"
+    if backfill_cursor and (max_reviews is None or store.count(app_id, language) < max_reviews):
+        for reviews, next_cursor in iter_review_pages(app_id, language, "recent", cursor=backfill_cursor):
+            if head is None and reviews:
+                head = reviews[0]
+            new_reviews += save(reviews)
+            backfill_cursor = next_cursor
+            if next_cursor is None or (max_reviews is not None and store.count(app_id, language) >= max_reviews):
+                break
+
+    if head is not None:
+        newest_id, newest_timestamp = str(head.get("recommendationid")), head.get("timestamp_created")
+    elif checkpoint is not None:
+        newest_id, newest_timestamp = checkpoint["newest_id"], checkpoint["newest_timestamp"]
+    else:
+        newest_id, newest_timestamp = None, None
+    store.save_checkpoint(app_id, language, newest_id, newest_timestamp, backfill_cursor)
+    return new_reviews
+
+def sync_steam_game_reviews(app_ids, language="portuguese", max_reviews=50, max_workers=None):
+    """
+    Sincroniza os reviews de vários jogos em paralelo e lê os mais recentes do armazenamento local.
     
     Args:
         app_ids (list): Lista de IDs de jogos na Steam
-        language (str): Idioma para as descrições e reviews (padrão: portuguese)
-        max_reviews (int): Número máximo de reviews a serem coletados
+        language (str): Idioma dos reviews (padrão: portuguese)
+        max_reviews (int): Número máximo de reviews retornados por jogo
+        max_workers (int): Número máximo de jogos sincronizados ao mesmo tempo (padrão: STEAM_MAX_WORKERS)
     
     Returns:
-        DataFrame: DataFrame com informações detalhadas dos jogos
+        DataFrame: DataFrame com colunas: app_id, review, user_id, hours_played, sentiment
     """
-    game_data = []
+    app_ids = list(app_ids)
 
-    for app_id in app_ids:
+    def sync(app_id):
         try:
-            game_info = {
-                "app_id": app_id,
-                "name": "Desconhecido",
-                "description": "",
-                "release_date": "",
-                "genres": [],
-                "categories": [],
-                "price": "",
-                "current_players": 0,
-                "total_reviews": 0,
-                "review_score": "",
-                "reviews": [],
-                "pc_requirements_minimum": "",
-                "pc_requirements_recommended": ""
-            }
-
-            details_url = f"https://store.steampowered.com/api/appdetails?appids={app_id}"
-            details_response = requests.get(details_url).json()
-
-            if str(app_id) in details_response and details_response[str(app_id)]['success']:
-                data = details_response[str(app_id)]['data']
-
-                game_info["name"] = data.get("name", "Desconhecido")
-                game_info["description"] = data.get("short_description", "")
-                game_info["release_date"] = data.get("release_date", {}).get("date", "")
-                game_info["genres"] = [genre["description"] for genre in data.get("genres", [])]
-                game_info["categories"] = [category["description"] for category in data.get("categories", [])]
-
-                if "price_overview" in data:
-                    game_info["price"] = data["price_overview"].get("final_formatted", "")
-
-                # Obtendo os requisitos de sistema
-                if "pc_requirements" in data:
-                    game_info["pc_requirements_minimum"] = data["pc_requirements"].get("minimum", "")
-                    game_info["pc_requirements_recommended"] = data["pc_requirements"].get("recommended", "")
-
-            players_url = f"http://api.steampowered.com/ISteamUserStats/GetNumberOfCurrentPlayers/v1/?appid={app_id}"
-            players_response = requests.get(players_url).json()
-            if players_response and "response" in players_response:
-                game_info["current_players"] = players_response["response"].get("player_count", 0)
+            sync_app_reviews(app_id, language, max_reviews)
+        except Exception as e:
+            print(f"Erro ao sincronizar os reviews do jogo {app_id}: {e}")
 
-            reviews_url = f"https://store.steampowered.com/appreviews/{app_id}?json=1"
-            params = {
-                "filter": "recent",
-                "language": language,
-                "review_type": "all",
-                "purchase_type": "all",
-                "num_per_page": min(50, max_reviews),
-            }
-            reviews_response = requests.get(reviews_url, params=params).json()
+    with ThreadPoolExecutor(max_workers=max_workers or STEAM_MAX_WORKERS) as executor:
+        list(executor.map(sync, app_ids))
 
-            if "query_summary" in reviews_response:
-                game_info["total_reviews"] = reviews_response["query_summary"].get("total_reviews", 0)
-                game_info["review_score"] = reviews_response["query_summary"].get("review_score_desc", "")
+    return _review_store.load(app_ids, language, max_reviews)
 
-            if "reviews" in reviews_response:
-                game_info["reviews"] = [review['review'] for review in reviews_response.get("reviews", [])]
+def _build_game_info(app_id, details_response, players_response, reviews_response):
+    """
+    Monta o dicionário de informações de um jogo a partir das respostas da Steam.
+    
+    Args:
+        app_id (int): ID do jogo na Steam
+        details_response (dict): Resposta do endpoint appdetails
+        players_response (dict): Resposta do endpoint GetNumberOfCurrentPlayers
+        reviews_response (dict): Resposta do endpoint appreviews
+    
+    Returns:
+        dict: Informações do jogo
+    """
+    game_info = {
+        "app_id": app_id,
+        "name": "Desconhecido",
+        "description": "",
+        "release_date": "",
+        "genres": [],
+        "categories": [],
+        "price": "",
+        "current_players": 0,
+        "total_reviews": 0,
+        "review_score": "",
+        "reviews": [],
+        "pc_requirements_minimum": "",
+        "pc_requirements_recommended": ""
+    }
+
+    if str(app_id) in details_response and details_response[str(app_id)]['success']:
+        data = details_response[str(app_id)]['data']
+
+        game_info["name"] = data.get("name", "Desconhecido")
+        game_info["description"] = data.get("short_description", "")
+        game_info["release_date"] = data.get("release_date", {}).get("date", "")
+        game_info["genres"] = [genre["description"] for genre in data.get("genres", [])]
+        game_info["categories"] = [category["description"] for category in data.get("categories", [])]
+
+        if "price_overview" in data:
+            game_info["price"] = data["price_overview"].get("final_formatted", "")
+
+        # Obtendo os requisitos de sistema
+        if "pc_requirements" in data:
+            game_info["pc_requirements_minimum"] = data["pc_requirements"].get("minimum", "")
+            game_info["pc_requirements_recommended"] = data["pc_requirements"].get("recommended", "")
+
+    if players_response and "response" in players_response:
+        game_info["current_players"] = players_response["response"].get("player_count", 0)
+
+    if "query_summary" in reviews_response:
+        game_info["total_reviews"] = reviews_response["query_summary"].get("total_reviews", 0)
+        game_info["review_score"] = reviews_response["query_summary"].get("review_score_desc", "")
+
+    if "reviews" in reviews_response:
+        game_info["reviews"] = [review['review'] for review in reviews_response.get("reviews", [])]
+
+    return game_info
+
+def _appdetails_key(app_id, language):
+    return f"{app_id}:{language}"
+
+def _appdetails_limiter():
+    """Limitador compartilhado das requisições ao appdetails."""
+    return rate_limit.get_limiter("steam-appdetails", STEAM_APPDETAILS_RATE, STEAM_APPDETAILS_BURST)
+
+def _fetch_app_details(app_id, language="portuguese", background=False):
+    """
+    Baixa a resposta do appdetails de um jogo.
+    
+    Consultas interativas não esperam pelo limitador, só descontam do saldo.
+    Em segundo plano, a requisição espera pelo limite de taxa do endpoint e
+    pela conclusão das consultas interativas em andamento (ver
+    rate_limit.TokenBucket.priority).
+    """
+    limiter = _appdetails_limiter()
+    if background:
+        limiter.acquire(background=True)
+    else:
+        limiter.consume()
+    return _get_json("https://store.steampowered.com/api/appdetails", {"appids": app_id, "l": language})
+
+def _is_valid_app_details(app_id, details_response):
+    """Indica se a resposta do appdetails é válida (e pode ir para o cache)."""
+    return bool(details_response and details_response.get(str(app_id), {}).get("success"))
+
+def get_app_details(app_ids, language="portuguese", use_cache=True, max_workers=None, background=False):
+    """
+    Obtém as respostas do appdetails de vários jogos, usando o cache
+    persistente e buscando em paralelo apenas os jogos que não estão em cache.
+    
+    Args:
+        app_ids (list): Lista de IDs de jogos na Steam
+        language (str): Idioma das descrições (padrão: portuguese)
+        use_cache (bool): Se False, ignora o cache (as respostas novas são gravadas mesmo assim)
+        max_workers (int): Número máximo de requisições simultâneas (padrão: STEAM_MAX_WORKERS)
+        background (bool): Se True, segue o limite de taxa e cede a vez às consultas interativas
+    
+    Returns:
+        dict: Resposta do appdetails por ID do jogo (jogos com erro são omitidos)
+    """
+    app_ids = list(dict.fromkeys(int(app_id) for app_id in app_ids))
+    cached = _appdetails_cache.get_many(_appdetails_key(app_id, language) for app_id in app_ids) if use_cache else {}
 
-            game_data.append(game_info)
+    details = {}
+    missing = []
+    for app_id in app_ids:
+        details_response = cached.get(_appdetails_key(app_id, language))
+        if details_response is not None:
+            details[app_id] = details_response
+        else:
+            missing.append(app_id)
+
+    if missing:
+        def fetch(app_id):
+            try:
+                return _fetch_app_details(app_id, language, background)
+            except Exception as e:
+                print(f"Erro ao obter os detalhes do jogo {app_id}: {e}")
+                return None
+
+        if background:
+            # Um jogo por vez: o ritmo é dado pelo limitador, e a thread libera a vez a cada requisição
+            fetched = {app_id: fetch(app_id) for app_id in missing}
+        else:
+            with _appdetails_limiter().priority():
+                with ThreadPoolExecutor(max_workers=max_workers or STEAM_MAX_WORKERS) as executor:
+                    fetched = dict(zip(missing, executor.map(fetch, missing)))
+        _appdetails_cache.set_many({
+            _appdetails_key(app_id, language): details_response
+            for app_id, details_response in fetched.items()
+            if _is_valid_app_details(app_id, details_response)
+        })
+        details.update({app_id: details_response for app_id, details_response in fetched.items() if details_response})
+
+    return details
+
+def warm_app_details(app_ids, language="portuguese", background=True):
+    """
+    Preenche o cache de appdetails para uma lista de jogos.
+    
+    As requisições seguem o limite de taxa do endpoint, então o aquecimento de
+    muitos jogos é feito aos poucos. Enquanto houver consultas interativas
+    (get_steam_game_data, get_app_details) em andamento, o aquecimento fica
+    em espera, e as requisições delas descontam do mesmo saldo.
+    
+    Args:
+        app_ids (list): Lista de IDs de jogos na Steam
+        language (str): Idioma das descrições (padrão: portuguese)
+        background (bool): Se True, executa em uma thread e retorna imediatamente
+    
+    Returns:
+        int: Número de jogos que não estavam em cache
+    """
+    app_ids = list(dict.fromkeys(int(app_id) for app_id in app_ids))
+    cached = _appdetails_cache.get_many(_appdetails_key(app_id, language) for app_id in app_ids)
+    missing = [app_id for app_id in app_ids if _appdetails_key(app_id, language) not in cached]
+
+    if missing:
+        if background:
+            threading.Thread(
+                target=get_app_details, args=(missing, language), kwargs={"background": True}, daemon=True
+            ).start()
+        else:
+            get_app_details(missing, language, background=True)
+    return len(missing)
+
+def _fetch_app_list(api_key=None):
+    """
+    Baixa a lista completa de apps da Steam (ID e nome).
+    
+    Com chave de API usa o IStoreService/GetAppList (paginado, só apps da loja);
+    sem chave usa o ISteamApps/GetAppList, que retorna a lista inteira de uma vez.
+    
+    Args:
+        api_key (str): Chave da API da Steam (opcional)
+    
+    Returns:
+        list: Pares (app_id, nome)
+    """
+    if not api_key:
+        response = _get_json("https://api.steampowered.com/ISteamApps/GetAppList/v2/")
+        return [(app["appid"], app.get("name", "")) for app in response.get("applist", {}).get("apps", [])]
+
+    apps = []
+    last_appid = 0
+    while True:
+        response = _get_json("https://api.steampowered.com/IStoreService/GetAppList/v1/", params={
+            "key": api_key,
+            "max_results": 50000,
+            "last_appid": last_appid,
+            "include_games": 1,
+            "include_dlc": 1,
+            "include_software": 1,
+            "include_videos": 1,
+            "include_hardware": 1,
+        }).get("response", {})
+        page = response.get("apps", [])
+        apps.extend((app["appid"], app.get("name", "")) for app in page)
+        if not page or not response.get("have_more_results"):
+            return apps
+        last_appid = response.get("last_appid", page[-1]["appid"])
+
+def _refresh_app_catalog(api_key=None):
+    """Baixa a lista de apps, monta o índice, grava no cache local e o torna o índice em uso."""
+    global _catalog, _catalog_refreshing
+    try:
+        catalog = steam_catalog.AppCatalog.build(_fetch_app_list(api_key))
+        catalog.save()
+        _catalog = catalog
+        return catalog
+    finally:
+        _catalog_refreshing = False
+
+def get_app_catalog(api_key=None, refresh=False):
+    """
+    Obtém o índice local de apps da Steam (ver steam_catalog.AppCatalog).
+    
+    O índice fica em memória e no cache local. Quando passa da validade
+    (STEAM_CATALOG_TTL), o índice antigo continua sendo usado enquanto um
+    novo é montado em uma thread; só a primeira montagem bloqueia.
+    
+    Args:
+        api_key (str): Chave da API da Steam (opcional, ver _fetch_app_list)
+        refresh (bool): Se True, baixa a lista de apps novamente
+    
+    Returns:
+        AppCatalog: Índice de apps
+    """
+    global _catalog, _catalog_refreshing
+    with _catalog_lock:
+        if _catalog is None and not refresh:
+            _catalog = steam_catalog.AppCatalog.load()
+        if _catalog is None or refresh:
+            _catalog_refreshing = True
+            return _refresh_app_catalog(api_key)
+        if _catalog.is_expired() and not _catalog_refreshing:
+            _catalog_refreshing = True
+            threading.Thread(target=_refresh_app_catalog, args=(api_key,), daemon=True).start()
+        return _catalog
+
+def search_apps(queries, limit=10, api_key=None):
+    """
+    Procura apps da Steam pelo nome no índice local, sem requisições por consulta.
+    
+    Args:
+        queries (list): Nomes (ou partes de nomes) procurados
+        limit (int): Número máximo de resultados por nome
+        api_key (str): Chave da API da Steam (opcional, usada para montar o índice)
+    
+    Returns:
+        dict: Apps encontrados (app_id, name e score) por nome procurado
+    """
+    if isinstance(queries, str):
+        queries = [queries]
+    catalog = get_app_catalog(api_key)
+    return {query: catalog.search(query, limit) for query in queries}
 
-        except Exception as e:
-            print(f"Erro ao processar o jogo {app_id}: {e}")
+def get_steam_game_data(app_ids, language="portuguese", max_reviews=100, max_workers=None):
+    """
+    Obtém dados detalhados de jogos da Steam.
+    
+    As três requisições de cada jogo (detalhes, jogadores atuais e reviews) são
+    feitas em paralelo, e vários jogos são processados ao mesmo tempo. O número de
+    requisições simultâneas por host é limitado por HOST_CONCURRENCY_LIMITS. Os
+    detalhes (appdetails) vêm do cache persistente quando disponíveis (ver
+    warm_app_details).
+    
+    Args:
+        app_ids (list): Lista de IDs de jogos na Steam
+        language (str): Idioma para as descrições e reviews (padrão: portuguese)
+        max_reviews (int): Número máximo de reviews a serem coletados
+        max_workers (int): Número máximo de threads (padrão: STEAM_MAX_WORKERS)
+    
+    Returns:
+        DataFrame: DataFrame com informações detalhadas dos jogos, na ordem de app_ids
+    """
+    reviews_params = {
+        "filter": "recent",
+        "language": language,
+        "review_type": "all",
+        "purchase_type": "all",
+        "num_per_page": min(50, max_reviews),
+    }
+
+    cached = _appdetails_cache.get_many(_appdetails_key(app_id, language) for app_id in app_ids)
+
+    # Consulta interativa: o aquecimento em segundo plano cede a vez enquanto ela roda
+    with _appdetails_limiter().priority(), ThreadPoolExecutor(max_workers=max_workers or STEAM_MAX_WORKERS) as executor:
+        pending = []
+        for app_id in app_ids:
+            details_response = cached.get(_appdetails_key(app_id, language))
+            players_url = f"http://api.steampowered.com/ISteamUserStats/GetNumberOfCurrentPlayers/v1/?appid={app_id}"
+            reviews_url = f"https://store.steampowered.com/appreviews/{app_id}?json=1"
+            pending.append((
+                app_id,
+                details_response if details_response is not None else executor.submit(_fetch_app_details, app_id, language),
+                executor.submit(_get_json, players_url),
+                executor.submit(_get_json, reviews_url, reviews_params),
+            ))
+
+        game_data = []
+        fetched_details = {}
+        for app_id, details, players_future, reviews_future in pending:
+            try:
+                if isinstance(details, dict):
+                    details_response = details
+                else:
+                    details_response = details.result()
+                    if _is_valid_app_details(app_id, details_response):
+                        fetched_details[_appdetails_key(app_id, language)] = details_response
+                game_data.append(_build_game_info(
+                    app_id,
+                    details_response,
+                    players_future.result(),
+                    reviews_future.result(),
+                ))
+            except Exception as e:
+                print(f"Erro ao processar o jogo {app_id}: {e}")
+
+    if fetched_details:
+        _appdetails_cache.set_many(fetched_details)
 
     df = pd.DataFrame(game_data)
     return df
 
-def get_recent_games_from_reviewers(app_id, api_key, num_players=10):
+# Colunas de get_recent_games_for_multiple_apps e seus tipos
+RECENT_GAMES_COLUMNS = [
+    ("Nome do jogo", object),
+    ("ID_steam do jogo", np.int64),
+    ("Contagem de jogadores", np.int64),
+    ("Origem do App", np.int64),
+]
+
+def _count_recent_games(app_id, api_key, num_players=10):
     """
-    Busca os jogos recentes mais jogados por usuários que comentaram no jogo especificado.
-    
-    Args:
-        app_id (str): ID do jogo na Steam
-        api_key (str): Chave da API da Steam
-        num_players (int): Número de usuários a analisar
+    Conta os jogos recentes dos usuários que comentaram no jogo especificado.
     
     Returns:
-        DataFrame: DataFrame com jogos recentes
+        Counter: Contagem por (nome do jogo, appid), ou None se os revisores não puderem ser obtidos
     """
     # Obter lista de revisores (comentários) para o jogo
     reviewers = []
     try:
-        response = requests.get(
+        data = _get_json(
             f"https://store.steampowered.com/appreviews/{app_id}",
-            params={"json": 1, "filter": "recent", "num_per_page": num_players},
+            {"json": 1, "filter": "recent", "num_per_page": num_players},
         )
-        data = response.json()
         for review in data.get("reviews", []):
             steam_id = review.get("author", {}).get("steamid")
             if steam_id:
                 reviewers.append(steam_id)
     except Exception as e:
         print("Erro ao buscar revisores:", e)
-        return pd.DataFrame(columns=["Nome do jogo", "ID_steam do jogo", "Contagem de jogadores"])
+        return None
 
     # Obter os jogos recentes para cada revisor
-    recent_games = []
+    game_counts = Counter()
     for steam_id in reviewers:
         try:
-            response = requests.get(
+            data = _get_json(
                 f"https://api.steampowered.com/IPlayerService/GetRecentlyPlayedGames/v1/",
-                params={"key": api_key, "steamid": steam_id},
+                {"key": api_key, "steamid": steam_id},
             )
-            data = response.json()
-            for game in data.get("response", {}).get("games", []):
-                recent_games.append({"name": game["name"], "appid": game["appid"]})
+            game_counts.update((game["name"], game["appid"]) for game in data.get("response", {}).get("games", []))
         except Exception as e:
             print(f"Erro ao buscar jogos recentes para o usuário {steam_id}:", e)
 
-    # Contar frequência de jogos
-    game_counts = Counter((game["name"], game["appid"]) for game in recent_games)
-
-    # Preparar dados para o DataFrame
-    data = [
-        {"Nome do jogo": name, "ID_steam do jogo": appid, "Contagem de jogadores": count}
-        for (name, appid), count in game_counts.items()
-    ]
-
-    return pd.DataFrame(data, columns=["Nome do jogo", "ID_steam do jogo", "Contagem de jogadores"])
+    return game_counts
 
-def get_recent_games_for_multiple_apps(app_ids, api_key, num_players=10):
+def get_recent_games_from_reviewers(app_id, api_key, num_players=10):
+    """
+    Busca os jogos recentes mais jogados por usuários que comentaram no jogo especificado.
+    
+    Args:
+        app_id (str): ID do jogo na Steam
+        api_key (str): Chave da API da Steam
+        num_players (int): Número de usuários a analisar
+    
+    Returns:
+        DataFrame: DataFrame com jogos recentes
+    """
+    builder = _ColumnsBuilder(RECENT_GAMES_COLUMNS[:3])
+    builder.extend(
+        (name, appid, count)
+        for (name, appid), count in (_count_recent_games(app_id, api_key, num_players) or {}).items()
+    )
+    return builder.to_frame()
+
+def iter_recent_game_records(app_ids, api_key, num_players=10, max_workers=None):
+    """
+    Percorre os jogos recentes dos revisores de vários jogos, consultando os jogos em paralelo.
+    
+    Args:
+        app_ids (list): Lista de IDs de jogos na Steam
+        api_key (str): Chave da API da Steam
+        num_players (int): Número de usuários a analisar por app
+        max_workers (int): Número máximo de jogos consultados ao mesmo tempo (padrão: STEAM_MAX_WORKERS)
+    
+    Yields:
+        tuple: Um registro por jogo recente, na ordem de RECENT_GAMES_COLUMNS
+    """
+    count = lambda app_id: _count_recent_games(app_id, api_key, num_players)
+    for app_id, game_counts, error in _bounded_map(count, app_ids, max_workers):
+        if error is not None:
+            print(f"Erro ao processar app_id {app_id}: {error}")
+            continue
+        for (name, appid), players in (game_counts or {}).items():
+            yield name, appid, players, app_id
+
+def get_recent_games_for_multiple_apps(app_ids, api_key, num_players=10, max_workers=None):
     """
     Executa a coleta de jogos recentes para uma lista de app_ids.
     
+    Os apps são processados em paralelo e os registros são acumulados em
+    colunas, formando um único DataFrame no final.
+    
     Args:
         app_ids (list): Lista de IDs de jogos na Steam
         api_key (str): Chave da API da Steam
         num_players (int): Número de usuários a analisar por app
+        max_workers (int): Número máximo de apps processados ao mesmo tempo (padrão: STEAM_MAX_WORKERS)
     
     Returns:
         DataFrame: DataFrame consolidado com jogos recentes para todos os apps
     """
-    all_data = []
-    for app_id in app_ids:
-        print(f"Processando app_id: {app_id}")
-        df = get_recent_games_from_reviewers(app_id, api_key, num_players)
-        if not df.empty:
-            df["Origem do App"] = app_id
-            all_data.append(df)
-
-    return pd.concat(all_data, ignore_index=True) if all_data else pd.DataFrame(
-        columns=["Nome do jogo", "ID_steam do jogo", "Contagem de jogadores", "Origem do App"])
\ No newline at end of file
+    builder = _ColumnsBuilder(RECENT_GAMES_COLUMNS)
+    builder.extend(iter_recent_game_records(app_ids, api_key, num_players, max_workers))
+    return builder.to_frame()
\ No newline at end of file
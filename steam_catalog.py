@@ -0,0 +1,296 @@
+import bisect
+import os
+import re
+import threading
+import time
+import unicodedata
+
+import numpy as np
+
+import local_cache
+
+# Validade do catálogo local de apps da Steam
+STEAM_CATALOG_TTL = float(os.getenv("STEAM_CATALOG_TTL", str(24 * 3600)))
+# Máximo de entradas das listas de trigramas combinadas para gerar candidatos na busca aproximada
+STEAM_CATALOG_MERGE_BUDGET = int(os.getenv("STEAM_CATALOG_MERGE_BUDGET", "20000"))
+# Máximo de candidatos (os com mais trigramas raros em comum) pontuados na busca aproximada
+STEAM_CATALOG_MAX_CANDIDATES = int(os.getenv("STEAM_CATALOG_MAX_CANDIDATES", "500"))
+
+# Tudo que não é letra ou dígito (em qualquer alfabeto) vira separador
+_NON_ALNUM = re.compile(r"[\W_]+")
+# Serializa as gravações do catálogo (troca de versão + limpeza das anteriores)
+_save_lock = threading.Lock()
+
+def normalize_name(name):
+    """
+    Normaliza um nome para busca (minúsculas, sem acentos e só letras/números separados por espaço).
+
+    Letras de qualquer alfabeto são mantidas (ex: "原神", "Ведьмак").
+
+    Args:
+        name (str): Nome do app
+
+    Returns:
+        str: Nome normalizado
+    """
+    # Símbolos saem antes da decomposição (senão "™" viraria "TM" grudado no nome)
+    name = unicodedata.normalize("NFKD", _NON_ALNUM.sub(" ", name))
+    name = "".join(char for char in name if not unicodedata.combining(char))
+    return _NON_ALNUM.sub(" ", name.casefold()).strip()
+
+def _trigram_keys(normalized):
+    """Trigramas do nome normalizado (com espaços nas bordas), codificados como int64 (21 bits por code point)."""
+    padded = f" {normalized} "
+    return {
+        (ord(padded[i]) << 42) | (ord(padded[i + 1]) << 21) | ord(padded[i + 2])
+        for i in range(len(padded) - 2)
+    }
+
+def _pack_strings(strings):
+    """Concatena strings UTF-8 em um único buffer com offsets."""
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(data) for data in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+def _unpack_strings(blob, offsets):
+    """Inverso de _pack_strings."""
+    data = blob.tobytes()
+    return [data[start:end].decode("utf-8") for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+class AppCatalog:
+    """
+    Índice local dos apps da Steam para busca por nome.
+
+    Guarda os IDs e nomes em arrays compactos, a lista de nomes normalizados
+    ordenada (busca por prefixo com bisect), um índice invertido de
+    trigramas em formato CSR (candidatos da busca aproximada) e, para cada
+    nome, a lista dos seus trigramas (pontuação dos candidatos).
+    """
+
+    _ARRAYS = ("app_ids", "names", "name_offsets", "normalized", "normalized_offsets",
+               "sorted_order", "trigram_keys", "trigram_offsets", "postings", "trigram_counts",
+               "name_trigrams")
+
+    def __init__(self, arrays, fetched_at):
+        self.fetched_at = fetched_at
+        self.arrays = arrays
+        self.app_ids = arrays["app_ids"]
+        self.names = _unpack_strings(arrays["names"], arrays["name_offsets"])
+        self.normalized = _unpack_strings(arrays["normalized"], arrays["normalized_offsets"])
+        self.sorted_order = arrays["sorted_order"]
+        self.sorted_normalized = [self.normalized[index] for index in self.sorted_order.tolist()]
+        self.trigram_keys = arrays["trigram_keys"]
+        self.trigram_offsets = arrays["trigram_offsets"]
+        self.postings = arrays["postings"]
+        self.trigram_counts = arrays["trigram_counts"]
+        self.name_trigrams = arrays["name_trigrams"]
+        self.name_trigram_offsets = np.concatenate(([0], np.cumsum(self.trigram_counts, dtype=np.int64)))
+
+    def __len__(self):
+        return len(self.app_ids)
+
+    @classmethod
+    def build(cls, apps):
+        """
+        Monta o índice a partir da lista de apps.
+
+        Args:
+            apps (iterable): Pares (app_id, nome)
+
+        Returns:
+            AppCatalog: Índice montado
+        """
+        unique = {}
+        for app_id, name in apps:
+            name = (name or "").strip()
+            if name:
+                unique[int(app_id)] = name
+        app_ids = np.fromiter(unique.keys(), dtype=np.int64, count=len(unique))
+        names = list(unique.values())
+        normalized = [normalize_name(name) for name in names]
+
+        trigram_lists = [_trigram_keys(name) for name in normalized]
+        counts = np.fromiter((len(trigrams) for trigrams in trigram_lists), dtype=np.int32, count=len(names))
+        keys = np.fromiter((key for trigrams in trigram_lists for key in trigrams), dtype=np.int64, count=int(counts.sum()))
+        owners = np.repeat(np.arange(len(names), dtype=np.int32), counts)
+
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        trigram_keys, starts, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        # Trigramas de cada nome (posições em trigram_keys), na mesma ordem de owners
+        name_trigrams = np.empty(len(keys), dtype=np.int32)
+        name_trigrams[order] = inverse
+
+        name_blob, name_offsets = _pack_strings(names)
+        normalized_blob, normalized_offsets = _pack_strings(normalized)
+        arrays = {
+            "app_ids": app_ids,
+            "names": name_blob,
+            "name_offsets": name_offsets,
+            "normalized": normalized_blob,
+            "normalized_offsets": normalized_offsets,
+            "sorted_order": np.array(sorted(range(len(normalized)), key=normalized.__getitem__), dtype=np.int32),
+            "trigram_keys": trigram_keys,
+            "trigram_offsets": np.append(starts, len(keys)).astype(np.int64),
+            "postings": owners[order],
+            "trigram_counts": counts,
+            "name_trigrams": name_trigrams,
+        }
+        return cls(arrays, time.time())
+
+    @staticmethod
+    def _root():
+        return os.path.dirname(local_cache.cache_path("steam", "catalog", "meta.json"))
+
+    def save(self):
+        """
+        Grava o índice no cache local (substituindo a versão anterior).
+
+        Os arrays vão para um diretório de versão gravado de forma atômica
+        (ver local_cache.atomic_directory), e só depois o meta.json passa a
+        apontar para ele; um load concorrente vê a versão antiga ou a nova,
+        nunca uma gravação pela metade.
+        """
+        root = self._root()
+        with _save_lock:
+            version = str(int(time.time() * 1000))
+            with local_cache.atomic_directory(os.path.join(root, version)) as directory:
+                for name in self._ARRAYS:
+                    np.save(os.path.join(directory, f"{name}.npy"), self.arrays[name], allow_pickle=False)
+            local_cache.write_json(os.path.join(root, "meta.json"), {
+                "version": version,
+                "fetched_at": self.fetched_at,
+                "apps": len(self),
+            })
+            # Remove as versões anteriores (inclusive as que uma gravação interrompida deixou para trás)
+            for entry in os.listdir(root):
+                if entry != version and os.path.isdir(os.path.join(root, entry)):
+                    local_cache.remove_tree(os.path.join(root, entry))
+
+    @classmethod
+    def load(cls):
+        """
+        Lê o índice gravado no cache local.
+
+        Returns:
+            AppCatalog: Índice gravado (ou None se não existir)
+        """
+        root = cls._root()
+        meta = local_cache.read_json(os.path.join(root, "meta.json"))
+        if meta is None:
+            return None
+        try:
+            arrays = {
+                name: np.load(os.path.join(root, meta["version"], f"{name}.npy"), allow_pickle=False)
+                for name in cls._ARRAYS
+            }
+        except (OSError, ValueError):
+            return None
+        return cls(arrays, meta["fetched_at"])
+
+    def is_expired(self):
+        """Indica se o índice passou da validade STEAM_CATALOG_TTL."""
+        return time.time() - self.fetched_at >= STEAM_CATALOG_TTL
+
+    def _prefix_matches(self, normalized, limit):
+        """Índices dos nomes que começam com o texto normalizado."""
+        start = bisect.bisect_left(self.sorted_normalized, normalized)
+        matches = []
+        for position in range(start, len(self.sorted_normalized)):
+            if not self.sorted_normalized[position].startswith(normalized) or len(matches) >= limit:
+                break
+            matches.append(int(self.sorted_order[position]))
+        return matches
+
+    def _fuzzy_matches(self, normalized, limit, min_score):
+        """
+        Melhores nomes por proporção de trigramas em comum com o texto normalizado.
+
+        Returns:
+            list: Pares (índice do nome, pontuação de 0 a 0.9)
+        """
+        query_trigrams = np.fromiter(_trigram_keys(normalized), dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self.trigram_keys, query_trigrams), len(self.trigram_keys) - 1)
+        positions = positions[self.trigram_keys[positions] == query_trigrams]
+        if not len(positions):
+            return []
+
+        # Candidatos: nomes com os trigramas mais raros da consulta, até o orçamento de entradas
+        starts = self.trigram_offsets[positions]
+        lengths = self.trigram_offsets[positions + 1] - starts
+        order = np.argsort(lengths, kind="stable")
+        merged = max(1, int(np.searchsorted(np.cumsum(lengths[order]), STEAM_CATALOG_MERGE_BUDGET, side="right")))
+        candidates = np.concatenate([self.postings[starts[i]:starts[i] + lengths[i]] for i in order[:merged].tolist()])
+        owners, common = np.unique(candidates, return_counts=True)
+
+        # Só nomes com trigramas suficientes podem atingir min_score (mesmo contando os comuns que ficaram de fora)
+        skipped = len(positions) - merged
+        keep = common + skipped >= max(1, int(min_score * len(query_trigrams) * 0.7))
+        owners, common = owners[keep], common[keep]
+        if skipped and len(owners):
+            if len(owners) > STEAM_CATALOG_MAX_CANDIDATES:
+                best = np.argpartition(-common, STEAM_CATALOG_MAX_CANDIDATES - 1)[:STEAM_CATALOG_MAX_CANDIDATES]
+                owners = owners[best]
+            # Contagem exata: trigramas de cada candidato que estão na consulta
+            counts = self.trigram_counts[owners].astype(np.int64)
+            first = self.name_trigram_offsets[owners]
+            bounds = np.cumsum(counts)
+            gather = np.arange(bounds[-1]) + np.repeat(first - (bounds - counts), counts)
+            in_query = np.zeros(len(self.trigram_keys), dtype=bool)
+            in_query[positions] = True
+            matched = np.cumsum(in_query[self.name_trigrams[gather]], dtype=np.int32)
+            common = np.diff(matched[bounds - 1], prepend=0)
+
+        containment = common / len(query_trigrams)
+        dice = 2 * common / (len(query_trigrams) + self.trigram_counts[owners])
+        fuzzy = 0.7 * containment + 0.3 * dice
+        keep = fuzzy >= min_score
+        owners, fuzzy = owners[keep], fuzzy[keep]
+        if len(owners) > limit:
+            best = np.argpartition(-fuzzy, limit - 1)[:limit]
+            owners, fuzzy = owners[best], fuzzy[best]
+        return [(int(index), float(score) * 0.9) for index, score in zip(owners.tolist(), fuzzy.tolist())]
+
+    def search(self, query, limit=10, min_score=0.3):
+        """
+        Procura apps pelo nome.
+
+        Nomes idênticos têm pontuação 1; nomes que começam com o texto
+        procurado vêm em seguida; os demais são ordenados pela proporção de
+        trigramas em comum (o que tolera palavras fora de ordem e erros de digitação).
+
+        Como nomes idênticos e prefixos sempre ficam à frente, a busca
+        aproximada só é feita quando eles não preenchem o limite. Os candidatos
+        da busca aproximada vêm dos trigramas mais raros da consulta, até
+        STEAM_CATALOG_MERGE_BUDGET entradas; os trigramas comuns que ficaram
+        de fora só entram na pontuação dos candidatos. Nomes que compartilham
+        com a consulta apenas trigramas muito comuns não são retornados.
+
+        Args:
+            query (str): Nome (ou parte do nome) do app
+            limit (int): Número máximo de resultados
+            min_score (float): Pontuação mínima dos resultados aproximados (0 a 1)
+
+        Returns:
+            list: Apps encontrados (app_id, name e score), do mais ao menos relevante
+        """
+        normalized = normalize_name(query)
+        if not normalized or not len(self):
+            return []
+
+        scores = {}
+        for index in self._prefix_matches(normalized, max(limit * 5, 50)):
+            exact = self.normalized[index] == normalized
+            scores[index] = 1.0 if exact else 0.9 + 0.09 * len(normalized) / len(self.normalized[index])
+
+        # Pontuações aproximadas ficam abaixo de 0.9: com o limite preenchido, não mudariam o resultado
+        if len(scores) < limit:
+            for index, score in self._fuzzy_matches(normalized, max(limit * 5, 50), min_score):
+                scores.setdefault(index, score)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], len(self.names[item[0]]), item[0]))[:limit]
+        return [
+            {"app_id": int(self.app_ids[index]), "name": self.names[index], "score": round(score, 3)}
+            for index, score in ranked
+        ]
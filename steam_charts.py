@@ -0,0 +1,181 @@
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import local_cache
+
+# Segundos durante os quais o mês corrente é reaproveitado sem baixar a página novamente
+STEAMCHARTS_CURRENT_TTL = float(os.getenv("STEAMCHARTS_CURRENT_TTL", str(6 * 3600)))
+
+# Colunas do histórico: mês (primeiro dia), médias/picos de jogadores e variação em relação ao mês anterior
+HISTORY_COLUMNS = ["month", "avg_players", "gain", "gain_pct", "peak_players", "partial"]
+
+_history_locks = {}
+_history_locks_guard = threading.Lock()
+
+def _history_dir(app_id):
+    """Diretório com o histórico mensal de um jogo."""
+    return os.path.dirname(local_cache.cache_path("steam", "charts", app_id, "meta.json"))
+
+def _history_lock(app_id):
+    """Lock que serializa a gravação do histórico de um jogo."""
+    with _history_locks_guard:
+        return _history_locks.setdefault(str(app_id), threading.Lock())
+
+def _current_month():
+    """Primeiro dia do mês corrente (UTC)."""
+    now = datetime.now(timezone.utc)
+    return np.datetime64(f"{now.year:04d}-{now.month:02d}-01", "D")
+
+def parse_month(label):
+    """
+    Converte o rótulo de mês do steamcharts em data.
+
+    Args:
+        label (str): Ex: "October 2026" ou "Last 30 Days"
+
+    Returns:
+        tuple: (np.datetime64 do primeiro dia do mês, True se for o período corrente parcial)
+    """
+    label = label.strip()
+    if label.lower().startswith("last"):
+        return _current_month(), True
+    month = datetime.strptime(label, "%B %Y")
+    return np.datetime64(f"{month.year:04d}-{month.month:02d}-01", "D"), False
+
+def parse_number(text):
+    """
+    Converte um número do steamcharts ("1,234.5", "+12.3", "-1.5%", "-") em float.
+
+    Returns:
+        float: Valor numérico (NaN se vazio)
+    """
+    text = text.strip().replace(",", "").rstrip("%")
+    if text in ("", "-"):
+        return np.nan
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+def rows_to_frame(rows):
+    """
+    Converte as linhas da tabela do steamcharts em colunas tipadas.
+
+    Args:
+        rows (list): Células de cada linha (mês, média, variação, variação %, pico)
+
+    Returns:
+        DataFrame: Histórico com as colunas HISTORY_COLUMNS, do mês mais recente ao mais antigo
+    """
+    months = []
+    partial = []
+    values = []
+    for cells in rows:
+        if len(cells) < 5:
+            continue
+        month, is_partial = parse_month(cells[0])
+        months.append(month)
+        partial.append(is_partial)
+        values.append([parse_number(cell) for cell in cells[1:5]])
+
+    values = np.array(values, dtype=np.float64).reshape(-1, 4)
+    return pd.DataFrame({
+        "month": np.array(months, dtype="datetime64[D]"),
+        "avg_players": values[:, 0],
+        "gain": values[:, 1],
+        "gain_pct": values[:, 2],
+        "peak_players": np.nan_to_num(values[:, 3]).astype(np.int64),
+        "partial": np.array(partial, dtype=bool),
+    })
+
+def load_history(app_id):
+    """
+    Lê o histórico mensal gravado de um jogo.
+
+    Returns:
+        tuple: (DataFrame com as colunas HISTORY_COLUMNS ou None, metadados ou None)
+    """
+    directory = _history_dir(app_id)
+    meta = local_cache.read_json(os.path.join(directory, "meta.json"))
+    if meta is None:
+        return None, None
+    history = local_cache.load_columns(os.path.join(directory, meta["version"]), mmap=False)
+    if history is None:
+        return None, None
+    return history, meta
+
+def is_fresh(history, meta):
+    """
+    Indica se o histórico gravado pode ser usado sem baixar a página novamente.
+
+    Os meses fechados nunca mudam; apenas o mês corrente expira, após
+    STEAMCHARTS_CURRENT_TTL segundos ou na virada do mês.
+    """
+    if history is None or meta is None:
+        return False
+    if time.time() - meta.get("fetched_at", 0) >= STEAMCHARTS_CURRENT_TTL:
+        return False
+    return meta.get("current_month") == str(_current_month())
+
+def closed_months(history):
+    """Meses fechados (imutáveis) já gravados no histórico."""
+    if history is None:
+        return set()
+    return set(history.loc[~history["partial"].to_numpy(), "month"].to_numpy().astype("datetime64[D]"))
+
+def save_history(app_id, history, fresh):
+    """
+    Mescla as linhas novas no histórico gravado e grava o resultado.
+
+    Linhas de meses fechados já gravados são mantidas; o período corrente é
+    sempre substituído pelo mais recente. A mescla e a gravação são feitas com
+    o lock do jogo, sobre o histórico gravado mais recente, então atualizações
+    simultâneas do mesmo jogo não perdem meses nem deixam versões órfãs.
+
+    Args:
+        app_id (int): ID do jogo na Steam
+        history (DataFrame): Histórico lido antes da atualização (ou None)
+        fresh (DataFrame): Linhas recém-obtidas (ver rows_to_frame)
+
+    Returns:
+        DataFrame: Histórico mesclado, do mês mais recente ao mais antigo
+    """
+    with _history_lock(app_id):
+        # Outra atualização pode ter gravado depois da leitura feita pelo chamador
+        stored, _ = load_history(app_id)
+        if stored is not None:
+            history = stored
+        return _write_history(app_id, _merge_history(history, fresh))
+
+def _merge_history(history, fresh):
+    """Mescla as linhas novas no histórico (ver save_history)."""
+    if history is not None:
+        known = closed_months(history)
+        fresh = fresh[~(np.isin(fresh["month"].to_numpy(), list(known)) & ~fresh["partial"].to_numpy())]
+        history = history[~history["partial"].to_numpy()]
+        merged = pd.concat([fresh, history], ignore_index=True)
+    else:
+        merged = fresh
+    merged = merged.sort_values(["month", "partial"], ascending=False, kind="stable").reset_index(drop=True)
+    return merged[HISTORY_COLUMNS]
+
+def _write_history(app_id, merged):
+    """Grava uma nova versão do histórico e remove as anteriores."""
+    directory = _history_dir(app_id)
+    version = str(int(time.time() * 1000))
+    local_cache.save_columns(os.path.join(directory, version), merged)
+    local_cache.write_json(os.path.join(directory, "meta.json"), {
+        "version": version,
+        "fetched_at": time.time(),
+        "current_month": str(_current_month()),
+        "rows": len(merged),
+    })
+    for entry in os.listdir(directory):
+        if entry != version and os.path.isdir(os.path.join(directory, entry)):
+            local_cache.remove_tree(os.path.join(directory, entry))
+    return merged
@@ -0,0 +1,185 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+import local_cache
+
+# Colunas retornadas por get_steam_game_reviews
+REVIEW_COLUMNS = ["app_id", "review", "user_id", "hours_played", "sentiment"]
+
+class ReviewStore(local_cache.SQLiteStore):
+    """
+    Armazenamento local dos reviews da Steam, indexado por recommendationid e
+    idioma da sincronização (um mesmo review pode aparecer na sincronização
+    de um idioma específico e na de "all" sem que uma sobrescreva a outra).
+
+    Além dos reviews, guarda um checkpoint por jogo e idioma: o review mais
+    recente já sincronizado (onde a próxima sincronização incremental para) e
+    o cursor a partir do qual os reviews mais antigos ainda podem ser baixados.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS reviews ("
+        "recommendationid TEXT NOT NULL, app_id INTEGER NOT NULL, language TEXT NOT NULL, "
+        "review TEXT, user_id TEXT, hours_played REAL, voted_up INTEGER, "
+        "timestamp_created INTEGER, timestamp_updated INTEGER, PRIMARY KEY (recommendationid, language))",
+        "CREATE INDEX IF NOT EXISTS reviews_by_app ON reviews (app_id, language, timestamp_created)",
+        "CREATE TABLE IF NOT EXISTS checkpoints ("
+        "app_id INTEGER NOT NULL, language TEXT NOT NULL, newest_id TEXT, newest_timestamp INTEGER, "
+        "backfill_cursor TEXT, synced_at REAL, PRIMARY KEY (app_id, language))",
+    )
+
+    def __init__(self, name="steam_reviews"):
+        super().__init__(name)
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = super()._connection()
+            self._migrate(connection)
+        return connection
+
+    def _migrate(self, connection):
+        """Converte a tabela reviews antiga (chave só por recommendationid) para a chave com idioma."""
+        def keyed_by_id_only():
+            primary_key = [row[1] for row in connection.execute("PRAGMA table_info(reviews)") if row[5]]
+            return primary_key == ["recommendationid"]
+
+        if not keyed_by_id_only():
+            return
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Outro processo pode ter migrado enquanto esperávamos o lock de escrita
+            if keyed_by_id_only():
+                connection.execute("DROP INDEX IF EXISTS reviews_by_app")
+                connection.execute("ALTER TABLE reviews RENAME TO reviews_legacy")
+                for statement in self.SCHEMA:
+                    connection.execute(statement)
+                connection.execute("INSERT OR IGNORE INTO reviews SELECT * FROM reviews_legacy")
+                connection.execute("DROP TABLE reviews_legacy")
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    def store(self, app_id, language, reviews):
+        """
+        Grava (ou atualiza) reviews no formato da API.
+
+        Args:
+            app_id (int): ID do jogo na Steam
+            language (str): Idioma dos reviews
+            reviews (list): Reviews da API
+
+        Returns:
+            int: Número de reviews gravados
+        """
+        rows = []
+        for review in reviews:
+            if not review.get("recommendationid"):
+                continue
+            author = review.get("author", {})
+            rows.append((
+                str(review["recommendationid"]),
+                app_id,
+                language,
+                review.get("review"),
+                author.get("steamid"),
+                author.get("playtime_forever", 0) / 60.0,  # Convertendo minutos para horas
+                1 if review.get("voted_up") else 0,
+                review.get("timestamp_created"),
+                review.get("timestamp_updated"),
+            ))
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO reviews (recommendationid, app_id, language, review, user_id, "
+                "hours_played, voted_up, timestamp_created, timestamp_updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def known_ids(self, recommendation_ids, language):
+        """
+        Retorna quais dos IDs informados já estão armazenados em um idioma.
+
+        Args:
+            recommendation_ids (iterable): IDs de reviews
+            language (str): Idioma da sincronização
+
+        Returns:
+            set: IDs já armazenados
+        """
+        ids = [str(recommendation_id) for recommendation_id in recommendation_ids]
+        rows = self._select_in(
+            "SELECT recommendationid FROM reviews WHERE recommendationid IN ({placeholders}) AND language = ?",
+            ids,
+            language,
+        )
+        return {row[0] for row in rows}
+
+    def count(self, app_id, language):
+        """Número de reviews armazenados de um jogo em um idioma."""
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM reviews WHERE app_id = ? AND language = ?", (app_id, language)
+        ).fetchone()[0]
+
+    def get_checkpoint(self, app_id, language):
+        """
+        Lê o checkpoint de sincronização de um jogo.
+
+        Returns:
+            dict: newest_id, newest_timestamp, backfill_cursor e synced_at (ou None)
+        """
+        row = self._connection().execute(
+            "SELECT newest_id, newest_timestamp, backfill_cursor, synced_at FROM checkpoints "
+            "WHERE app_id = ? AND language = ?",
+            (app_id, language),
+        ).fetchone()
+        if row is None:
+            return None
+        return {"newest_id": row[0], "newest_timestamp": row[1], "backfill_cursor": row[2], "synced_at": row[3]}
+
+    def save_checkpoint(self, app_id, language, newest_id, newest_timestamp, backfill_cursor):
+        """Grava o checkpoint de sincronização de um jogo."""
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO checkpoints (app_id, language, newest_id, newest_timestamp, "
+                "backfill_cursor, synced_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (app_id, language, newest_id, newest_timestamp, backfill_cursor, time.time()),
+            )
+
+    def load(self, app_ids, language, max_reviews=None):
+        """
+        Lê os reviews mais recentes de vários jogos.
+
+        Args:
+            app_ids (list): IDs dos jogos na Steam
+            language (str): Idioma dos reviews
+            max_reviews (int): Número máximo de reviews por jogo (opcional)
+
+        Returns:
+            DataFrame: Colunas app_id, review, user_id, hours_played e sentiment, na ordem de app_ids
+        """
+        connection = self._connection()
+        frames = []
+        for app_id in app_ids:
+            query = (
+                "SELECT app_id, review, user_id, hours_played, voted_up FROM reviews "
+                "WHERE app_id = ? AND language = ? ORDER BY timestamp_created DESC, recommendationid DESC"
+            )
+            params = [app_id, language]
+            if max_reviews is not None:
+                query += " LIMIT ?"
+                params.append(max_reviews)
+            frames.append(pd.read_sql_query(query, connection, params=params))
+
+        reviews = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+            columns=["app_id", "review", "user_id", "hours_played", "voted_up"]
+        )
+        reviews["sentiment"] = pd.Series(
+            np.where(reviews.pop("voted_up").astype(bool), "positivo", "negativo"), index=reviews.index, dtype=object
+        )
+        return reviews[REVIEW_COLUMNS]
@@ -0,0 +1,9 @@
+import pytest
+
+import local_cache
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Isola o cache local de cada teste em um diretório temporário."""
+    monkeypatch.setattr(local_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import local_cache
+
+def test_cache_path_creates_parent_directory(cache_dir):
+    path = local_cache.cache_path("a", 1, "file.json")
+    assert path == os.path.join(str(cache_dir), "a", "1", "file.json")
+    assert os.path.isdir(os.path.dirname(path))
+
+def test_write_and_read_json_round_trip():
+    path = local_cache.cache_path("data.json")
+    local_cache.write_json(path, {"nome": "Ação", "valores": [1, 2]})
+    assert local_cache.read_json(path) == {"nome": "Ação", "valores": [1, 2]}
+    assert [entry for entry in os.listdir(os.path.dirname(path)) if entry.endswith(".tmp")] == []
+
+def test_read_json_returns_default_when_missing_or_corrupted():
+    path = local_cache.cache_path("broken.json")
+    assert local_cache.read_json(path, default={}) == {}
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("{")
+    assert local_cache.read_json(path) is None
+
+def test_save_and_load_columns_round_trip(cache_dir):
+    frame = pd.DataFrame({
+        "id": np.arange(3, dtype=np.int64),
+        "price": [1.5, 2.5, np.nan],
+        "flag": [True, False, True],
+        "time_left": pd.Categorical(["SHORT", "LONG", "SHORT"], categories=["SHORT", "LONG"]),
+    })
+    directory = str(cache_dir / "columns")
+    local_cache.save_columns(directory, frame)
+
+    for mmap in (True, False):
+        loaded = local_cache.load_columns(directory, mmap=mmap)
+        assert loaded.dtypes.to_dict() == frame.dtypes.to_dict()
+        assert loaded.equals(frame)
+
+def test_load_columns_missing_directory_returns_none(cache_dir):
+    assert local_cache.load_columns(str(cache_dir / "missing")) is None
+
+def test_save_columns_replaces_existing_directory(cache_dir):
+    directory = str(cache_dir / "columns")
+    local_cache.save_columns(directory, pd.DataFrame({"a": [1, 2]}))
+    local_cache.save_columns(directory, pd.DataFrame({"b": [3]}))
+    assert list(local_cache.load_columns(directory).columns) == ["b"]
+    assert os.listdir(str(cache_dir)) == ["columns"]
+
+def test_atomic_directory_keeps_target_when_block_fails(cache_dir):
+    directory = str(cache_dir / "columns")
+    local_cache.save_columns(directory, pd.DataFrame({"a": [1, 2]}))
+    with pytest.raises(RuntimeError):
+        with local_cache.atomic_directory(directory) as tmp_directory:
+            with open(os.path.join(tmp_directory, "columns.json"), "w", encoding="utf-8") as file:
+                file.write("[]")
+            raise RuntimeError("interrompido")
+    assert local_cache.load_columns(directory)["a"].tolist() == [1, 2]
+    assert os.listdir(str(cache_dir)) == ["columns"]
+
+def test_key_value_store_get_set_delete():
+    store = local_cache.KeyValueStore("kv")
+    assert store.get("a", "padrão") == "padrão"
+    store.set("a", {"x": 1})
+    store.set_many({"b": [1, 2], "c": "três"})
+    assert store.get("a") == {"x": 1}
+    assert store.get_many(["a", "c", "missing"]) == {"a": {"x": 1}, "c": "três"}
+    store.delete("a")
+    assert store.get("a") is None
+
+def test_key_value_store_get_many_batches_large_key_lists(monkeypatch):
+    store = local_cache.KeyValueStore("kv")
+    monkeypatch.setattr(store, "_BATCH_SIZE", 7)
+    store.set_many({str(number): number for number in range(50)})
+    assert store.get_many(str(number) for number in range(60)) == {str(number): number for number in range(50)}
+
+def test_key_value_store_expired_entries_are_hidden_and_purged():
+    store = local_cache.KeyValueStore("kv", ttl=0.05)
+    store.set("a", 1)
+    assert store.get("a") == 1
+    time.sleep(0.1)
+    assert store.get("a") is None
+    assert store.get_many(["a"]) == {}
+    assert store.purge_expired() == 1
+    assert store.purge_expired() == 0
+
+def test_key_value_store_purges_on_first_connection():
+    local_cache.KeyValueStore("kv", ttl=0.05).set("a", 1)
+    time.sleep(0.1)
+    store = local_cache.KeyValueStore("kv", ttl=0.05)
+    store.get("b")
+    assert store.purge_expired() == 0
+
+def test_key_value_store_without_ttl_never_expires():
+    store = local_cache.KeyValueStore("kv")
+    store.set("a", 1)
+    assert store.purge_expired() == 0
+    assert store.get("a") == 1
+
+def test_sqlite_store_uses_one_connection_per_thread():
+    store = local_cache.KeyValueStore("kv")
+    store.set("main", 1)
+    connections = []
+
+    def worker():
+        connections.append(store._connection())
+        store.set("worker", 2)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert connections[0] is not store._connection()
+    assert store.get_many(["main", "worker"]) == {"main": 1, "worker": 2}
@@ -0,0 +1,112 @@
+import threading
+import time
+
+import pytest
+
+import rate_limit
+
+def test_acquire_within_capacity_does_not_wait():
+    bucket = rate_limit.TokenBucket(rate=10, capacity=5)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.05
+
+def test_acquire_waits_for_refill():
+    bucket = rate_limit.TokenBucket(rate=20, capacity=1)
+    bucket.acquire()
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.04
+
+def test_consume_can_go_negative_and_delays_acquire():
+    bucket = rate_limit.TokenBucket(rate=20, capacity=1)
+    bucket.consume(2)
+    assert bucket._tokens < 0
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+def test_background_acquire_waits_for_priority_calls():
+    bucket = rate_limit.TokenBucket(rate=100)
+    acquired = threading.Event()
+
+    def background():
+        bucket.acquire(background=True)
+        acquired.set()
+
+    with bucket.priority():
+        thread = threading.Thread(target=background)
+        thread.start()
+        assert not acquired.wait(0.1)
+    assert acquired.wait(1.0)
+    thread.join()
+
+def test_foreground_acquire_ignores_priority_calls():
+    bucket = rate_limit.TokenBucket(rate=100)
+    with bucket.priority():
+        bucket.acquire()
+
+def test_pause_blocks_acquire():
+    bucket = rate_limit.TokenBucket(rate=100)
+    bucket.pause(0.1)
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+def test_set_rate_clamps_tokens_to_new_capacity():
+    bucket = rate_limit.TokenBucket(rate=100)
+    bucket.set_rate(5)
+    assert bucket.rate == 5 and bucket.capacity == 5
+    assert bucket._tokens <= 5
+
+def test_update_from_headers_uses_allotted_qps():
+    bucket = rate_limit.TokenBucket(rate=100)
+    bucket.update_from_headers({"X-Plan-Qps-Allotted": "50"}, 200)
+    assert bucket.rate == 50
+    assert bucket._paused_until == 0
+
+def test_update_from_headers_respects_retry_after_on_429():
+    bucket = rate_limit.TokenBucket(rate=100)
+    before = time.monotonic()
+    bucket.update_from_headers({"Retry-After": "3"}, 429)
+    assert bucket._paused_until - before == pytest.approx(3, abs=0.5)
+
+def test_update_from_headers_pauses_until_quota_reset():
+    bucket = rate_limit.TokenBucket(rate=100)
+    before = time.monotonic()
+    bucket.update_from_headers({
+        "X-Plan-Quota-Allotted": "36000",
+        "X-Plan-Quota-Current": "36000",
+        "X-Plan-Quota-Reset": "120000",
+    }, 200)
+    assert bucket._paused_until - before == pytest.approx(120, abs=0.5)
+
+def test_update_from_headers_ignores_quota_with_room_left():
+    bucket = rate_limit.TokenBucket(rate=100)
+    bucket.update_from_headers({
+        "X-Plan-Quota-Allotted": "36000",
+        "X-Plan-Quota-Current": "10",
+        "X-Plan-Quota-Reset": "120000",
+    }, 200)
+    assert bucket._paused_until == 0
+
+@pytest.mark.parametrize("reset, expected", [
+    ("5000", 5),
+    (str(int(time.time() * 1000) + 60000), 60),
+    ("-10", 0),
+    (None, None),
+    ("abc", None),
+])
+def test_quota_reset_seconds(reset, expected):
+    headers = {} if reset is None else {"X-Plan-Quota-Reset": reset}
+    result = rate_limit._quota_reset_seconds(headers)
+    if expected is None:
+        assert result is None
+    else:
+        assert result == pytest.approx(expected, abs=1)
+
+def test_get_limiter_returns_shared_instance():
+    first = rate_limit.get_limiter("test-shared", 10)
+    assert rate_limit.get_limiter("test-shared", 99) is first
+    assert first.rate == 10
@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+import steam_catalog
+
+APPS = [
+    (292030, "The Witcher® 3: Wild Hunt"),
+    (730, "Counter-Strike 2"),
+    (413150, "Stardew Valley"),
+    (1245620, "ELDEN RING"),
+    (1971870, "原神"),
+    (20920, "Ведьмак 2: Убийцы королей"),
+    (1091500, "Cyberpunk 2077"),
+    (1091501, "Cyberpunk 2077: Phantom Liberty"),
+]
+
+@pytest.fixture
+def catalog():
+    return steam_catalog.AppCatalog.build(APPS)
+
+def first_id(results):
+    return results[0]["app_id"] if results else None
+
+@pytest.mark.parametrize("name, expected", [
+    ("ELDEN RING™", "elden ring"),
+    ("Pokémon_Go", "pokemon go"),
+    ("Ｆｕｌｌ　Ｗｉｄｔｈ", "full width"),
+    ("原神", "原神"),
+    ("Ведьмак 3: Дикая Охота", "ведьмак 3 дикая охота"),
+])
+def test_normalize_name(name, expected):
+    assert steam_catalog.normalize_name(name) == expected
+
+def test_exact_match_scores_one(catalog):
+    results = catalog.search("elden ring")
+    assert results[0] == {"app_id": 1245620, "name": "ELDEN RING", "score": 1.0}
+
+def test_prefix_match_prefers_shorter_name(catalog):
+    results = catalog.search("cyberpunk")
+    assert [result["app_id"] for result in results[:2]] == [1091500, 1091501]
+    assert all(0.9 <= result["score"] < 1.0 for result in results[:2])
+
+@pytest.mark.parametrize("query, app_id", [
+    ("eldn rign", 1245620),
+    ("witcher 3", 292030),
+    ("counter strike", 730),
+    ("STARDEW", 413150),
+])
+def test_fuzzy_and_case_insensitive(catalog, query, app_id):
+    assert first_id(catalog.search(query)) == app_id
+
+def test_cjk_name(catalog):
+    assert first_id(catalog.search("原神")) == 1971870
+
+def test_cyrillic_name(catalog):
+    assert first_id(catalog.search("ведьмак")) == 20920
+    assert first_id(catalog.search("Ведьмак 2")) == 20920
+
+def test_no_match_and_empty_query(catalog):
+    assert catalog.search("zzzzqqqq") == []
+    assert catalog.search("™") == []
+
+def test_limit(catalog):
+    assert len(catalog.search("cyberpunk", limit=1)) == 1
+
+def test_save_and_load_round_trip(catalog, cache_dir):
+    catalog.save()
+    loaded = steam_catalog.AppCatalog.load()
+    assert len(loaded) == len(catalog)
+    assert loaded.search("原神") == catalog.search("原神")
+    assert loaded.search("eldn rign") == catalog.search("eldn rign")
+
+def test_save_replaces_previous_versions(catalog):
+    catalog.save()
+    catalog.save()
+    root = steam_catalog.AppCatalog._root()
+    versions = [entry for entry in os.listdir(root) if os.path.isdir(os.path.join(root, entry))]
+    assert len(versions) == 1
+
+def test_interrupted_save_keeps_previous_catalog(catalog, monkeypatch):
+    catalog.save()
+
+    def fail(*args, **kwargs):
+        raise OSError("disco cheio")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(steam_catalog.np, "save", fail)
+        with pytest.raises(OSError):
+            catalog.save()
+
+    loaded = steam_catalog.AppCatalog.load()
+    assert loaded is not None and len(loaded) == len(catalog)
+    root = steam_catalog.AppCatalog._root()
+    assert not [entry for entry in os.listdir(root) if entry.endswith(".tmp")]
+
+def test_load_without_catalog_returns_none():
+    assert steam_catalog.AppCatalog.load() is None
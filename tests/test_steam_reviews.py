@@ -0,0 +1,152 @@
+import sqlite3
+
+import pytest
+
+import local_cache
+import steam
+import steam_reviews
+
+def make_review(recommendation_id, timestamp, voted_up=True):
+    return {
+        "recommendationid": str(recommendation_id),
+        "review": f"review {recommendation_id}",
+        "author": {"steamid": f"user-{recommendation_id}", "playtime_forever": 90},
+        "voted_up": voted_up,
+        "timestamp_created": timestamp,
+        "timestamp_updated": timestamp,
+    }
+
+class FakeReviewsAPI:
+    """API de reviews simulada: páginas de page_size reviews, do mais recente ao mais antigo."""
+
+    def __init__(self, count, page_size=3):
+        self.reviews = [make_review(number, 1000 + number) for number in range(count, 0, -1)]
+        self.page_size = page_size
+        self.requests = []
+
+    def publish(self, count):
+        newest = int(self.reviews[0]["recommendationid"]) if self.reviews else 0
+        fresh = [make_review(number, 1000 + number) for number in range(newest + count, newest, -1)]
+        self.reviews = fresh + self.reviews
+
+    def __call__(self, url, params=None):
+        cursor = params["cursor"]
+        self.requests.append(cursor)
+        start = 0 if cursor == "*" else int(cursor)
+        # Como a API real, devolve uma página vazia (e o mesmo cursor) depois do fim
+        page = self.reviews[start:start + self.page_size]
+        return {"reviews": page, "cursor": str(start + len(page)) if page else cursor}
+
+@pytest.fixture
+def store():
+    return steam_reviews.ReviewStore("test_reviews")
+
+@pytest.fixture
+def api(monkeypatch):
+    fake = FakeReviewsAPI(10)
+    monkeypatch.setattr(steam, "_get_json", fake)
+    return fake
+
+def test_store_and_load_newest_first(store):
+    store.store(10, "portuguese", [make_review(1, 100, voted_up=False), make_review(2, 200), {"review": "sem id"}])
+    reviews = store.load([10], "portuguese")
+    assert list(reviews.columns) == steam_reviews.REVIEW_COLUMNS
+    assert reviews["review"].tolist() == ["review 2", "review 1"]
+    assert reviews["sentiment"].tolist() == ["positivo", "negativo"]
+    assert reviews["sentiment"].dtype == object
+    assert reviews["hours_played"].tolist() == [1.5, 1.5]
+    assert store.count(10, "portuguese") == 2
+
+def test_load_limits_reviews_per_app_and_keeps_app_order(store):
+    store.store(10, "portuguese", [make_review(number, number) for number in range(1, 6)])
+    store.store(20, "portuguese", [make_review(number, number) for number in range(6, 8)])
+    reviews = store.load([20, 10], "portuguese", max_reviews=2)
+    assert reviews["app_id"].tolist() == [20, 20, 10, 10]
+    assert reviews["review"].tolist() == ["review 7", "review 6", "review 5", "review 4"]
+
+def test_load_without_apps_returns_empty_frame(store):
+    reviews = store.load([], "portuguese")
+    assert reviews.empty
+    assert list(reviews.columns) == steam_reviews.REVIEW_COLUMNS
+
+def test_languages_are_stored_separately(store):
+    store.store(10, "portuguese", [make_review(1, 100)])
+    store.store(10, "all", [make_review(1, 100), make_review(2, 200)])
+    assert store.count(10, "portuguese") == 1
+    assert store.count(10, "all") == 2
+    assert store.known_ids(["1", "2", "3"], "portuguese") == {"1"}
+    assert store.known_ids(["1", "2", "3"], "all") == {"1", "2"}
+
+def test_checkpoint_round_trip(store):
+    assert store.get_checkpoint(10, "portuguese") is None
+    store.save_checkpoint(10, "portuguese", "5", 500, "cursor")
+    checkpoint = store.get_checkpoint(10, "portuguese")
+    assert (checkpoint["newest_id"], checkpoint["newest_timestamp"], checkpoint["backfill_cursor"]) == ("5", 500, "cursor")
+    assert store.get_checkpoint(10, "english") is None
+
+def test_legacy_table_keyed_by_id_is_migrated():
+    connection = sqlite3.connect(local_cache.cache_path("legacy_reviews.sqlite3"))
+    connection.execute(
+        "CREATE TABLE reviews (recommendationid TEXT PRIMARY KEY, app_id INTEGER NOT NULL, language TEXT NOT NULL, "
+        "review TEXT, user_id TEXT, hours_played REAL, voted_up INTEGER, "
+        "timestamp_created INTEGER, timestamp_updated INTEGER)"
+    )
+    connection.execute("CREATE INDEX reviews_by_app ON reviews (app_id, language, timestamp_created)")
+    connection.execute("INSERT INTO reviews VALUES ('1', 10, 'portuguese', 'antigo', 'u', 1.0, 1, 100, 100)")
+    connection.commit()
+    connection.close()
+
+    store = steam_reviews.ReviewStore("legacy_reviews")
+    store.store(10, "all", [make_review(1, 100)])
+    assert store.load([10], "portuguese")["review"].tolist() == ["antigo"]
+    assert store.load([10], "all")["review"].tolist() == ["review 1"]
+
+def test_first_sync_downloads_full_history(store, api):
+    assert steam.sync_app_reviews(10, store=store) == 10
+    assert store.count(10, "portuguese") == 10
+    checkpoint = store.get_checkpoint(10, "portuguese")
+    assert checkpoint["newest_id"] == "10"
+    assert checkpoint["backfill_cursor"] is None
+
+def test_incremental_sync_stops_at_checkpoint(store, api):
+    steam.sync_app_reviews(10, store=store)
+    api.publish(2)
+    api.requests.clear()
+    assert steam.sync_app_reviews(10, store=store) == 2
+    assert api.requests == ["*"]
+    assert store.get_checkpoint(10, "portuguese")["newest_id"] == "12"
+    assert store.load([10], "portuguese", max_reviews=1)["review"].tolist() == ["review 12"]
+
+def test_sync_without_new_reviews_stores_nothing(store, api):
+    steam.sync_app_reviews(10, store=store)
+    assert steam.sync_app_reviews(10, store=store) == 0
+    assert store.count(10, "portuguese") == 10
+
+def test_max_reviews_defers_backfill_to_later_syncs(store, api):
+    assert steam.sync_app_reviews(10, max_reviews=4, store=store) == 6
+    checkpoint = store.get_checkpoint(10, "portuguese")
+    assert checkpoint["backfill_cursor"] == "6"
+
+    # Com reviews suficientes armazenados, o histórico antigo não é baixado
+    api.requests.clear()
+    assert steam.sync_app_reviews(10, max_reviews=4, store=store) == 0
+    assert api.requests == ["*"]
+
+    assert steam.sync_app_reviews(10, store=store) == 4
+    assert store.count(10, "portuguese") == 10
+    assert store.get_checkpoint(10, "portuguese")["backfill_cursor"] is None
+
+def test_interrupted_sync_keeps_previous_checkpoint(store, api, monkeypatch):
+    def failing(url, params=None):
+        if params["cursor"] == "6":
+            raise ConnectionError("conexão perdida")
+        return api(url, params)
+
+    monkeypatch.setattr(steam, "_get_json", failing)
+    with pytest.raises(ConnectionError):
+        steam.sync_app_reviews(10, store=store)
+    assert store.get_checkpoint(10, "portuguese") is None
+
+    monkeypatch.setattr(steam, "_get_json", api)
+    assert steam.sync_app_reviews(10, store=store) == 4
+    assert store.count(10, "portuguese") == 10
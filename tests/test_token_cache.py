@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+
+import token_cache
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    token_cache._tokens.clear()
+    token_cache._inflight.clear()
+    yield
+    token_cache._tokens.clear()
+    token_cache._inflight.clear()
+
+class FakeFetch:
+    """fetch_token que devolve token-1, token-2, ... e conta as chamadas."""
+
+    def __init__(self, expires_in=3600, delay=0.0):
+        self.calls = 0
+        self.expires_in = expires_in
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls += 1
+            return f"token-{self.calls}", self.expires_in
+
+def get(fetch, secret="secret", region="us"):
+    return token_cache.get_token("blizzard", "client", secret, region, fetch)
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condição não atingida a tempo"
+        time.sleep(0.01)
+
+def test_valid_token_is_reused():
+    fetch = FakeFetch()
+    assert get(fetch) == "token-1"
+    assert get(fetch) == "token-1"
+    assert fetch.calls == 1
+
+def test_secret_and_region_are_part_of_the_key():
+    fetch = FakeFetch()
+    assert get(fetch) == "token-1"
+    assert get(fetch, secret="other") == "token-2"
+    assert get(fetch, region="eu") == "token-3"
+    assert fetch.calls == 3
+
+def test_secret_is_not_stored_in_plain_text():
+    get(FakeFetch(), secret="super-secret")
+    assert all("super-secret" not in key for key in token_cache._tokens)
+
+def test_expired_token_is_fetched_again():
+    fetch = FakeFetch()
+    get(fetch)
+    for entry in token_cache._tokens.values():
+        entry["expires_at"] = 0
+    assert get(fetch) == "token-2"
+
+def test_concurrent_callers_share_one_fetch():
+    fetch = FakeFetch(delay=0.1)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(get(fetch))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["token-1"] * 8
+    assert fetch.calls == 1
+
+def test_token_near_expiry_is_refreshed_in_background(monkeypatch):
+    fetch = FakeFetch()
+    get(fetch)
+    monkeypatch.setattr(token_cache, "TOKEN_REFRESH_MARGIN", 10 ** 9)
+    assert get(fetch) == "token-1"
+    wait_for(lambda: fetch.calls == 2 and not token_cache._inflight)
+    monkeypatch.setattr(token_cache, "TOKEN_REFRESH_MARGIN", 0)
+    assert get(fetch) == "token-2"
+
+def test_fetch_error_is_raised_and_not_cached():
+    def failing():
+        raise RuntimeError("falhou")
+
+    with pytest.raises(RuntimeError):
+        get(failing)
+    assert not token_cache._inflight
+    assert get(FakeFetch()) == "token-1"
+
+def test_invalidate_fetches_a_new_token_once():
+    fetch = FakeFetch()
+    get(fetch)
+    assert token_cache.invalidate("token-1") == "token-2"
+    # Outra chamada que recebeu 401 com o mesmo token reaproveita a renovação
+    assert token_cache.invalidate("token-1") == "token-2"
+    assert fetch.calls == 2
+    assert get(fetch) == "token-2"
+
+def test_invalidate_unknown_token_returns_none():
+    assert token_cache.invalidate("desconhecido") is None
+
+def test_refresh_authorization_replaces_bearer_token():
+    get(FakeFetch())
+    headers = {"Authorization": "Bearer token-1", "Accept": "application/json"}
+    assert token_cache.refresh_authorization(headers) == {
+        "Authorization": "Bearer token-2",
+        "Accept": "application/json",
+    }
+    assert headers["Authorization"] == "Bearer token-1"
+
+@pytest.mark.parametrize("headers", [None, {}, {"Authorization": "Basic abc"}, {"Authorization": "Bearer desconhecido"}])
+def test_refresh_authorization_without_known_bearer_returns_none(headers):
+    assert token_cache.refresh_authorization(headers) is None
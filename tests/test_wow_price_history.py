@@ -0,0 +1,100 @@
+import os
+import time
+
+import pandas as pd
+
+import wow_price_history
+
+REGION = "us"
+REALM = 1146
+DAY = 86400
+
+def price_index(item_ids, prices, quantity=10):
+    return pd.DataFrame({
+        "item_id": item_ids,
+        "min": prices,
+        "median": [price * 2 for price in prices],
+        "total_quantity": [quantity] * len(item_ids),
+        "auction_count": [2] * len(item_ids),
+    })
+
+def write_hourly(timestamp, item_ids, prices, quantity=10):
+    """Grava um snapshot horário sem passar por record_snapshot (que já resume os dias antigos)."""
+    points = price_index(item_ids, prices, quantity).assign(timestamp=int(timestamp))
+    path = os.path.join(
+        wow_price_history._history_root(REGION, REALM), "hourly", wow_price_history._day(timestamp), f"{int(timestamp)}.npz"
+    )
+    wow_price_history._save_partition(path, points[list(wow_price_history.POINT_COLUMNS)])
+
+def hourly_days():
+    root = os.path.join(wow_price_history._history_root(REGION, REALM), "hourly")
+    return sorted(os.listdir(root)) if os.path.isdir(root) else []
+
+def midnight(days_ago):
+    return (int(time.time()) // DAY - days_ago) * DAY
+
+def test_downsample_without_history_returns_empty_list():
+    assert wow_price_history.downsample(REGION, REALM) == []
+
+def test_downsample_rolls_up_days_older_than_retention():
+    old = midnight(10)
+    recent = midnight(1)
+    write_hourly(old + 3600, [1, 2], [100.0, 50.0], quantity=10)
+    write_hourly(old + 7200, [1], [80.0], quantity=20)
+    write_hourly(recent + 3600, [1], [90.0])
+
+    assert wow_price_history.downsample(REGION, REALM, retention_days=7) == [wow_price_history._day(old)]
+    assert hourly_days() == [wow_price_history._day(recent)]
+
+    daily = wow_price_history._load_partition(
+        os.path.join(wow_price_history._history_root(REGION, REALM), "daily", f"{wow_price_history._day(old)}.npz")
+    ).sort_values("item_id")
+    assert daily["timestamp"].tolist() == [old, old]
+    assert daily["item_id"].tolist() == [1, 2]
+    assert daily["min"].tolist() == [80.0, 50.0]
+    assert daily["median"].tolist() == [180.0, 100.0]
+    assert daily["total_quantity"].tolist() == [15, 10]
+    assert daily["samples"].tolist() == [2, 1]
+
+def test_downsample_merges_late_points_into_existing_summary():
+    old = midnight(10)
+    write_hourly(old + 3600, [1], [100.0])
+    write_hourly(old + 7200, [1], [80.0])
+    wow_price_history.downsample(REGION, REALM, retention_days=7)
+
+    write_hourly(old + 10800, [1], [60.0])
+    assert wow_price_history.downsample(REGION, REALM, retention_days=7) == [wow_price_history._day(old)]
+
+    daily = wow_price_history.query(REGION, REALM, [1], old, old + DAY - 1)
+    assert daily["min"].tolist() == [60.0]
+    # O resumo gravado entra com a sua mediana repetida por amostra: mediana de (180, 180, 120)
+    assert daily["median"].tolist() == [180.0]
+    assert daily["samples"].tolist() == [3]
+
+def test_downsample_keeps_days_within_retention():
+    for days_ago in range(3):
+        write_hourly(midnight(days_ago) + 60, [1], [10.0])
+    assert wow_price_history.downsample(REGION, REALM, retention_days=7) == []
+    assert len(hourly_days()) == 3
+
+def test_record_snapshot_downsamples_and_skips_repeated_snapshots():
+    old = midnight(30) + 3600
+    assert wow_price_history.record_snapshot(REGION, REALM, {"fetched_at": old}, price_index([1], [100.0]))
+    assert not wow_price_history.record_snapshot(REGION, REALM, {"fetched_at": old}, price_index([1], [1.0]))
+    assert hourly_days() == []
+
+    recent = time.time()
+    assert wow_price_history.record_snapshot(REGION, REALM, {"fetched_at": recent}, price_index([1], [90.0]))
+    assert hourly_days() == [wow_price_history._day(recent)]
+
+    daily = wow_price_history.query(REGION, REALM, [1], old - 3600, recent)
+    assert daily["min"].tolist() == [100.0, 90.0]
+    assert daily["samples"].tolist() == [1, 1]
+
+    hourly = wow_price_history.query(REGION, REALM, [1], old - 3600, recent, resolution="hourly")
+    assert hourly["timestamp"].tolist() == [int(recent)]
+
+def test_query_without_points_returns_empty_frame():
+    points = wow_price_history.query(REGION, REALM, [1], time.time() - DAY)
+    assert points.empty
+    assert "samples" in points.columns
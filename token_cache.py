@@ -0,0 +1,157 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+# Segundos antes da expiração em que o token passa a ser renovado em segundo plano
+TOKEN_REFRESH_MARGIN = float(os.getenv("TOKEN_REFRESH_MARGIN", "300"))
+# Validade assumida quando a API não informa expires_in
+DEFAULT_EXPIRES_IN = 3600
+
+_tokens = {}
+_inflight = {}
+_lock = threading.Lock()
+
+def _cache_key(provider, client_id, client_secret, region):
+    """
+    Chave do token no cache. O segredo entra como hash, para que credenciais
+    com o mesmo client_id e segredos diferentes não compartilhem o token.
+    """
+    secret_hash = hashlib.sha256((client_secret or "").encode("utf-8")).hexdigest()
+    return (provider, client_id, secret_hash, region)
+
+def _refresh(key, fetch_token):
+    """
+    Obtém um novo token para a chave, garantindo que apenas uma requisição
+    de renovação por chave esteja em andamento (single-flight).
+
+    Args:
+        key (tuple): Chave do cache (ver _cache_key)
+        fetch_token (callable): Função que retorna (token, expires_in)
+
+    Returns:
+        str: Token de acesso
+    """
+    with _lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _inflight[key] = future
+
+    if not owner:
+        return future.result()
+
+    try:
+        token, expires_in = fetch_token()
+        if token:
+            with _lock:
+                previous = _tokens.get(key)
+                _tokens[key] = {
+                    "token": token,
+                    "previous": previous["token"] if previous else None,
+                    "expires_at": time.monotonic() + (expires_in or DEFAULT_EXPIRES_IN),
+                    "fetch_token": fetch_token,
+                }
+        future.set_result(token)
+        return token
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+
+def _refresh_in_background(key, fetch_token):
+    """Inicia a renovação do token em uma thread, se nenhuma estiver em andamento."""
+    def run():
+        try:
+            _refresh(key, fetch_token)
+        except Exception as e:
+            print(f"Erro ao renovar token {key[0]} em segundo plano: {e}", file=sys.stderr)
+
+    with _lock:
+        if key in _inflight:
+            return
+    threading.Thread(target=run, daemon=True).start()
+
+def get_token(provider, client_id, client_secret, region, fetch_token):
+    """
+    Retorna um token de acesso do cache do processo, obtendo um novo quando necessário.
+
+    Tokens válidos são devolvidos imediatamente. Quando faltam menos de
+    TOKEN_REFRESH_MARGIN segundos para a expiração, o token atual é devolvido e
+    a renovação é feita em segundo plano. Chamadas simultâneas para a mesma
+    chave compartilham uma única requisição de renovação.
+
+    Args:
+        provider (str): Nome do provedor (ex: "blizzard", "twitch")
+        client_id (str): Client ID da aplicação
+        client_secret (str): Client Secret da aplicação (faz parte da chave do cache)
+        region (str): Região da API (ou None se não se aplica)
+        fetch_token (callable): Função sem argumentos que retorna (token, expires_in)
+
+    Returns:
+        str: Token de acesso (ou None se fetch_token não obtiver um token)
+    """
+    key = _cache_key(provider, client_id, client_secret, region)
+    now = time.monotonic()
+    with _lock:
+        entry = _tokens.get(key)
+
+    if entry and now < entry["expires_at"]:
+        if now >= entry["expires_at"] - TOKEN_REFRESH_MARGIN:
+            _refresh_in_background(key, fetch_token)
+        return entry["token"]
+
+    return _refresh(key, fetch_token)
+
+def invalidate(token):
+    """
+    Descarta um token recusado pela API (HTTP 401) e obtém um novo.
+
+    Se o token já foi substituído por outra chamada, devolve o token atual sem
+    uma nova renovação; chamadas simultâneas com o mesmo token recusado
+    compartilham uma única renovação.
+
+    Args:
+        token (str): Token recusado
+
+    Returns:
+        str: Novo token de acesso (ou None se o token não estiver no cache ou a renovação falhar)
+    """
+    with _lock:
+        for key, entry in _tokens.items():
+            if entry["previous"] == token:
+                return entry["token"]
+            if entry["token"] == token:
+                entry["expires_at"] = 0
+                fetch_token = entry["fetch_token"]
+                break
+        else:
+            return None
+    return _refresh(key, fetch_token)
+
+def refresh_authorization(headers):
+    """
+    Troca o token Bearer de headers recusados pela API (HTTP 401) por um novo.
+
+    Args:
+        headers (dict): Headers da requisição recusada
+
+    Returns:
+        dict: Novos headers com o token renovado (ou None se não for possível renovar)
+    """
+    authorization = (headers or {}).get("Authorization", "")
+    if not authorization.startswith("Bearer "):
+        return None
+    try:
+        token = invalidate(authorization[len("Bearer "):])
+    except Exception as e:
+        print(f"Erro ao renovar token recusado: {e}", file=sys.stderr)
+        return None
+    if not token:
+        return None
+    return {**headers, "Authorization": f"Bearer {token}"}
@@ -1,4 +1,4 @@
-import requests
+import http_client
 from requests.auth import HTTPBasicAuth
 import urllib3
 import os
@@ -11,6 +11,12 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 # Carregar variáveis de ambiente
 load_dotenv()
 
+# Timeout (conexão, leitura) em segundos dos uploads de mídia, que podem passar do timeout padrão do http_client
+WORDPRESS_UPLOAD_TIMEOUT = (
+    http_client.HTTP_CONNECT_TIMEOUT,
+    float(os.getenv("WORDPRESS_UPLOAD_TIMEOUT", "300")),
+)
+
 def get_wordpress_credentials():
     """
     Obtém credenciais do WordPress das variáveis de ambiente.
@@ -69,7 +75,7 @@ def create_post(title: str, content: str, status: str = "publish",
         post_data["featured_media"] = featured_media
     
     try:
-        response = requests.post(
+        response = http_client.post(
             f"{credentials['site_url']}/wp-json/wp/v2/posts",
             auth=auth,
             headers=headers,
@@ -125,7 +131,7 @@ def create_page(title: str, content: str, status: str = "publish",
         page_data["featured_media"] = featured_media
     
     try:
-        response = requests.post(
+        response = http_client.post(
             f"{credentials['site_url']}/wp-json/wp/v2/pages",
             auth=auth,
             headers=headers,
@@ -193,7 +199,7 @@ def update_page(page_id: int, title: Optional[str] = None, content: Optional[str
         }
     
     try:
-        response = requests.post(
+        response = http_client.post(
             f"{credentials['site_url']}/wp-json/wp/v2/pages/{page_id}",
             auth=auth,
             headers=headers,
@@ -261,7 +267,7 @@ def update_post(post_id: int, title: Optional[str] = None, content: Optional[str
         }
     
     try:
-        response = requests.post(
+        response = http_client.post(
             f"{credentials['site_url']}/wp-json/wp/v2/posts/{post_id}",
             auth=auth,
             headers=headers,
@@ -322,13 +328,14 @@ def upload_media(file_path: str, title: Optional[str] = None) -> Dict[str, Any]:
             if title:
                 data['title'] = title
             
-            response = requests.post(
+            response = http_client.post(
                 f"{credentials['site_url']}/wp-json/wp/v2/media",
                 auth=auth,
                 headers=headers,
                 files=files,
                 data=data,
-                verify=False
+                verify=False,
+                timeout=WORDPRESS_UPLOAD_TIMEOUT
             )
             
             response.raise_for_status()
@@ -360,7 +367,7 @@ def upload_media_from_url(image_url: str, title: Optional[str] = None) -> Dict[s
     
     try:
         # Baixa a imagem da URL
-        image_response = requests.get(image_url, stream=True)
+        image_response = http_client.get(image_url, stream=True, timeout=WORDPRESS_UPLOAD_TIMEOUT)
         image_response.raise_for_status()
         
         # Obtém o nome do arquivo da URL
@@ -376,13 +383,14 @@ def upload_media_from_url(image_url: str, title: Optional[str] = None) -> Dict[s
         if title:
             data['title'] = title
         
-        response = requests.post(
+        response = http_client.post(
             f"{credentials['site_url']}/wp-json/wp/v2/media",
             auth=auth,
             headers=headers,
             data=data,
             files={'file': (filename, image_response.content)},
-            verify=False
+            verify=False,
+            timeout=WORDPRESS_UPLOAD_TIMEOUT
         )
         
         response.raise_for_status()
@@ -411,7 +419,7 @@ def get_posts(per_page: int = 10, page: int = 1) -> Dict[str, Any]:
     credentials = get_wordpress_credentials()
     
     try:
-        response = requests.get(
+        response = http_client.get(
             f"{credentials['site_url']}/wp-json/wp/v2/posts",
             params={
                 "per_page": per_page,
@@ -448,7 +456,7 @@ def get_pages(per_page: int = 10, page: int = 1) -> Dict[str, Any]:
     credentials = get_wordpress_credentials()
     
     try:
-        response = requests.get(
+        response = http_client.get(
             f"{credentials['site_url']}/wp-json/wp/v2/pages",
             params={
                 "per_page": per_page,
@@ -481,7 +489,7 @@ def get_categories() -> Dict[str, Any]:
     credentials = get_wordpress_credentials()
     
     try:
-        response = requests.get(
+        response = http_client.get(
             f"{credentials['site_url']}/wp-json/wp/v2/categories",
             params={
                 "per_page": 100
@@ -511,7 +519,7 @@ def get_tags() -> Dict[str, Any]:
     credentials = get_wordpress_credentials()
     
     try:
-        response = requests.get(
+        response = http_client.get(
             f"{credentials['site_url']}/wp-json/wp/v2/tags",
             params={
                 "per_page": 100
@@ -553,7 +561,7 @@ def get_wordpress_content(post_id: int, is_page: bool = False) -> Tuple[bool, Un
     content_type = "pages" if is_page else "posts"
     
     try:
-        response = requests.get(
+        response = http_client.get(
             f"{credentials['site_url']}/wp-json/wp/v2/{content_type}/{post_id}",
             auth=auth,
             verify=False
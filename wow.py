@@ -1,31 +1,123 @@
-import requests
+import http_client
+import token_cache
+import rate_limit
+import wow_auctions
+import wow_guilds
+import wow_achievements
+import wow_equipment
+import wow_price_history
+import local_cache
 import pandas as pd
+import numpy as np
 import os
-from time import sleep
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
-def get_access_token(client_id, client_secret, region="us"):
+# Requisições por segundo permitidas por região (ajustado pelos cabeçalhos de cota da Blizzard)
+BLIZZARD_RATE_LIMIT = float(os.getenv("BLIZZARD_RATE_LIMIT", "100"))
+# Número máximo de requisições simultâneas em buscas com vários nomes
+WOW_MAX_WORKERS = int(os.getenv("WOW_MAX_WORKERS", "16"))
+# Validade do cache de metadados de itens (namespace static, praticamente imutável)
+WOW_ITEM_CACHE_TTL = float(os.getenv("WOW_ITEM_CACHE_TTL", str(30 * 24 * 3600)))
+# Validade do cache de perfis de personagens usado no perfil em massa de guildas
+WOW_CHARACTER_CACHE_TTL = float(os.getenv("WOW_CHARACTER_CACHE_TTL", "3600"))
+# Validade do índice de reinos da região
+WOW_REALM_INDEX_TTL = float(os.getenv("WOW_REALM_INDEX_TTL", str(24 * 3600)))
+# Segundos durante os quais um snapshot de leilões é usado sem consultar a API
+AUCTION_SNAPSHOT_RECHECK = float(os.getenv("AUCTION_SNAPSHOT_RECHECK", "60"))
+# Número máximo de arquivos de leilão baixados ao mesmo tempo na varredura de vários reinos
+# (cada download mantém os leilões de um único reino em memória)
+AUCTION_SCAN_WORKERS = int(os.getenv("AUCTION_SCAN_WORKERS", "8"))
+# Se True, cada novo snapshot de leilões é acrescentado à série histórica de preços
+AUCTION_HISTORY_ENABLED = os.getenv("AUCTION_HISTORY_ENABLED", "true").lower() in ("1", "true", "yes")
+
+_auction_locks = {}
+_auction_locks_guard = threading.Lock()
+_item_cache = local_cache.KeyValueStore("wow_items", ttl=WOW_ITEM_CACHE_TTL)
+_character_cache = local_cache.KeyValueStore("wow_characters", ttl=WOW_CHARACTER_CACHE_TTL)
+_achievement_index = wow_achievements.AchievementIndex()
+_realm_indexes = {}
+_realm_index_lock = threading.Lock()
+
+def _request_access_token(client_id, client_secret, region):
     """
-    Autentica com a API da Blizzard e retorna o token de acesso.
+    Solicita um novo token de acesso à API da Blizzard.
     
     Args:
         client_id (str): ID do cliente da API Blizzard
         client_secret (str): Segredo do cliente da API Blizzard
-        region (str): Região da API (padrão: "us")
+        region (str): Região da API
         
     Returns:
-        str: Token de acesso
+        tuple: (token de acesso, validade em segundos)
     """
     url = f"https://{region}.battle.net/oauth/token"
     try:
-        response = requests.post(url, data={"grant_type": "client_credentials"}, auth=(client_id, client_secret))
+        response = http_client.post(url, data={"grant_type": "client_credentials"}, auth=(client_id, client_secret))
         response.raise_for_status()
-        return response.json().get("access_token")
+        data = response.json()
+        return data.get("access_token"), data.get("expires_in")
     except Exception as e:
         print(f"Erro ao obter token de acesso: {e}")
         raise Exception(f"Erro na autenticação com a API da Blizzard: {e}")
 
-def get_character_data(region, realm_slug, character_name, token):
+def get_access_token(client_id, client_secret, region="us"):
+    """
+    Autentica com a API da Blizzard e retorna o token de acesso.
+    
+    O token fica em cache no processo até expirar e é renovado em segundo
+    plano pouco antes da expiração.
+    
+    Args:
+        client_id (str): ID do cliente da API Blizzard
+        client_secret (str): Segredo do cliente da API Blizzard
+        region (str): Região da API (padrão: "us")
+        
+    Returns:
+        str: Token de acesso
+    """
+    return token_cache.get_token(
+        "blizzard", client_id, client_secret, region,
+        lambda: _request_access_token(client_id, client_secret, region)
+    )
+
+def _api_get(region, url, **kwargs):
+    """
+    Faz um GET na API da Blizzard respeitando o limite de taxa da região.
+    
+    Em caso de HTTP 429 aguarda o tempo indicado pela API e tenta novamente uma vez.
+    Em caso de HTTP 401 (token revogado ou trocado) renova o token e tenta
+    novamente uma vez.
+    
+    Args:
+        region (str): Região da API (us, eu, etc.)
+        url (str): URL da requisição
+        **kwargs: Argumentos repassados para http_client.get
+        
+    Returns:
+        requests.Response: Resposta da requisição
+    """
+    limiter = rate_limit.get_limiter(f"blizzard-{region}", BLIZZARD_RATE_LIMIT)
+    retried = set()
+    while True:
+        limiter.acquire()
+        response = http_client.get(url, **kwargs)
+        limiter.update_from_headers(response.headers, response.status_code)
+        status = response.status_code
+        if status not in (401, 429) or status in retried:
+            return response
+        retried.add(status)
+        if status == 401:
+            headers = token_cache.refresh_authorization(kwargs.get("headers"))
+            if headers is None:
+                return response
+            kwargs["headers"] = headers
+        # Libera a conexão da resposta descartada antes de tentar de novo (importante com stream=True)
+        response.close()
+
+def get_character_data(region, realm_slug, character_name, token, raise_errors=False):
     """
     Obtém dados básicos de um personagem.
     
@@ -34,6 +126,7 @@ def get_character_data(region, realm_slug, character_name, token):
         realm_slug (str): Slug do reino
         character_name (str): Nome do personagem
         token (str): Token de acesso
+        raise_errors (bool): Se True, propaga erros da API em vez de retornar None
         
     Returns:
         dict: Informações básicas do personagem
@@ -43,7 +136,7 @@ def get_character_data(region, realm_slug, character_name, token):
     params = {"namespace": f"profile-{region}", "locale": "en_US"}
     
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = _api_get(region, url, headers=headers, params=params)
         response.raise_for_status()
         data = response.json()
         
@@ -66,9 +159,11 @@ def get_character_data(region, realm_slug, character_name, token):
         }
     except Exception as e:
         print(f"Erro ao obter dados do personagem {character_name}: {e}")
+        if raise_errors:
+            raise
         return None
 
-def get_character_statistics(region, realm_slug, character_name, token):
+def get_character_statistics(region, realm_slug, character_name, token, raise_errors=False):
     """
     Obtém estatísticas de um personagem.
     
@@ -77,6 +172,7 @@ def get_character_statistics(region, realm_slug, character_name, token):
         realm_slug (str): Slug do reino
         character_name (str): Nome do personagem
         token (str): Token de acesso
+        raise_errors (bool): Se True, propaga erros da API em vez de retornar um dicionário vazio
         
     Returns:
         dict: Estatísticas do personagem
@@ -86,7 +182,7 @@ def get_character_statistics(region, realm_slug, character_name, token):
     params = {"namespace": f"profile-{region}", "locale": "en_US"}
     
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = _api_get(region, url, headers=headers, params=params)
         response.raise_for_status()
         data = response.json()
         
@@ -111,9 +207,11 @@ def get_character_statistics(region, realm_slug, character_name, token):
         }
     except Exception as e:
         print(f"Erro ao obter estatísticas do personagem {character_name}: {e}")
+        if raise_errors:
+            raise
         return {}
 
-def get_character_equipment(region, realm_slug, character_name, token):
+def get_character_equipment(region, realm_slug, character_name, token, raise_errors=False):
     """
     Obtém equipamentos de um personagem.
     
@@ -122,6 +220,7 @@ def get_character_equipment(region, realm_slug, character_name, token):
         realm_slug (str): Slug do reino
         character_name (str): Nome do personagem
         token (str): Token de acesso
+        raise_errors (bool): Se True, propaga erros da API em vez de retornar uma lista vazia
         
     Returns:
         list: Lista de equipamentos do personagem
@@ -131,26 +230,56 @@ def get_character_equipment(region, realm_slug, character_name, token):
     params = {"namespace": f"profile-{region}", "locale": "en_US"}
     
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = _api_get(region, url, headers=headers, params=params)
         response.raise_for_status()
         data = response.json()
         
         equipment_list = []
         for item in data.get("equipped_items", []):
+            item_set = item.get("set", {})
             equipment_list.append({
                 "Name": item.get("name"),
                 "Slot": item.get("slot", {}).get("name"),
                 "Item Level": item.get("level", {}).get("value"),
                 "Quality": item.get("quality", {}).get("name"),
-                "Item ID": item.get("item", {}).get("id")
+                "Item ID": item.get("item", {}).get("id"),
+                "Slot Type": item.get("slot", {}).get("type"),
+                "Inventory Type": item.get("inventory_type", {}).get("type"),
+                "Set ID": item_set.get("item_set", {}).get("id"),
+                "Set Name": item_set.get("item_set", {}).get("name"),
+                "Set Active Bonuses": sum(1 for effect in item_set.get("effects", []) if effect.get("is_active"))
             })
         
         return equipment_list
     except Exception as e:
         print(f"Erro ao obter equipamentos do personagem {character_name}: {e}")
+        if raise_errors:
+            raise
         return []
 
-def get_character_achievements(region, realm_slug, character_name, token, max_achievements=50):
+def _fetch_character_achievements(region, realm_slug, character_name, token):
+    """
+    Baixa o documento de conquistas de um personagem e atualiza o índice de conquistas.
+    
+    Returns:
+        list: Entradas "achievements" do documento
+    """
+    url = f"https://{region}.api.blizzard.com/profile/wow/character/{realm_slug}/{character_name.lower()}/achievements"
+    headers = {"Authorization": f"Bearer {token}"}
+    params = {"namespace": f"profile-{region}", "locale": "en_US"}
+    
+    response = _api_get(region, url, headers=headers, params=params)
+    response.raise_for_status()
+    achievements = response.json().get("achievements", [])
+    
+    _achievement_index.store(
+        wow_achievements.character_key(region, realm_slug, character_name),
+        wow_achievements.completed_ids(achievements)
+    )
+    return achievements
+
+def get_character_achievements(region, realm_slug, character_name, token, max_achievements=50, raise_errors=False,
+                               offset=0):
     """
     Obtém conquistas de um personagem.
     
@@ -160,21 +289,17 @@ def get_character_achievements(region, realm_slug, character_name, token, max_ac
         character_name (str): Nome do personagem
         token (str): Token de acesso
         max_achievements (int): Número máximo de conquistas a retornar
+        raise_errors (bool): Se True, propaga erros da API em vez de retornar uma lista vazia
+        offset (int): Posição da primeira conquista a retornar (para paginação)
         
     Returns:
         list: Lista de conquistas do personagem
     """
-    url = f"https://{region}.api.blizzard.com/profile/wow/character/{realm_slug}/{character_name.lower()}/achievements"
-    headers = {"Authorization": f"Bearer {token}"}
-    params = {"namespace": f"profile-{region}", "locale": "en_US"}
-    
     try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        data = response.json()
+        achievements = _fetch_character_achievements(region, realm_slug, character_name, token)
         
         achievements_list = []
-        for achievement in data.get("achievements", [])[:max_achievements]:
+        for achievement in achievements[offset:offset + max_achievements]:
             achievements_list.append({
                 "ID": achievement.get("id"),
                 "Name": achievement.get("achievement", {}).get("name"),
@@ -186,6 +311,8 @@ def get_character_achievements(region, realm_slug, character_name, token, max_ac
         return achievements_list
     except Exception as e:
         print(f"Erro ao obter conquistas do personagem {character_name}: {e}")
+        if raise_errors:
+            raise
         return []
 
 def get_guild_data(region, realm_slug, guild_name, token):
@@ -206,7 +333,7 @@ def get_guild_data(region, realm_slug, guild_name, token):
     params = {"namespace": f"profile-{region}", "locale": "en_US"}
     
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = _api_get(region, url, headers=headers, params=params)
         response.raise_for_status()
         data = response.json()
         
@@ -240,7 +367,7 @@ def get_guild_members(region, realm_slug, guild_name, token):
     params = {"namespace": f"profile-{region}", "locale": "en_US"}
     
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = _api_get(region, url, headers=headers, params=params)
         response.raise_for_status()
         data = response.json()
         
@@ -250,6 +377,7 @@ def get_guild_members(region, realm_slug, guild_name, token):
             members_list.append({
                 "Name": character.get("name"),
                 "Realm": character.get("realm", {}).get("name"),
+                "Realm Slug": character.get("realm", {}).get("slug"),
                 "Level": character.get("level"),
                 "Class": character.get("playable_class", {}).get("name"),
                 "Race": character.get("playable_race", {}).get("name"),
@@ -261,56 +389,236 @@ def get_guild_members(region, realm_slug, guild_name, token):
         print(f"Erro ao obter membros da guilda {guild_name}: {e}")
         return []
 
-def get_auction_house_data(region, connected_realm_id, token, categories=None, limit=100):
+def get_character_summary(region, realm_slug, character_name, token, include_equipment=True, use_cache=True):
     """
-    Obtém dados do leilão (mercado) de um reino conectado.
+    Obtém o perfil (e opcionalmente os equipamentos) de um personagem, com cache persistente.
     
     Args:
         region (str): Região do servidor (us, eu, etc.)
-        connected_realm_id (int): ID do reino conectado
+        realm_slug (str): Slug do reino
+        character_name (str): Nome do personagem
         token (str): Token de acesso
-        categories (list): Lista de IDs de categorias para filtrar (opcional)
-        limit (int): Limite de resultados
+        include_equipment (bool): Se True, inclui a lista de equipamentos
+        use_cache (bool): Se True, usa o cache de personagens (validade WOW_CHARACTER_CACHE_TTL)
         
     Returns:
-        list: Lista de itens do leilão
+        dict: profile e equipment do personagem
+    """
+    cache_key = f"{region}:{realm_slug}:{character_name.lower()}:{int(include_equipment)}"
+    if use_cache:
+        cached = _character_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    profile = get_character_data(region, realm_slug, character_name, token, raise_errors=True)
+    summary = {"profile": profile}
+    if include_equipment:
+        summary["equipment"] = get_character_equipment(region, realm_slug, character_name, token, raise_errors=True)
+    
+    _character_cache.set(cache_key, summary)
+    return summary
+
+def iter_guild_member_profiles(region, realm_slug, members, token, include_equipment=True, max_workers=None):
+    """
+    Busca em paralelo o perfil de cada membro de uma guilda, devolvendo os
+    resultados à medida que ficam prontos.
+    
+    As requisições respeitam o limite de taxa da região, e os perfis ficam em
+    cache por WOW_CHARACTER_CACHE_TTL segundos.
+    
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        realm_slug (str): Slug do reino da guilda (usado se o membro não informar o seu)
+        members (list): Membros no formato retornado por get_guild_members
+        token (str): Token de acesso
+        include_equipment (bool): Se True, inclui os equipamentos de cada membro
+        max_workers (int): Número máximo de requisições simultâneas (padrão: WOW_MAX_WORKERS)
+        
+    Yields:
+        dict: Name, Realm, Rank e profile/equipment do membro, ou error se a busca falhar
     """
-    url = f"https://{region}.api.blizzard.com/data/wow/connected-realm/{connected_realm_id}/auctions"
+    def profile_member(member):
+        return get_character_summary(
+            region, member.get("Realm Slug") or realm_slug, member["Name"], token,
+            include_equipment=include_equipment
+        )
+    
+    executor = ThreadPoolExecutor(max_workers=max_workers or WOW_MAX_WORKERS)
+    try:
+        futures = {executor.submit(profile_member, member): member for member in members if member.get("Name")}
+        for future in as_completed(futures):
+            member = futures[future]
+            result = {"Name": member["Name"], "Realm": member.get("Realm"), "Rank": member.get("Rank")}
+            try:
+                result.update(future.result())
+            except Exception as e:
+                result["error"] = str(e)
+            yield result
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def _auction_url(region, connected_realm_id):
+    """URL de leilões de um reino conectado (ou das commodities da região, com wow_auctions.COMMODITIES)."""
+    if connected_realm_id == wow_auctions.COMMODITIES:
+        return f"https://{region}.api.blizzard.com/data/wow/auctions/commodities"
+    return f"https://{region}.api.blizzard.com/data/wow/connected-realm/{connected_realm_id}/auctions"
+
+def _fetch_auction_columns(region, connected_realm_id, token, streaming=True, last_modified=None, etag=None,
+                           builder=None):
+    """
+    Baixa os leilões de um reino conectado, opcionalmente de forma condicional.
+    
+    Returns:
+        tuple: (DataFrame de leilões ou None se a API respondeu 304, cabeçalhos da resposta)
+    """
+    url = _auction_url(region, connected_realm_id)
     headers = {"Authorization": f"Bearer {token}"}
     params = {"namespace": f"dynamic-{region}", "locale": "en_US"}
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    if etag:
+        headers["If-None-Match"] = etag
     
+    response = _api_get(region, url, headers=headers, params=params, stream=streaming)
     try:
-        response = requests.get(url, headers=headers, params=params)
+        if response.status_code == 304:
+            return None, response.headers
         response.raise_for_status()
-        data = response.json()
+        if streaming:
+            response.raw.decode_content = True
+            return wow_auctions.parse_auctions(response.raw, builder), response.headers
+        return wow_auctions.auctions_from_list(response.json().get("auctions", []), builder), response.headers
+    finally:
+        response.close()
+
+def get_auction_columns(region, connected_realm_id, token, streaming=True):
+    """
+    Baixa os leilões de um reino conectado em formato colunar.
+    
+    No modo streaming os leilões são decodificados à medida que a resposta é
+    recebida, sem carregar o documento JSON inteiro em memória.
+    
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        connected_realm_id (int): ID do reino conectado
+        token (str): Token de acesso
+        streaming (bool): Se True, decodifica a resposta de forma incremental
         
-        auctions = data.get("auctions", [])
+    Returns:
+        DataFrame: Leilões com as colunas item_id, quantity, price e time_left
+    """
+    auctions, _ = _fetch_auction_columns(region, connected_realm_id, token, streaming=streaming)
+    return auctions
+
+def _auction_snapshot_lock(region, connected_realm_id):
+    """Lock (reentrante) que serializa a troca do snapshot de um reino e a gravação dos dados derivados dele."""
+    with _auction_locks_guard:
+        return _auction_locks.setdefault((region, connected_realm_id), threading.RLock())
+
+def _price_index(region, connected_realm_id, meta, auctions=None):
+    """wow_auctions.load_price_index com o lock do snapshot do reino."""
+    with _auction_snapshot_lock(region, connected_realm_id):
+        return wow_auctions.load_price_index(region, connected_realm_id, meta, auctions)
+
+def _price_depth(region, connected_realm_id, meta, auctions=None):
+    """wow_auctions.load_price_depth com o lock do snapshot do reino."""
+    with _auction_snapshot_lock(region, connected_realm_id):
+        return wow_auctions.load_price_depth(region, connected_realm_id, meta, auctions)
+
+def get_auction_snapshot(region, connected_realm_id, token, streaming=True):
+    """
+    Obtém os leilões de um reino conectado a partir do snapshot local.
+    
+    O snapshot é revalidado com If-Modified-Since/If-None-Match no máximo a cada
+    AUCTION_SNAPSHOT_RECHECK segundos, e só é baixado de novo quando a API
+    indica que os dados mudaram.
+    
+    Com connected_realm_id igual a wow_auctions.COMMODITIES, usa os leilões de
+    commodities da região, e o histograma de profundidade de preço é montado
+    durante a decodificação e gravado junto com o snapshot.
+    
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        connected_realm_id (int): ID do reino conectado (ou wow_auctions.COMMODITIES)
+        token (str): Token de acesso
+        streaming (bool): Se True, decodifica a resposta de forma incremental
         
-        # Filtra por categorias se especificado
-        if categories:
-            filtered_auctions = [a for a in auctions if a.get("item", {}).get("id") in categories]
-            auctions = filtered_auctions
+    Returns:
+        tuple: (DataFrame de leilões em formato colunar, metadados do snapshot)
+    """
+    with _auction_snapshot_lock(region, connected_realm_id):
+        meta = wow_auctions.load_auction_snapshot_meta(region, connected_realm_id)
+        if meta and time.time() - meta.get("checked_at", 0) < AUCTION_SNAPSHOT_RECHECK:
+            auctions = wow_auctions.load_auction_snapshot(region, connected_realm_id, meta)
+            if auctions is not None:
+                return auctions, meta
         
-        # Limita o número de resultados
-        auctions = auctions[:limit]
+        builder = wow_auctions.new_auction_builder(connected_realm_id)
+        auctions, headers = _fetch_auction_columns(
+            region, connected_realm_id, token, streaming=streaming,
+            last_modified=meta.get("last_modified") if meta else None,
+            etag=meta.get("etag") if meta else None,
+            builder=builder,
+        )
         
-        auction_list = []
-        for auction in auctions:
-            price = auction.get("price") / 10000  # Convertendo de copper para gold
-            auction_list.append({
-                "Item ID": auction.get("item", {}).get("id"),
-                "Item Name": auction.get("item", {}).get("name", "Unknown"),
-                "Quantity": auction.get("quantity", 1),
-                "Price (Gold)": price,
-                "Time Left": auction.get("time_left")
-            })
+        if auctions is None:
+            cached = wow_auctions.load_auction_snapshot(region, connected_realm_id, meta)
+            if cached is not None:
+                return cached, wow_auctions.touch_auction_snapshot(region, connected_realm_id, meta)
+            # Snapshot local inconsistente: baixa novamente sem cabeçalhos condicionais
+            builder = wow_auctions.new_auction_builder(connected_realm_id)
+            auctions, headers = _fetch_auction_columns(
+                region, connected_realm_id, token, streaming=streaming, builder=builder
+            )
+        
+        meta = wow_auctions.save_auction_snapshot(
+            region, connected_realm_id, auctions,
+            last_modified=headers.get("Last-Modified"),
+            etag=headers.get("ETag"),
+        )
+        if isinstance(builder, wow_auctions.CommodityColumnsBuilder):
+            wow_auctions.load_price_depth(region, connected_realm_id, meta, depth=builder.depth.to_frame())
+        if AUCTION_HISTORY_ENABLED:
+            try:
+                index = _price_index(region, connected_realm_id, meta, auctions)
+                wow_price_history.record_snapshot(region, connected_realm_id, meta, index)
+            except Exception as e:
+                print(f"Erro ao gravar o histórico de preços do reino {connected_realm_id}: {e}")
+        return wow_auctions.load_auction_snapshot(region, connected_realm_id, meta), meta
+
+def get_auction_house_data(region, connected_realm_id, token, categories=None, limit=100, streaming=True,
+                           use_snapshot=True):
+    """
+    Obtém dados do leilão (mercado) de um reino conectado.
+    
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        connected_realm_id (int): ID do reino conectado
+        token (str): Token de acesso
+        categories (list): Lista de IDs de itens para filtrar (opcional)
+        limit (int): Limite de resultados
+        streaming (bool): Se True, decodifica a resposta de forma incremental
+        use_snapshot (bool): Se True, usa o snapshot local revalidado com requisições condicionais
+        
+    Returns:
+        list: Lista de itens do leilão
+    """
+    try:
+        if use_snapshot:
+            auctions, _ = get_auction_snapshot(region, connected_realm_id, token, streaming=streaming)
+        else:
+            auctions = get_auction_columns(region, connected_realm_id, token, streaming=streaming)
         
-        return auction_list
+        # Filtra por itens se especificado
+        if categories:
+            auctions = wow_auctions.filter_auctions(auctions, categories)
+        
+        return wow_auctions.auctions_to_records(auctions, limit)
     except Exception as e:
         print(f"Erro ao obter dados do leilão para o reino {connected_realm_id}: {e}")
         return []
 
-def get_item_data(region, item_id, token):
+def get_item_data(region, item_id, token, use_cache=True):
     """
     Obtém dados de um item específico.
     
@@ -318,20 +626,27 @@ def get_item_data(region, item_id, token):
         region (str): Região do servidor (us, eu, etc.)
         item_id (int): ID do item
         token (str): Token de acesso
+        use_cache (bool): Se True, consulta e atualiza o cache persistente de itens
         
     Returns:
         dict: Informações sobre o item
     """
+    cache_key = f"{region}:{item_id}"
+    if use_cache:
+        cached = _item_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
     url = f"https://{region}.api.blizzard.com/data/wow/item/{item_id}"
     headers = {"Authorization": f"Bearer {token}"}
     params = {"namespace": f"static-{region}", "locale": "en_US"}
     
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = _api_get(region, url, headers=headers, params=params)
         response.raise_for_status()
         data = response.json()
         
-        return {
+        item_data = {
             "Item ID": data.get("id"),
             "Name": data.get("name"),
             "Quality": data.get("quality", {}).get("name"),
@@ -345,48 +660,211 @@ def get_item_data(region, item_id, token):
             "Is Equippable": data.get("is_equippable", False),
             "Is Stackable": data.get("is_stackable", False)
         }
+        if use_cache:
+            _item_cache.set(cache_key, item_data)
+        return item_data
     except Exception as e:
         print(f"Erro ao obter dados do item {item_id}: {e}")
         return None
 
-def get_connected_realm_id(region, realm_name, token):
+def get_items_data(region, item_ids, token, max_workers=None):
     """
-    Obtém o ID do reino conectado para um dado nome de reino.
+    Obtém dados de vários itens, usando o cache persistente e buscando
+    em paralelo apenas os itens que não estão em cache.
     
     Args:
         region (str): Região do servidor (us, eu, etc.)
-        realm_name (str): Nome do reino
+        item_ids (iterable): IDs dos itens
         token (str): Token de acesso
+        max_workers (int): Número máximo de requisições simultâneas (padrão: WOW_MAX_WORKERS)
         
     Returns:
-        int: ID do reino conectado
+        dict: Informações dos itens por ID (itens não encontrados são omitidos)
+    """
+    item_ids = list(dict.fromkeys(int(item_id) for item_id in item_ids))
+    cached = _item_cache.get_many(f"{region}:{item_id}" for item_id in item_ids)
+    
+    items = {}
+    missing = []
+    for item_id in item_ids:
+        item_data = cached.get(f"{region}:{item_id}")
+        if item_data is not None:
+            items[item_id] = item_data
+        else:
+            missing.append(item_id)
+    
+    if missing:
+        with ThreadPoolExecutor(max_workers=max_workers or WOW_MAX_WORKERS) as executor:
+            fetched = executor.map(lambda item_id: get_item_data(region, item_id, token, use_cache=False), missing)
+            new_items = {item_id: item_data for item_id, item_data in zip(missing, fetched) if item_data}
+        _item_cache.set_many({f"{region}:{item_id}": item_data for item_id, item_data in new_items.items()})
+        items.update(new_items)
+    
+    return items
+
+def prefetch_auction_items(region, connected_realm_id, token, background=True):
+    """
+    Preenche o cache de itens com todos os itens do snapshot de leilões de um reino.
+    
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        connected_realm_id (int): ID do reino conectado
+        token (str): Token de acesso
+        background (bool): Se True, executa em uma thread e retorna imediatamente
+        
+    Returns:
+        int: Número de itens distintos no snapshot
+    """
+    auctions, _ = get_auction_snapshot(region, connected_realm_id, token)
+    item_ids = np.unique(auctions["item_id"].to_numpy()).tolist()
+    
+    if background:
+        threading.Thread(target=get_items_data, args=(region, item_ids, token), daemon=True).start()
+    else:
+        get_items_data(region, item_ids, token)
+    return len(item_ids)
+
+def _normalize_realm(name):
+    """Normaliza um nome de reino para comparação (minúsculas, hífens no lugar de espaços, sem apóstrofos)."""
+    return name.strip().lower().replace("'", "").replace(" ", "-")
+
+def _build_realm_lookup(realms):
+    """Monta os índices por nome, slug e ID a partir da lista de reinos."""
+    lookup = {"realms": realms, "by_name": {}, "by_slug": {}, "by_id": {}}
+    for realm in realms:
+        lookup["by_name"].setdefault(realm["name"].lower(), realm)
+        lookup["by_name"].setdefault(_normalize_realm(realm["name"]), realm)
+        lookup["by_slug"][realm["slug"]] = realm
+        lookup["by_id"][realm["id"]] = realm
+    return lookup
+
+def _fetch_realm_index(region, token):
+    """
+    Percorre todas as páginas da busca de reinos conectados da região.
+    
+    Returns:
+        list: Reinos com id, name, slug e connected_realm_id
     """
     url = f"https://{region}.api.blizzard.com/data/wow/search/connected-realm"
     headers = {"Authorization": f"Bearer {token}"}
-    params = {
-        "namespace": f"dynamic-{region}",
-        "locale": "en_US",
-        "_page": 1,
-        "_pageSize": 100
-    }
     
-    try:
-        response = requests.get(url, headers=headers, params=params)
+    realms = []
+    page = 1
+    while True:
+        params = {
+            "namespace": f"dynamic-{region}",
+            "locale": "en_US",
+            "_page": page,
+            "_pageSize": 1000
+        }
+        response = _api_get(region, url, headers=headers, params=params)
         response.raise_for_status()
         data = response.json()
         
         for result in data.get("results", []):
-            realms = result.get("data", {}).get("realms", [])
-            for realm in realms:
-                if realm.get("name", {}).get("en_US", "").lower() == realm_name.lower():
-                    return result.get("data", {}).get("id")
+            connected_realm = result.get("data", {})
+            for realm in connected_realm.get("realms", []):
+                name = realm.get("name", {})
+                realms.append({
+                    "id": realm.get("id"),
+                    "name": name.get("en_US", "") if isinstance(name, dict) else name or "",
+                    "slug": realm.get("slug", "").lower(),
+                    "connected_realm_id": connected_realm.get("id"),
+                })
         
-        # Se não encontrou, tenta buscar pelo slug
-        for result in data.get("results", []):
-            realms = result.get("data", {}).get("realms", [])
-            for realm in realms:
-                if realm.get("slug", "").lower() == realm_name.lower():
-                    return result.get("data", {}).get("id")
+        if page >= data.get("pageCount", 1):
+            break
+        page += 1
+    
+    return realms
+
+def get_realm_index(region, token, refresh=False):
+    """
+    Obtém o índice de reinos da região (nome, slug e ID -> reino conectado).
+    
+    O índice é montado uma vez percorrendo todas as páginas da busca de reinos
+    conectados, gravado em disco e reaproveitado por WOW_REALM_INDEX_TTL segundos.
+    
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        token (str): Token de acesso
+        refresh (bool): Se True, ignora o cache e monta o índice novamente
+        
+    Returns:
+        dict: Reinos e índices by_name, by_slug e by_id
+    """
+    with _realm_index_lock:
+        cached = _realm_indexes.get(region)
+        if cached and not refresh and time.time() - cached["fetched_at"] < WOW_REALM_INDEX_TTL:
+            return cached["lookup"]
+        
+        path = local_cache.cache_path("wow", "realms", f"{region}.json")
+        stored = None if refresh else local_cache.read_json(path)
+        if not stored or time.time() - stored.get("fetched_at", 0) >= WOW_REALM_INDEX_TTL:
+            stored = {"fetched_at": time.time(), "realms": _fetch_realm_index(region, token)}
+            local_cache.write_json(path, stored)
+        
+        lookup = _build_realm_lookup(stored["realms"])
+        _realm_indexes[region] = {"fetched_at": stored["fetched_at"], "lookup": lookup}
+        return lookup
+
+def find_realm(region, realm_name, token):
+    """
+    Procura um reino pelo nome, slug ou ID no índice de reinos da região.
+    
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        realm_name (str): Nome, slug ou ID do reino
+        token (str): Token de acesso
+        
+    Returns:
+        dict: Reino (id, name, slug, connected_realm_id) ou None se não encontrado
+    """
+    index = get_realm_index(region, token)
+    key = str(realm_name).strip()
+    return (
+        index["by_name"].get(key.lower())
+        or index["by_slug"].get(key.lower())
+        or index["by_name"].get(_normalize_realm(key))
+        or (index["by_id"].get(int(key)) if key.isdigit() else None)
+    )
+
+def resolve_realm_slug(region, realm_name, token):
+    """
+    Converte um nome de reino no slug usado pelas APIs de perfil.
+    
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        realm_name (str): Nome ou slug do reino
+        token (str): Token de acesso
+        
+    Returns:
+        str: Slug do reino (ou o nome normalizado se o índice não estiver disponível)
+    """
+    try:
+        realm = find_realm(region, realm_name, token)
+        if realm:
+            return realm["slug"]
+    except Exception as e:
+        print(f"Erro ao consultar o índice de reinos para {realm_name}: {e}")
+    return _normalize_realm(realm_name)
+
+def get_connected_realm_id(region, realm_name, token):
+    """
+    Obtém o ID do reino conectado para um dado nome de reino.
+    
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        realm_name (str): Nome, slug ou ID do reino
+        token (str): Token de acesso
+        
+    Returns:
+        int: ID do reino conectado
+    """
+    try:
+        realm = find_realm(region, realm_name, token)
+        if realm:
+            return realm["connected_realm_id"]
         
         print(f"Não foi possível encontrar o ID do reino conectado para {realm_name}")
         return None
@@ -398,6 +876,9 @@ def get_complete_character_info(client_id, client_secret, region, realm, charact
     """
     Obtém informações completas de um personagem (perfil, estatísticas, equipamentos e conquistas).
     
+    As quatro requisições são feitas em paralelo. Se alguma delas falhar (exceto
+    o perfil), o resultado é retornado parcialmente e o erro é informado em "errors".
+    
     Args:
         client_id (str): ID do cliente da API Blizzard
         client_secret (str): Segredo do cliente da API Blizzard
@@ -410,30 +891,35 @@ def get_complete_character_info(client_id, client_secret, region, realm, charact
     """
     try:
         token = get_access_token(client_id, client_secret, region)
+        realm = resolve_realm_slug(region, realm, token)
         
-        # Obter dados básicos do personagem
-        character_info = get_character_data(region, realm, character_name, token)
-        if not character_info:
-            return {"success": False, "error": f"Personagem {character_name}@{realm} não encontrado"}
-        
-        # Obter estatísticas
-        stats = get_character_statistics(region, realm, character_name, token)
-        
-        # Obter equipamentos
-        equipment = get_character_equipment(region, realm, character_name, token)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                "profile": executor.submit(get_character_data, region, realm, character_name, token, raise_errors=True),
+                "statistics": executor.submit(get_character_statistics, region, realm, character_name, token, raise_errors=True),
+                "equipment": executor.submit(get_character_equipment, region, realm, character_name, token, raise_errors=True),
+                "achievements": executor.submit(get_character_achievements, region, realm, character_name, token,
+                                                max_achievements=20, raise_errors=True),
+            }
+            defaults = {"profile": None, "statistics": {}, "equipment": [], "achievements": []}
+            
+            data = {}
+            errors = {}
+            for key, future in futures.items():
+                try:
+                    data[key] = future.result()
+                except Exception as e:
+                    data[key] = defaults[key]
+                    errors[key] = str(e)
         
-        # Obter conquistas
-        achievements = get_character_achievements(region, realm, character_name, token, max_achievements=20)
+        # Sem o perfil básico não há o que retornar
+        if not data["profile"]:
+            return {"success": False, "error": f"Personagem {character_name}@{realm} não encontrado"}
         
-        return {
-            "success": True,
-            "data": {
-                "profile": character_info,
-                "statistics": stats,
-                "equipment": equipment,
-                "achievements": achievements
-            }
-        }
+        result = {"success": True, "data": data}
+        if errors:
+            result["errors"] = errors
+        return result
     except Exception as e:
         return {"success": False, "error": str(e)}
 
@@ -453,6 +939,7 @@ def get_guild_info(client_id, client_secret, region, realm, guild_name):
     """
     try:
         token = get_access_token(client_id, client_secret, region)
+        realm = resolve_realm_slug(region, realm, token)
         
         # Obter dados da guilda
         guild_info = get_guild_data(region, realm, guild_name, token)
@@ -462,26 +949,132 @@ def get_guild_info(client_id, client_secret, region, realm, guild_name):
         # Obter membros da guilda
         members = get_guild_members(region, realm, guild_name, token)
         
+        # Registrar o roster para consultas incrementais (get_guild_roster_changes)
+        snapshot_id = wow_guilds.save_guild_snapshot(region, realm, guild_name, members) if members else None
+        
         return {
             "success": True,
             "data": {
                 "guild_info": guild_info,
-                "members": members
+                "members": members,
+                "snapshot": snapshot_id
+            }
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+def get_guild_roster_changes(client_id, client_secret, region, realm, guild_name, since=None):
+    """
+    Obtém as mudanças no roster de uma guilda desde um snapshot anterior
+    (entradas, saídas e mudanças de rank, nível, classe ou raça).
+    
+    O roster atual é gravado como um novo snapshot, cujo ID pode ser usado em
+    "since" na próxima consulta.
+    
+    Args:
+        client_id (str): ID do cliente da API Blizzard
+        client_secret (str): Segredo do cliente da API Blizzard
+        region (str): Região do servidor (us, eu, etc.)
+        realm (str): Nome do reino
+        guild_name (str): Nome da guilda
+        since (str): ID do snapshot de referência (padrão: o snapshot mais recente)
+        
+    Returns:
+        dict: Snapshot atual, snapshot de referência e listas joined, left e changed
+    """
+    try:
+        token = get_access_token(client_id, client_secret, region)
+        realm = resolve_realm_slug(region, realm, token)
+        
+        if since is None:
+            snapshots = wow_guilds.list_guild_snapshots(region, realm, guild_name)
+            since = snapshots[-1]["id"] if snapshots else None
+        previous = wow_guilds.load_guild_snapshot(region, realm, guild_name, since) if since else None
+        if since and previous is None:
+            return {"success": False, "error": f"Snapshot {since} da guilda {guild_name}@{realm} não encontrado"}
+        
+        members = get_guild_members(region, realm, guild_name, token)
+        if not members:
+            return {"success": False, "error": f"Guilda {guild_name}@{realm} não encontrada ou sem membros"}
+        
+        snapshot_id = wow_guilds.save_guild_snapshot(region, realm, guild_name, members)
+        
+        # Sem snapshot anterior, todos os membros são considerados novos
+        changes = wow_guilds.diff_guild_rosters(previous or [], members)
+        
+        return {
+            "success": True,
+            "data": {
+                "snapshot": snapshot_id,
+                "since": since,
+                "member_count": len(members),
+                **changes
+            }
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+def get_guild_profile(client_id, client_secret, region, realm, guild_name, include_equipment=True, max_members=None):
+    """
+    Obtém o perfil de todos os membros de uma guilda (nível de item, conquistas,
+    especialização e, opcionalmente, equipamentos).
+    
+    Args:
+        client_id (str): ID do cliente da API Blizzard
+        client_secret (str): Segredo do cliente da API Blizzard
+        region (str): Região do servidor (us, eu, etc.)
+        realm (str): Nome do reino
+        guild_name (str): Nome da guilda
+        include_equipment (bool): Se True, inclui os equipamentos de cada membro
+        max_members (int): Número máximo de membros a analisar (opcional; ordenados pelo rank)
+        
+    Returns:
+        dict: Perfis dos membros e erros por membro
+    """
+    try:
+        token = get_access_token(client_id, client_secret, region)
+        realm = resolve_realm_slug(region, realm, token)
+        
+        members = get_guild_members(region, realm, guild_name, token)
+        if not members:
+            return {"success": False, "error": f"Guilda {guild_name}@{realm} não encontrada ou sem membros"}
+        
+        members = sorted(members, key=lambda member: member.get("Rank", 0))
+        if max_members:
+            members = members[:max_members]
+        
+        profiles = []
+        errors = []
+        for result in iter_guild_member_profiles(region, realm, members, token, include_equipment=include_equipment):
+            (errors if "error" in result else profiles).append(result)
+        
+        return {
+            "success": True,
+            "data": {
+                "members": profiles,
+                "errors": errors
             }
         }
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-def get_auction_data(client_id, client_secret, region, realm, limit=100):
+def get_auction_data(client_id, client_secret, region, realm, limit=100, prefetch_items=False,
+                     include_item_details=True):
     """
     Obtém dados do leilão (mercado) para um reino.
     
+    Os detalhes dos itens vêm do cache persistente de itens; apenas os itens
+    ainda não conhecidos são buscados na API, em paralelo (uma requisição por
+    item, o que pode ser demorado em um reino ainda sem cache).
+    
     Args:
         client_id (str): ID do cliente da API Blizzard
         client_secret (str): Segredo do cliente da API Blizzard
         region (str): Região do servidor (us, eu, etc.)
         realm (str): Nome do reino
         limit (int): Limite de resultados
+        prefetch_items (bool): Se True, preenche em segundo plano o cache com todos os itens do leilão
+        include_item_details (bool): Se False, não consulta os detalhes dos itens (detailed_items fica vazio)
         
     Returns:
         dict: Dados do leilão
@@ -497,15 +1090,21 @@ def get_auction_data(client_id, client_secret, region, realm, limit=100):
         # Obter dados do leilão
         auctions = get_auction_house_data(region, connected_realm_id, token, limit=limit)
         
-        # Adicionar detalhes dos itens para os primeiros 10 itens (para não sobrecarregar a API)
+        # Adicionar detalhes dos itens (do cache, buscando apenas os que faltam)
+        items = {}
+        if include_item_details:
+            items = get_items_data(region, {auction.get("Item ID") for auction in auctions}, token)
         detailed_items = []
-        for auction in auctions[:10]:
-            item_id = auction.get("Item ID")
-            item_details = get_item_data(region, item_id, token)
+        for auction in auctions:
+            item_details = items.get(auction.get("Item ID"))
             if item_details:
+                auction["Item Name"] = item_details.get("Name") or auction["Item Name"]
                 auction["Item Details"] = item_details
                 detailed_items.append(auction)
         
+        if prefetch_items:
+            prefetch_auction_items(region, connected_realm_id, token, background=True)
+        
         return {
             "success": True,
             "data": {
@@ -516,10 +1115,267 @@ def get_auction_data(client_id, client_secret, region, realm, limit=100):
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+def get_auction_price_index(client_id, client_secret, region, realm, item_ids=None, limit=100):
+    """
+    Obtém o índice de preços do leilão de um reino (preço mínimo, mediana,
+    percentis 10/90, quantidade total e número de leilões por item).
+    
+    O índice é calculado sobre todos os leilões do snapshot atual e fica em
+    cache até o snapshot mudar.
+    
+    Args:
+        client_id (str): ID do cliente da API Blizzard
+        client_secret (str): Segredo do cliente da API Blizzard
+        region (str): Região do servidor (us, eu, etc.)
+        realm (str): Nome do reino
+        item_ids (list): IDs de itens a consultar (opcional; padrão: itens com mais unidades à venda)
+        limit (int): Número máximo de itens a retornar
+        
+    Returns:
+        dict: Índice de preços por item
+    """
+    try:
+        token = get_access_token(client_id, client_secret, region)
+        
+        connected_realm_id = get_connected_realm_id(region, realm, token)
+        if not connected_realm_id:
+            return {"success": False, "error": f"Não foi possível encontrar o reino {realm}"}
+        
+        auctions, meta = get_auction_snapshot(region, connected_realm_id, token)
+        index = _price_index(region, connected_realm_id, meta, auctions)
+        
+        if item_ids:
+            index = index[index["item_id"].isin(set(item_ids))]
+        else:
+            index = index.sort_values("total_quantity", ascending=False, kind="stable")
+        
+        return {
+            "success": True,
+            "data": {
+                "connected_realm_id": connected_realm_id,
+                "last_modified": meta.get("last_modified"),
+                "total_items": len(index),
+                "items": wow_auctions.price_index_to_records(index, limit)
+            }
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+def get_commodity_prices(client_id, client_secret, region, item_ids=None, limit=100, depth_buckets=10):
+    """
+    Obtém os preços dos leilões de commodities da região (válidos para todos os reinos).
+    
+    O arquivo de commodities é decodificado de forma incremental para o snapshot
+    local, e o histograma de profundidade de preço de cada item é calculado
+    durante a decodificação.
+    
+    Args:
+        client_id (str): ID do cliente da API Blizzard
+        client_secret (str): Segredo do cliente da API Blizzard
+        region (str): Região do servidor (us, eu, etc.)
+        item_ids (list): IDs de itens a consultar (opcional; padrão: itens com mais unidades à venda)
+        limit (int): Número máximo de itens a retornar
+        depth_buckets (int): Número de faixas de preço por item, a partir do menor preço (0 = sem profundidade)
+        
+    Returns:
+        dict: Índice de preços e profundidade de preço por item
+    """
+    try:
+        token = get_access_token(client_id, client_secret, region)
+        
+        auctions, meta = get_auction_snapshot(region, wow_auctions.COMMODITIES, token)
+        index = _price_index(region, wow_auctions.COMMODITIES, meta, auctions)
+        
+        if item_ids:
+            index = index[index["item_id"].isin(set(item_ids))]
+        else:
+            index = index.sort_values("total_quantity", ascending=False, kind="stable")
+        
+        items = wow_auctions.price_index_to_records(index, limit)
+        if depth_buckets:
+            depth = _price_depth(region, wow_auctions.COMMODITIES, meta, auctions)
+            for item in items:
+                item["Price Depth"] = wow_auctions.price_depth_to_records(depth, item["Item ID"], depth_buckets)
+        
+        return {
+            "success": True,
+            "data": {
+                "last_modified": meta.get("last_modified"),
+                "total_auctions": meta.get("rows"),
+                "total_items": len(index),
+                "items": items
+            }
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+def get_auction_price_history(client_id, client_secret, region, realm, item_ids, days=30, resolution="daily"):
+    """
+    Obtém a evolução dos preços de itens no leilão a partir da série histórica local.
+    
+    A série é alimentada por cada novo snapshot de leilões baixado (consultas,
+    varreduras de vários reinos, etc.); os pontos horários são resumidos em
+    pontos diários após wow_price_history.HOURLY_RETENTION_DAYS dias.
+    
+    Args:
+        client_id (str): ID do cliente da API Blizzard
+        client_secret (str): Segredo do cliente da API Blizzard
+        region (str): Região do servidor (us, eu, etc.)
+        realm (str): Nome do reino (ou "commodities" para as commodities da região)
+        item_ids (list): IDs dos itens
+        days (int): Número de dias a consultar
+        resolution (str): "daily" ou "hourly"
+        
+    Returns:
+        dict: Série de preços por item
+    """
+    try:
+        if resolution not in ("daily", "hourly"):
+            return {"success": False, "error": f"Resolução inválida: {resolution}"}
+        
+        token = get_access_token(client_id, client_secret, region)
+        
+        if str(realm).strip().lower() == wow_auctions.COMMODITIES:
+            connected_realm_id = wow_auctions.COMMODITIES
+        else:
+            connected_realm_id = get_connected_realm_id(region, realm, token)
+            if not connected_realm_id:
+                return {"success": False, "error": f"Não foi possível encontrar o reino {realm}"}
+        
+        # Registra o snapshot atual antes de consultar a série
+        get_auction_snapshot(region, connected_realm_id, token)
+        
+        points = wow_price_history.query(
+            region, connected_realm_id, item_ids, time.time() - days * 86400, resolution=resolution
+        )
+        
+        return {
+            "success": True,
+            "data": {
+                "connected_realm_id": connected_realm_id,
+                "resolution": resolution,
+                "days": days,
+                "items": wow_price_history.history_to_records(points)
+            }
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+def scan_auction_realms(region, token, connected_realm_ids=None, item_ids=None, max_workers=None):
+    """
+    Atualiza os snapshots de leilão de vários reinos conectados em paralelo.
+    
+    Cada reino é decodificado de forma incremental direto para o snapshot em
+    disco, e apenas o seu índice de preços é mantido em memória, de modo que o
+    consumo fica limitado a max_workers reinos por vez.
+    
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        token (str): Token de acesso
+        connected_realm_ids (list): IDs dos reinos conectados (padrão: todos os da região)
+        item_ids (list): IDs de itens a manter nos índices (opcional)
+        max_workers (int): Número máximo de downloads simultâneos (padrão: AUCTION_SCAN_WORKERS)
+        
+    Returns:
+        tuple: ({ID do reino conectado: índice de preços}, lista de falhas)
+    """
+    if connected_realm_ids is None:
+        connected_realm_ids = sorted({
+            realm["connected_realm_id"] for realm in get_realm_index(region, token)["realms"]
+            if realm.get("connected_realm_id")
+        })
+    wanted = set(item_ids) if item_ids else None
+    
+    def scan(connected_realm_id):
+        auctions, meta = get_auction_snapshot(region, connected_realm_id, token)
+        index = _price_index(region, connected_realm_id, meta, auctions)
+        if wanted is not None:
+            index = index[index["item_id"].isin(wanted)]
+        # Copia as colunas para liberar o memory-map do snapshot
+        return index.copy()
+    
+    indexes = {}
+    failures = []
+    with ThreadPoolExecutor(max_workers=max_workers or AUCTION_SCAN_WORKERS) as executor:
+        futures = {executor.submit(scan, realm_id): realm_id for realm_id in connected_realm_ids}
+        for future in as_completed(futures):
+            realm_id = futures[future]
+            try:
+                indexes[realm_id] = future.result()
+            except Exception as e:
+                print(f"Erro ao obter dados do leilão para o reino {realm_id}: {e}")
+                failures.append({"connected_realm_id": realm_id, "error": str(e)})
+    
+    return indexes, failures
+
+def get_auction_price_spreads(client_id, client_secret, region, realms=None, item_ids=None, min_realms=2,
+                              limit=100, max_workers=None):
+    """
+    Compara os preços do leilão entre vários reinos da região.
+    
+    Os arquivos de leilão dos reinos conectados são baixados em paralelo (ver
+    scan_auction_realms) e, para cada item, são retornados o reino mais barato,
+    o mais caro e a diferença entre eles.
+    
+    Args:
+        client_id (str): ID do cliente da API Blizzard
+        client_secret (str): Segredo do cliente da API Blizzard
+        region (str): Região do servidor (us, eu, etc.)
+        realms (list): Nomes dos reinos a comparar (opcional; padrão: todos os da região)
+        item_ids (list): IDs de itens a comparar (opcional)
+        min_realms (int): Número mínimo de reinos com o item à venda
+        limit (int): Número máximo de itens a retornar (ordenados pela maior diferença)
+        max_workers (int): Número máximo de downloads simultâneos (opcional)
+        
+    Returns:
+        dict: Diferenças de preço por item entre os reinos
+    """
+    try:
+        token = get_access_token(client_id, client_secret, region)
+        
+        connected_realm_ids = None
+        if realms:
+            connected_realm_ids = []
+            for realm in realms:
+                connected_realm_id = get_connected_realm_id(region, realm, token)
+                if not connected_realm_id:
+                    return {"success": False, "error": f"Não foi possível encontrar o reino {realm}"}
+                if connected_realm_id not in connected_realm_ids:
+                    connected_realm_ids.append(connected_realm_id)
+        
+        indexes, failures = scan_auction_realms(
+            region, token, connected_realm_ids, item_ids=item_ids, max_workers=max_workers
+        )
+        
+        spreads = wow_auctions.build_price_spreads(indexes)
+        spreads = spreads[spreads["realm_count"] >= min_realms]
+        spreads = spreads.sort_values("spread", ascending=False, kind="stable")
+        
+        # Nome do reino conectado: nomes dos reinos que o compõem
+        realm_names = {}
+        for realm in get_realm_index(region, token)["realms"]:
+            if realm.get("connected_realm_id") in indexes:
+                realm_names.setdefault(realm["connected_realm_id"], []).append(realm["name"])
+        realm_names = {realm_id: ", ".join(sorted(names)) for realm_id, names in realm_names.items()}
+        
+        return {
+            "success": True,
+            "data": {
+                "realms_scanned": len(indexes),
+                "total_items": len(spreads),
+                "items": wow_auctions.price_spreads_to_records(spreads, realm_names, limit),
+                "failures": failures
+            }
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
 def search_characters(client_id, client_secret, region, realm, names):
     """
     Pesquisa múltiplos personagens.
     
+    As buscas são feitas em paralelo, limitadas pela taxa permitida pela API da região.
+    
     Args:
         client_id (str): ID do cliente da API Blizzard
         client_secret (str): Segredo do cliente da API Blizzard
@@ -532,13 +1388,11 @@ def search_characters(client_id, client_secret, region, realm, names):
     """
     try:
         token = get_access_token(client_id, client_secret, region)
+        realm = resolve_realm_slug(region, realm, token)
         
-        results = []
-        for name in names:
-            character_info = get_character_data(region, realm, name, token)
-            if character_info:
-                results.append(character_info)
-            sleep(0.5)  # Para evitar rate limiting
+        with ThreadPoolExecutor(max_workers=WOW_MAX_WORKERS) as executor:
+            characters = executor.map(lambda name: get_character_data(region, realm, name, token), names)
+            results = [character_info for character_info in characters if character_info]
         
         return {
             "success": True,
@@ -547,10 +1401,291 @@ def search_characters(client_id, client_secret, region, realm, names):
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+def _parse_character_ref(character):
+    """Converte {"realm", "name"} ou (realm, name) em uma tupla (realm, name)."""
+    if isinstance(character, dict):
+        return character.get("realm") or character.get("Realm"), character.get("name") or character.get("Name")
+    realm, name = character
+    return realm, name
+
+def fetch_characters(region, characters, token, max_workers=None):
+    """
+    Busca o perfil básico de muitos personagens, de vários reinos, em paralelo.
+    
+    Pares repetidos (mesmo reino e nome) são buscados uma única vez e os nomes
+    de reino são convertidos em slugs pelo índice de reinos.
+    
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        characters (list): Pares (reino, nome) ou dicionários {"realm", "name"}
+        token (str): Token de acesso
+        max_workers (int): Número máximo de requisições simultâneas (padrão: WOW_MAX_WORKERS)
+        
+    Returns:
+        tuple: (DataFrame com uma linha por personagem encontrado, lista de falhas por personagem)
+    """
+    realm_slugs = {}
+    unique = {}
+    for character in characters:
+        realm, name = _parse_character_ref(character)
+        if not realm or not name:
+            continue
+        if realm not in realm_slugs:
+            realm_slugs[realm] = resolve_realm_slug(region, realm, token)
+        unique.setdefault((realm_slugs[realm], name.strip().lower()), name.strip())
+    
+    def fetch(key):
+        realm_slug, _ = key
+        return get_character_data(region, realm_slug, unique[key], token, raise_errors=True)
+    
+    rows = []
+    failures = []
+    with ThreadPoolExecutor(max_workers=max_workers or WOW_MAX_WORKERS) as executor:
+        futures = {executor.submit(fetch, key): key for key in unique}
+        for future, key in futures.items():
+            try:
+                rows.append(future.result())
+            except Exception as e:
+                failures.append({"Realm": key[0], "Name": unique[key], "error": str(e)})
+    
+    return pd.DataFrame(rows), failures
+
+def get_characters_batch(client_id, client_secret, region, characters, columnar=True):
+    """
+    Obtém o perfil básico de centenas de personagens de vários reinos em uma única chamada.
+    
+    Args:
+        client_id (str): ID do cliente da API Blizzard
+        client_secret (str): Segredo do cliente da API Blizzard
+        region (str): Região do servidor (us, eu, etc.)
+        characters (list): Pares (reino, nome) ou dicionários {"realm", "name"}
+        columnar (bool): Se True, retorna os perfis por coluna (listas por campo) em vez de por linha
+        
+    Returns:
+        dict: Perfis encontrados e falhas por personagem
+    """
+    try:
+        token = get_access_token(client_id, client_secret, region)
+        
+        profiles, failures = fetch_characters(region, characters, token)
+        
+        return {
+            "success": True,
+            "data": {
+                "count": len(profiles),
+                "characters": profiles.to_dict("list" if columnar else "records"),
+                "failures": failures
+            }
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+def get_achievement_catalog(region, token, refresh=False):
+    """
+    Obtém o catálogo estático de conquistas da região ({id: nome}).
+    
+    O catálogo é baixado uma vez e gravado em disco (validade WOW_ACHIEVEMENT_CATALOG_TTL).
+    
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        token (str): Token de acesso
+        refresh (bool): Se True, baixa o catálogo novamente
+        
+    Returns:
+        dict: Nome de cada conquista por ID
+    """
+    catalog = None if refresh else wow_achievements.load_catalog(region)
+    if catalog is None:
+        url = f"https://{region}.api.blizzard.com/data/wow/achievement/index"
+        headers = {"Authorization": f"Bearer {token}"}
+        params = {"namespace": f"static-{region}", "locale": "en_US"}
+        
+        response = _api_get(region, url, headers=headers, params=params)
+        response.raise_for_status()
+        catalog = {
+            achievement["id"]: achievement.get("name")
+            for achievement in response.json().get("achievements", [])
+            if "id" in achievement
+        }
+        wow_achievements.save_catalog(region, catalog)
+    return catalog
+
+def index_character_achievements(region, characters, token, refresh=False, max_workers=None):
+    """
+    Garante que as conquistas de vários personagens estejam no índice de conquistas.
+    
+    Apenas os personagens ausentes ou com índice expirado são baixados, em paralelo.
+    
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        characters (list): Pares (reino, nome) ou dicionários {"realm", "name"}
+        token (str): Token de acesso
+        refresh (bool): Se True, baixa novamente todos os personagens
+        max_workers (int): Número máximo de requisições simultâneas (padrão: WOW_MAX_WORKERS)
+        
+    Returns:
+        tuple: ({chave do personagem: IDs concluídos}, {chave: (reino, nome)}, lista de falhas)
+    """
+    realm_slugs = {}
+    refs = {}
+    for character in characters:
+        realm, name = _parse_character_ref(character)
+        if not realm or not name:
+            continue
+        if realm not in realm_slugs:
+            realm_slugs[realm] = resolve_realm_slug(region, realm, token)
+        key = wow_achievements.character_key(region, realm_slugs[realm], name)
+        refs.setdefault(key, (realm_slugs[realm], name.strip()))
+    
+    completions = {} if refresh else _achievement_index.load(refs)
+    missing = [key for key in refs if key not in completions]
+    
+    failures = []
+    if missing:
+        with ThreadPoolExecutor(max_workers=max_workers or WOW_MAX_WORKERS) as executor:
+            futures = {executor.submit(_fetch_character_achievements, region, *refs[key], token): key for key in missing}
+            for future, key in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    failures.append({"Realm": refs[key][0], "Name": refs[key][1], "error": str(e)})
+        completions.update(_achievement_index.load(missing))
+    
+    return completions, refs, failures
+
+def get_achievement_completion(client_id, client_secret, region, achievement_ids, characters, refresh=False):
+    """
+    Verifica quais personagens concluíram cada uma das conquistas informadas.
+    
+    As conquistas de cada personagem ficam em um índice local, então consultas
+    repetidas não baixam os perfis novamente.
+    
+    Args:
+        client_id (str): ID do cliente da API Blizzard
+        client_secret (str): Segredo do cliente da API Blizzard
+        region (str): Região do servidor (us, eu, etc.)
+        achievement_ids (list): IDs das conquistas
+        characters (list): Pares (reino, nome) ou dicionários {"realm", "name"}
+        refresh (bool): Se True, baixa novamente as conquistas de todos os personagens
+        
+    Returns:
+        dict: Personagens que concluíram cada conquista e falhas por personagem
+    """
+    try:
+        token = get_access_token(client_id, client_secret, region)
+        
+        try:
+            catalog = get_achievement_catalog(region, token)
+        except Exception as e:
+            print(f"Erro ao obter o catálogo de conquistas: {e}")
+            catalog = {}
+        
+        completions, refs, failures = index_character_achievements(region, characters, token, refresh=refresh)
+        matrix = wow_achievements.completion_matrix(completions, achievement_ids)
+        
+        results = []
+        for achievement_id in matrix.columns:
+            completed_by = [refs[key] for key in matrix.index[matrix[achievement_id].to_numpy()]]
+            results.append({
+                "Achievement ID": int(achievement_id),
+                "Name": catalog.get(int(achievement_id)),
+                "Completed Count": len(completed_by),
+                "Completed By": [{"Realm": realm, "Name": name} for realm, name in completed_by]
+            })
+        
+        return {
+            "success": True,
+            "data": {
+                "characters_indexed": len(completions),
+                "achievements": results,
+                "failures": failures
+            }
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+def get_gear_audit(client_id, client_secret, region, characters=None, realm=None, guild_name=None, max_members=None):
+    """
+    Audita os equipamentos de vários personagens ou de uma guilda inteira
+    (nível de item médio, slots vazios, slot mais fraco e peças de conjunto).
+    
+    Args:
+        client_id (str): ID do cliente da API Blizzard
+        client_secret (str): Segredo do cliente da API Blizzard
+        region (str): Região do servidor (us, eu, etc.)
+        characters (list): Pares (reino, nome) ou dicionários {"realm", "name"} (opcional)
+        realm (str): Nome do reino da guilda (usado com guild_name)
+        guild_name (str): Nome da guilda a auditar (opcional)
+        max_members (int): Número máximo de membros da guilda (opcional; ordenados pelo rank)
+        
+    Returns:
+        dict: Resumo por personagem, resumo por slot e falhas
+    """
+    try:
+        token = get_access_token(client_id, client_secret, region)
+        
+        members = []
+        if guild_name:
+            if not realm:
+                return {"success": False, "error": "Informe o reino da guilda"}
+            realm = resolve_realm_slug(region, realm, token)
+            members = sorted(get_guild_members(region, realm, guild_name, token), key=lambda member: member.get("Rank", 0))
+            if not members:
+                return {"success": False, "error": f"Guilda {guild_name}@{realm} não encontrada ou sem membros"}
+            if max_members:
+                members = members[:max_members]
+        
+        realm_slugs = {}
+        for character in characters or []:
+            character_realm, name = _parse_character_ref(character)
+            if not character_realm or not name:
+                continue
+            if character_realm not in realm_slugs:
+                realm_slugs[character_realm] = resolve_realm_slug(region, character_realm, token)
+            members.append({"Name": name, "Realm": character_realm, "Realm Slug": realm_slugs[character_realm]})
+        
+        if not members:
+            return {"success": False, "error": "Informe uma lista de personagens ou uma guilda"}
+        
+        store = wow_equipment.EquipmentStore()
+        failures = []
+        for result in iter_guild_member_profiles(region, realm, members, token, include_equipment=True):
+            if "error" in result:
+                failures.append(result)
+                continue
+            profile = result.get("profile") or {}
+            store.add_character(
+                {
+                    "Name": result["Name"],
+                    "Realm": profile.get("Realm") or result.get("Realm"),
+                    "Class": profile.get("Class"),
+                    "Specialization": profile.get("Specialization")
+                },
+                result.get("equipment", [])
+            )
+        
+        summary = store.summary()
+        average = sum(row["Average Item Level"] for row in summary) / len(summary) if summary else None
+        
+        return {
+            "success": True,
+            "data": {
+                "character_count": len(summary),
+                "average_item_level": round(average, 2) if average is not None else None,
+                "characters": sorted(summary, key=lambda row: row["Average Item Level"]),
+                "slots": store.slot_report(),
+                "failures": failures
+            }
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
 def search_guilds(client_id, client_secret, region, realm, guild_names):
     """
     Pesquisa múltiplas guildas.
     
+    As buscas são feitas em paralelo, limitadas pela taxa permitida pela API da região.
+    
     Args:
         client_id (str): ID do cliente da API Blizzard
         client_secret (str): Segredo do cliente da API Blizzard
@@ -563,16 +1698,18 @@ def search_guilds(client_id, client_secret, region, realm, guild_names):
     """
     try:
         token = get_access_token(client_id, client_secret, region)
+        realm = resolve_realm_slug(region, realm, token)
         
-        results = []
-        for name in guild_names:
-            guild_info = get_guild_data(region, realm, name, token)
-            if guild_info:
-                # Obter apenas o número de membros, não a lista completa
-                members_count = guild_info.get("Member Count", 0)
-                guild_info["Members Count"] = members_count
-                results.append(guild_info)
-            sleep(0.5)  # Para evitar rate limiting
+        with ThreadPoolExecutor(max_workers=WOW_MAX_WORKERS) as executor:
+            guilds = executor.map(lambda name: get_guild_data(region, realm, name, token), guild_names)
+            
+            results = []
+            for guild_info in guilds:
+                if guild_info:
+                    # Obter apenas o número de membros, não a lista completa
+                    members_count = guild_info.get("Member Count", 0)
+                    guild_info["Members Count"] = members_count
+                    results.append(guild_info)
         
         return {
             "success": True,
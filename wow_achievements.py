@@ -0,0 +1,130 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import local_cache
+
+# Validade das conquistas indexadas de cada personagem
+ACHIEVEMENT_INDEX_TTL = float(os.getenv("WOW_ACHIEVEMENT_INDEX_TTL", str(24 * 3600)))
+# Validade do catálogo estático de conquistas
+ACHIEVEMENT_CATALOG_TTL = float(os.getenv("WOW_ACHIEVEMENT_CATALOG_TTL", str(7 * 24 * 3600)))
+
+def character_key(region, realm_slug, character_name):
+    """Chave de um personagem no índice de conquistas."""
+    return f"{region}:{realm_slug}:{character_name.strip().lower()}"
+
+def completed_ids(achievements):
+    """
+    Extrai os IDs das conquistas concluídas do documento de conquistas de um personagem.
+
+    Args:
+        achievements (list): Entradas "achievements" da API de perfil
+
+    Returns:
+        np.ndarray: IDs concluídos (int32, ordenados e sem repetição)
+    """
+    ids = [
+        achievement.get("id")
+        for achievement in achievements
+        if achievement.get("completed_timestamp") and achievement.get("id") is not None
+    ]
+    return np.unique(np.asarray(ids, dtype=np.int32))
+
+def load_catalog(region):
+    """
+    Lê o catálogo de conquistas gravado para a região.
+
+    Returns:
+        dict: {id: nome} (ou None se ausente ou expirado)
+    """
+    stored = local_cache.read_json(local_cache.cache_path("wow", "achievements", region, "catalog.json"))
+    if not stored or time.time() - stored.get("fetched_at", 0) >= ACHIEVEMENT_CATALOG_TTL:
+        return None
+    return {int(achievement_id): name for achievement_id, name in stored["achievements"].items()}
+
+def save_catalog(region, catalog):
+    """
+    Grava o catálogo de conquistas da região.
+
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        catalog (dict): {id: nome}
+    """
+    local_cache.write_json(
+        local_cache.cache_path("wow", "achievements", region, "catalog.json"),
+        {"fetched_at": time.time(), "achievements": {str(key): value for key, value in catalog.items()}},
+    )
+
+class AchievementIndex(local_cache.SQLiteStore):
+    """
+    Índice persistente das conquistas concluídas por personagem.
+
+    Cada personagem é guardado como um array int32 ordenado de IDs de
+    conquistas (em SQLite), o que permite responder consultas sobre muitos
+    personagens sem baixar os perfis novamente.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS completions (key TEXT PRIMARY KEY, ids BLOB NOT NULL, updated_at REAL NOT NULL)",
+    )
+
+    def __init__(self, name="wow_achievements"):
+        super().__init__(name)
+
+    def store(self, key, achievement_ids):
+        """
+        Grava as conquistas concluídas de um personagem.
+
+        Args:
+            key (str): Chave do personagem (ver character_key)
+            achievement_ids (np.ndarray): IDs concluídos (ver completed_ids)
+        """
+        ids = np.asarray(achievement_ids, dtype=np.int32)
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO completions (key, ids, updated_at) VALUES (?, ?, ?)",
+                (key, ids.tobytes(), time.time()),
+            )
+
+    def load(self, keys, max_age=ACHIEVEMENT_INDEX_TTL):
+        """
+        Lê as conquistas concluídas de vários personagens.
+
+        Args:
+            keys (iterable): Chaves dos personagens
+            max_age (float): Idade máxima das entradas em segundos (None = sem limite)
+
+        Returns:
+            dict: {chave: np.ndarray de IDs} para os personagens indexados
+        """
+        min_updated_at = time.time() - max_age if max_age is not None else float("-inf")
+        rows = self._select_in(
+            "SELECT key, ids FROM completions WHERE key IN ({placeholders}) AND updated_at >= ?",
+            keys, min_updated_at,
+        )
+        return {key: np.frombuffer(blob, dtype=np.int32) for key, blob in rows}
+
+def completion_matrix(completions, achievement_ids):
+    """
+    Monta a matriz personagem x conquista indicando quais foram concluídas.
+
+    Args:
+        completions (dict): {chave do personagem: IDs concluídos}
+        achievement_ids (list): IDs das conquistas consultadas (repetições são ignoradas)
+
+    Returns:
+        DataFrame: Booleanos, uma linha por personagem e uma coluna por conquista,
+                   na ordem da primeira ocorrência de cada ID
+    """
+    achievement_ids = np.asarray(list(dict.fromkeys(int(achievement_id) for achievement_id in achievement_ids)), dtype=np.int32)
+    keys = list(completions)
+    matrix = np.zeros((len(keys), len(achievement_ids)), dtype=bool)
+    for row, key in enumerate(keys):
+        ids = completions[key]
+        if len(ids):
+            positions = np.minimum(np.searchsorted(ids, achievement_ids), len(ids) - 1)
+            matrix[row] = ids[positions] == achievement_ids
+    return pd.DataFrame(matrix, index=keys, columns=achievement_ids)
@@ -0,0 +1,633 @@
+import array
+import json
+import math
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import local_cache
+
+# ijson é opcional: sem ele o JSON é carregado inteiro antes da conversão em colunas
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Se o aviso de ausência do ijson já foi exibido (uma vez por processo)
+_warned_without_ijson = False
+
+# Códigos de tempo restante, na ordem usada pela coluna categórica time_left
+TIME_LEFT_CODES = ["SHORT", "MEDIUM", "LONG", "VERY_LONG"]
+_TIME_LEFT_INDEX = {name: code for code, name in enumerate(TIME_LEFT_CODES)}
+
+# Identificador usado no lugar do reino conectado para os leilões de commodities da região
+COMMODITIES = "commodities"
+# Largura relativa de cada faixa do histograma de profundidade de preço (0.05 = faixas de 5%)
+PRICE_DEPTH_STEP = float(os.getenv("AUCTION_PRICE_DEPTH_STEP", "0.05"))
+
+class AuctionColumnsBuilder:
+    """
+    Acumula leilões em colunas compactas (arrays tipados), sem manter um
+    dicionário por leilão em memória.
+
+    Colunas:
+        item_id (int32): ID do item
+        quantity (int32): Quantidade
+        price (int64): Preço total de compra em copper (buyout ou unit_price * quantity)
+        time_left (categoria): SHORT, MEDIUM, LONG ou VERY_LONG
+    """
+
+    def __init__(self):
+        self.item_id = array.array("i")
+        self.quantity = array.array("i")
+        self.price = array.array("q")
+        self.time_left = array.array("b")
+
+    def __len__(self):
+        return len(self.item_id)
+
+    def append(self, auction):
+        """
+        Adiciona um leilão no formato retornado pela API da Blizzard.
+
+        Args:
+            auction (dict): Leilão da API
+        """
+        quantity = int(auction.get("quantity", 1) or 1)
+        price = auction.get("buyout")
+        if price is None:
+            unit_price = auction.get("unit_price")
+            price = unit_price * quantity if unit_price is not None else auction.get("price", 0)
+
+        self.item_id.append(int(auction.get("item", {}).get("id", 0)))
+        self.quantity.append(quantity)
+        self.price.append(int(price or 0))
+        self.time_left.append(_TIME_LEFT_INDEX.get(auction.get("time_left"), -1))
+
+    def extend(self, auctions):
+        """Adiciona vários leilões."""
+        for auction in auctions:
+            self.append(auction)
+
+    def to_frame(self):
+        """
+        Converte as colunas acumuladas em um DataFrame.
+
+        Returns:
+            DataFrame: Leilões com as colunas item_id, quantity, price e time_left
+        """
+        return pd.DataFrame({
+            "item_id": np.frombuffer(self.item_id, dtype=np.int32),
+            "quantity": np.frombuffer(self.quantity, dtype=np.int32),
+            "price": np.frombuffer(self.price, dtype=np.int64),
+            "time_left": pd.Categorical.from_codes(
+                np.frombuffer(self.time_left, dtype=np.int8), categories=TIME_LEFT_CODES
+            ),
+        })
+
+class PriceDepthHistogram:
+    """
+    Histograma de profundidade de preço por item, acumulado leilão a leilão.
+
+    Os preços por unidade são agrupados em faixas logarítmicas de largura
+    relativa step, e cada faixa acumula a quantidade e o número de leilões.
+    """
+
+    def __init__(self, step=PRICE_DEPTH_STEP):
+        self.step = step
+        self._log_step = math.log1p(step)
+        self._buckets = {}
+
+    def add(self, item_id, unit_price, quantity):
+        """
+        Adiciona um leilão ao histograma.
+
+        Args:
+            item_id (int): ID do item
+            unit_price (float): Preço por unidade em copper
+            quantity (int): Quantidade
+        """
+        if unit_price <= 0:
+            return
+        key = (item_id, math.floor(math.log(unit_price) / self._log_step))
+        entry = self._buckets.get(key)
+        if entry is None:
+            self._buckets[key] = [quantity, 1]
+        else:
+            entry[0] += quantity
+            entry[1] += 1
+
+    def to_frame(self):
+        """
+        Converte o histograma em formato colunar.
+
+        Returns:
+            DataFrame: item_id, bucket, price_low, price_high, quantity,
+                       auction_count e cumulative_quantity (por item, do menor preço ao maior)
+        """
+        keys = np.array(list(self._buckets), dtype=np.int64).reshape(-1, 2)
+        values = np.array(list(self._buckets.values()), dtype=np.int64).reshape(-1, 2)
+        return _depth_frame(keys[:, 0], keys[:, 1], values[:, 0], values[:, 1], self.step)
+
+class CommodityColumnsBuilder(AuctionColumnsBuilder):
+    """
+    AuctionColumnsBuilder que também monta o histograma de profundidade de
+    preço durante a decodificação (usado nos leilões de commodities).
+    """
+
+    def __init__(self, step=PRICE_DEPTH_STEP):
+        super().__init__()
+        self.depth = PriceDepthHistogram(step)
+
+    def append(self, auction):
+        super().append(auction)
+        quantity = self.quantity[-1]
+        self.depth.add(self.item_id[-1], self.price[-1] / quantity, quantity)
+
+def new_auction_builder(connected_realm_id):
+    """Retorna o acumulador de colunas adequado ao reino conectado (ou às commodities)."""
+    return CommodityColumnsBuilder() if connected_realm_id == COMMODITIES else AuctionColumnsBuilder()
+
+def iter_auctions(source, prefix="auctions.item"):
+    """
+    Percorre os leilões de um documento JSON da API de leilões.
+
+    Com ijson instalado a leitura é incremental; caso contrário o documento
+    é carregado inteiro (com um aviso, na primeira vez).
+
+    Args:
+        source: Arquivo (ou objeto com read()) contendo o JSON da resposta
+        prefix (str): Caminho ijson dos leilões no documento
+
+    Yields:
+        dict: Um leilão por vez
+    """
+    global _warned_without_ijson
+    if ijson is not None:
+        yield from ijson.items(source, prefix)
+    else:
+        if not _warned_without_ijson:
+            _warned_without_ijson = True
+            print("Aviso: ijson não está instalado; o JSON de leilões será carregado inteiro na memória (pip install ijson)")
+        data = json.load(source)
+        yield from data.get(prefix.split(".")[0], [])
+
+def parse_auctions(source, builder=None):
+    """
+    Decodifica o JSON de leilões diretamente em colunas compactas.
+
+    Args:
+        source: Arquivo (ou objeto com read()) contendo o JSON da resposta
+        builder (AuctionColumnsBuilder): Acumulador a usar (opcional)
+
+    Returns:
+        DataFrame: Leilões em formato colunar (ver AuctionColumnsBuilder)
+    """
+    builder = builder if builder is not None else AuctionColumnsBuilder()
+    builder.extend(iter_auctions(source))
+    return builder.to_frame()
+
+def auctions_from_list(auctions, builder=None):
+    """
+    Converte uma lista de leilões já decodificada em formato colunar.
+
+    Args:
+        auctions (list): Leilões no formato da API
+        builder (AuctionColumnsBuilder): Acumulador a usar (opcional)
+
+    Returns:
+        DataFrame: Leilões em formato colunar
+    """
+    builder = builder if builder is not None else AuctionColumnsBuilder()
+    builder.extend(auctions)
+    return builder.to_frame()
+
+def filter_auctions(auctions, item_ids):
+    """
+    Filtra leilões por ID de item usando uma máscara vetorizada.
+
+    Args:
+        auctions (DataFrame): Leilões em formato colunar
+        item_ids (iterable): IDs de itens a manter
+
+    Returns:
+        DataFrame: Leilões dos itens informados
+    """
+    ids = np.fromiter(set(item_ids), dtype=np.int64)
+    return auctions[np.isin(auctions["item_id"].to_numpy(), ids)]
+
+def auctions_to_records(auctions, limit=None):
+    """
+    Converte leilões em formato colunar na lista de dicionários retornada pelas ferramentas.
+
+    Args:
+        auctions (DataFrame): Leilões em formato colunar
+        limit (int): Número máximo de leilões (opcional)
+
+    Returns:
+        list: Lista de leilões com Item ID, Item Name, Quantity, Price (Gold) e Time Left
+    """
+    if limit is not None:
+        auctions = auctions.head(limit)
+
+    return [
+        {
+            "Item ID": int(item_id),
+            "Item Name": "Unknown",
+            "Quantity": int(quantity),
+            "Price (Gold)": int(price) / 10000,  # Convertendo de copper para gold
+            "Time Left": time_left if isinstance(time_left, str) else None,
+        }
+        for item_id, quantity, price, time_left in zip(
+            auctions["item_id"].to_numpy(),
+            auctions["quantity"].to_numpy(),
+            auctions["price"].to_numpy(),
+            auctions["time_left"].astype(object),
+        )
+    ]
+
+def _snapshot_root(region, connected_realm_id):
+    """Diretório com os snapshots de leilão de um reino conectado."""
+    return os.path.dirname(local_cache.cache_path("wow", "auctions", region, connected_realm_id, "meta.json"))
+
+def load_auction_snapshot_meta(region, connected_realm_id):
+    """
+    Lê os metadados do snapshot de leilões de um reino conectado.
+
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        connected_realm_id (int): ID do reino conectado
+
+    Returns:
+        dict: snapshot, last_modified, etag, fetched_at, checked_at e rows (ou None)
+    """
+    return local_cache.read_json(os.path.join(_snapshot_root(region, connected_realm_id), "meta.json"))
+
+def _is_current_snapshot(region, connected_realm_id, meta):
+    """Indica se meta ainda é o snapshot atual (ou seja, se o diretório dele não foi removido)."""
+    current = load_auction_snapshot_meta(region, connected_realm_id)
+    return current is not None and current.get("snapshot") == meta["snapshot"]
+
+def load_auction_snapshot(region, connected_realm_id, meta=None):
+    """
+    Lê o snapshot de leilões de um reino conectado (colunas mapeadas em memória).
+
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        connected_realm_id (int): ID do reino conectado
+        meta (dict): Metadados já lidos (opcional)
+
+    Returns:
+        DataFrame: Leilões em formato colunar (ou None se não houver snapshot)
+    """
+    meta = meta or load_auction_snapshot_meta(region, connected_realm_id)
+    if not meta:
+        return None
+    return local_cache.load_columns(os.path.join(_snapshot_root(region, connected_realm_id), meta["snapshot"]))
+
+def save_auction_snapshot(region, connected_realm_id, auctions, last_modified=None, etag=None):
+    """
+    Grava um novo snapshot de leilões e remove o anterior.
+
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        connected_realm_id (int): ID do reino conectado
+        auctions (DataFrame): Leilões em formato colunar
+        last_modified (str): Cabeçalho Last-Modified da resposta
+        etag (str): Cabeçalho ETag da resposta
+
+    Returns:
+        dict: Metadados do novo snapshot
+    """
+    root = _snapshot_root(region, connected_realm_id)
+    previous = load_auction_snapshot_meta(region, connected_realm_id)
+
+    now = time.time()
+    snapshot = str(int(now * 1000))
+    local_cache.save_columns(os.path.join(root, snapshot), auctions)
+
+    meta = {
+        "snapshot": snapshot,
+        "last_modified": last_modified,
+        "etag": etag,
+        "fetched_at": now,
+        "checked_at": now,
+        "rows": len(auctions),
+    }
+    local_cache.write_json(os.path.join(root, "meta.json"), meta)
+
+    if previous and previous.get("snapshot") != snapshot:
+        local_cache.remove_tree(os.path.join(root, previous["snapshot"]))
+    return meta
+
+def touch_auction_snapshot(region, connected_realm_id, meta):
+    """
+    Registra que o snapshot foi confirmado como atual (ex: resposta 304).
+
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        connected_realm_id (int): ID do reino conectado
+        meta (dict): Metadados do snapshot
+
+    Returns:
+        dict: Metadados atualizados
+    """
+    meta = dict(meta, checked_at=time.time())
+    local_cache.write_json(os.path.join(_snapshot_root(region, connected_realm_id), "meta.json"), meta)
+    return meta
+
+def _sorted_groups(item_ids, values):
+    """
+    Ordena valores por item e retorna o início e o tamanho de cada grupo.
+
+    Returns:
+        tuple: (item_ids ordenados, valores ordenados, ordem, inícios dos grupos, tamanhos dos grupos)
+    """
+    order = np.lexsort((values, item_ids))
+    item_ids = item_ids[order]
+    values = values[order]
+    starts = np.flatnonzero(np.r_[True, item_ids[1:] != item_ids[:-1]]) if len(item_ids) else np.array([], dtype=np.int64)
+    counts = np.diff(np.r_[starts, len(item_ids)])
+    return item_ids, values, order, starts, counts
+
+def _group_percentile(values, starts, counts, q):
+    """Percentil q (0-1) de cada grupo de valores já ordenados, com interpolação linear."""
+    position = starts + (counts - 1) * q
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+def build_price_index(auctions):
+    """
+    Calcula o índice de preços por item a partir de todos os leilões.
+
+    Os preços são por unidade (price / quantity), em copper. Leilões sem preço
+    de compra (apenas lance) são ignorados.
+
+    Args:
+        auctions (DataFrame): Leilões em formato colunar
+
+    Returns:
+        DataFrame: item_id, min, p10, median, p90, total_quantity e auction_count
+    """
+    price = auctions["price"].to_numpy()
+    mask = price > 0
+    item_ids = auctions["item_id"].to_numpy()[mask]
+    quantity = auctions["quantity"].to_numpy()[mask].astype(np.int64)
+    unit_price = price[mask] / quantity
+
+    item_ids, unit_price, order, starts, counts = _sorted_groups(item_ids, unit_price)
+    quantity = quantity[order]
+
+    return pd.DataFrame({
+        "item_id": item_ids[starts],
+        "min": unit_price[starts],
+        "p10": _group_percentile(unit_price, starts, counts, 0.1),
+        "median": _group_percentile(unit_price, starts, counts, 0.5),
+        "p90": _group_percentile(unit_price, starts, counts, 0.9),
+        "total_quantity": np.add.reduceat(quantity, starts) if len(starts) else np.array([], dtype=np.int64),
+        "auction_count": counts,
+    })
+
+def load_price_index(region, connected_realm_id, meta, auctions=None):
+    """
+    Retorna o índice de preços do snapshot, calculando-o e gravando-o na primeira vez.
+
+    Deve ser chamado com o lock do snapshot do reino (ver wow.get_auction_snapshot).
+    Se o snapshot já foi substituído, o índice é calculado mas não é gravado,
+    para não recriar o diretório do snapshot removido.
+
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        connected_realm_id (int): ID do reino conectado
+        meta (dict): Metadados do snapshot
+        auctions (DataFrame): Leilões do snapshot (lidos do disco se omitido)
+
+    Returns:
+        DataFrame: Índice de preços (ver build_price_index)
+    """
+    directory = os.path.join(_snapshot_root(region, connected_realm_id), meta["snapshot"], "price_index")
+    index = local_cache.load_columns(directory)
+    if index is None:
+        if auctions is None:
+            auctions = load_auction_snapshot(region, connected_realm_id, meta)
+        index = build_price_index(auctions)
+        if _is_current_snapshot(region, connected_realm_id, meta):
+            local_cache.save_columns(directory, index)
+    return index
+
+def _depth_frame(item_ids, buckets, quantity, auction_count, step):
+    """Monta o DataFrame do histograma de profundidade, ordenado por item e faixa de preço."""
+    order = np.lexsort((buckets, item_ids))
+    item_ids = item_ids[order]
+    buckets = buckets[order]
+    quantity = quantity[order]
+    starts = np.flatnonzero(np.r_[True, item_ids[1:] != item_ids[:-1]]) if len(item_ids) else np.array([], dtype=np.int64)
+    cumulative = np.cumsum(quantity)
+    if len(starts):
+        # Reinicia a soma acumulada no início de cada item
+        offsets = np.r_[0, cumulative[starts[1:] - 1]]
+        cumulative = cumulative - np.repeat(offsets, np.diff(np.r_[starts, len(item_ids)]))
+
+    base = 1 + step
+    return pd.DataFrame({
+        "item_id": item_ids.astype(np.int32),
+        "bucket": buckets.astype(np.int32),
+        "price_low": np.power(base, buckets.astype(np.float64)),
+        "price_high": np.power(base, buckets.astype(np.float64) + 1),
+        "quantity": quantity,
+        "auction_count": auction_count[order],
+        "cumulative_quantity": cumulative,
+    })
+
+def build_price_depth(auctions, step=PRICE_DEPTH_STEP):
+    """
+    Calcula o histograma de profundidade de preço a partir de leilões já em formato colunar.
+
+    Produz o mesmo resultado que PriceDepthHistogram, de forma vetorizada.
+
+    Args:
+        auctions (DataFrame): Leilões em formato colunar
+        step (float): Largura relativa de cada faixa de preço
+
+    Returns:
+        DataFrame: Histograma de profundidade (ver PriceDepthHistogram.to_frame)
+    """
+    price = auctions["price"].to_numpy()
+    mask = price > 0
+    item_ids = auctions["item_id"].to_numpy()[mask].astype(np.int64)
+    quantity = auctions["quantity"].to_numpy()[mask].astype(np.int64)
+    buckets = np.floor(np.log(price[mask] / quantity) / math.log1p(step)).astype(np.int64)
+
+    keys, inverse = np.unique(np.stack([item_ids, buckets], axis=1), axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    keys = keys.reshape(-1, 2)
+    totals = np.bincount(inverse, weights=quantity, minlength=len(keys)).astype(np.int64)
+    counts = np.bincount(inverse, minlength=len(keys)).astype(np.int64)
+    return _depth_frame(keys[:, 0], keys[:, 1], totals, counts, step)
+
+def load_price_depth(region, connected_realm_id, meta, auctions=None, depth=None):
+    """
+    Retorna o histograma de profundidade de preço do snapshot.
+
+    Assim como load_price_index, deve ser chamado com o lock do snapshot do
+    reino e só grava o histograma se o snapshot ainda for o atual.
+
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        connected_realm_id: ID do reino conectado (ou COMMODITIES)
+        meta (dict): Metadados do snapshot
+        auctions (DataFrame): Leilões do snapshot (lidos do disco se omitido)
+        depth (DataFrame): Histograma calculado durante a decodificação, a gravar (opcional)
+
+    Returns:
+        DataFrame: Histograma de profundidade (ver PriceDepthHistogram.to_frame)
+    """
+    directory = os.path.join(_snapshot_root(region, connected_realm_id), meta["snapshot"], "price_depth")
+    if depth is None:
+        depth = local_cache.load_columns(directory)
+        if depth is not None:
+            return depth
+        if auctions is None:
+            auctions = load_auction_snapshot(region, connected_realm_id, meta)
+        depth = build_price_depth(auctions)
+    if _is_current_snapshot(region, connected_realm_id, meta):
+        local_cache.save_columns(directory, depth)
+    return depth
+
+def price_depth_to_records(depth, item_id, max_buckets=None):
+    """
+    Converte o histograma de profundidade de um item em lista de dicionários.
+
+    Args:
+        depth (DataFrame): Histograma de profundidade
+        item_id (int): ID do item
+        max_buckets (int): Número máximo de faixas, a partir do menor preço (opcional)
+
+    Returns:
+        list: Faixas com preços em gold, quantidade e quantidade acumulada
+    """
+    item_ids = depth["item_id"].to_numpy()
+    start, end = np.searchsorted(item_ids, [item_id, item_id + 1])
+    rows = depth.iloc[start:end]
+    if max_buckets is not None:
+        rows = rows.head(max_buckets)
+
+    return [
+        {
+            "Min Price (Gold)": round(row.price_low / 10000, 4),
+            "Max Price (Gold)": round(row.price_high / 10000, 4),
+            "Quantity": int(row.quantity),
+            "Auction Count": int(row.auction_count),
+            "Cumulative Quantity": int(row.cumulative_quantity),
+        }
+        for row in rows.itertuples(index=False)
+    ]
+
+def price_index_to_records(index, limit=None):
+    """
+    Converte o índice de preços na lista de dicionários retornada pelas ferramentas.
+
+    Args:
+        index (DataFrame): Índice de preços
+        limit (int): Número máximo de itens (opcional)
+
+    Returns:
+        list: Itens com preços em gold, quantidade total e número de leilões
+    """
+    if limit is not None:
+        index = index.head(limit)
+
+    return [
+        {
+            "Item ID": int(row.item_id),
+            "Min Price (Gold)": round(row.min / 10000, 4),
+            "P10 Price (Gold)": round(row.p10 / 10000, 4),
+            "Median Price (Gold)": round(row.median / 10000, 4),
+            "P90 Price (Gold)": round(row.p90 / 10000, 4),
+            "Total Quantity": int(row.total_quantity),
+            "Auction Count": int(row.auction_count),
+        }
+        for row in index.itertuples(index=False)
+    ]
+
+def build_price_spreads(indexes):
+    """
+    Compara os índices de preços de vários reinos conectados item a item.
+
+    A comparação usa o menor preço por unidade de cada reino (o preço pelo
+    qual o item pode ser comprado), em copper.
+
+    Args:
+        indexes (dict): {ID do reino conectado: índice de preços (ver build_price_index)}
+
+    Returns:
+        DataFrame: item_id, realm_count, min, min_realm, median, max, max_realm,
+                   spread, spread_pct e total_quantity
+    """
+    indexes = {realm: index for realm, index in indexes.items() if index is not None and len(index)}
+    if not indexes:
+        return pd.DataFrame(columns=[
+            "item_id", "realm_count", "min", "min_realm", "median", "max", "max_realm",
+            "spread", "spread_pct", "total_quantity",
+        ])
+
+    item_ids = np.concatenate([index["item_id"].to_numpy() for index in indexes.values()])
+    prices = np.concatenate([index["min"].to_numpy() for index in indexes.values()])
+    quantity = np.concatenate([index["total_quantity"].to_numpy() for index in indexes.values()]).astype(np.int64)
+    realms = np.concatenate([
+        np.full(len(index), realm, dtype=np.int64) for realm, index in indexes.items()
+    ])
+
+    item_ids, prices, order, starts, counts = _sorted_groups(item_ids, prices)
+    realms = realms[order]
+    quantity = quantity[order]
+    ends = starts + counts - 1
+
+    spread = prices[ends] - prices[starts]
+    return pd.DataFrame({
+        "item_id": item_ids[starts],
+        "realm_count": counts,
+        "min": prices[starts],
+        "min_realm": realms[starts],
+        "median": _group_percentile(prices, starts, counts, 0.5),
+        "max": prices[ends],
+        "max_realm": realms[ends],
+        "spread": spread,
+        "spread_pct": np.divide(spread, prices[starts], out=np.zeros(len(starts)), where=prices[starts] > 0) * 100,
+        "total_quantity": np.add.reduceat(quantity, starts),
+    })
+
+def price_spreads_to_records(spreads, realm_names=None, limit=None):
+    """
+    Converte as diferenças de preço entre reinos na lista de dicionários retornada pelas ferramentas.
+
+    Args:
+        spreads (DataFrame): Resultado de build_price_spreads
+        realm_names (dict): Nomes dos reinos por ID do reino conectado (opcional)
+        limit (int): Número máximo de itens (opcional)
+
+    Returns:
+        list: Itens com menor e maior preço em gold, reinos correspondentes e diferença
+    """
+    realm_names = realm_names or {}
+    if limit is not None:
+        spreads = spreads.head(limit)
+
+    return [
+        {
+            "Item ID": int(row.item_id),
+            "Realm Count": int(row.realm_count),
+            "Min Price (Gold)": round(row.min / 10000, 4),
+            "Cheapest Realm": realm_names.get(int(row.min_realm), int(row.min_realm)),
+            "Median Price (Gold)": round(row.median / 10000, 4),
+            "Max Price (Gold)": round(row.max / 10000, 4),
+            "Most Expensive Realm": realm_names.get(int(row.max_realm), int(row.max_realm)),
+            "Spread (Gold)": round(row.spread / 10000, 4),
+            "Spread (%)": round(float(row.spread_pct), 2),
+            "Total Quantity": int(row.total_quantity),
+        }
+        for row in spreads.itertuples(index=False)
+    ]
@@ -0,0 +1,173 @@
+import array
+
+import numpy as np
+import pandas as pd
+
+# Slots considerados no nível de item médio (camisa e tabardo não contam)
+EQUIPMENT_SLOTS = [
+    "HEAD", "NECK", "SHOULDER", "BACK", "CHEST", "WRIST", "HANDS", "WAIST",
+    "LEGS", "FEET", "FINGER_1", "FINGER_2", "TRINKET_1", "TRINKET_2", "MAIN_HAND", "OFF_HAND",
+]
+_SLOT_INDEX = {slot: index for index, slot in enumerate(EQUIPMENT_SLOTS)}
+_MAIN_HAND = _SLOT_INDEX["MAIN_HAND"]
+_OFF_HAND = _SLOT_INDEX["OFF_HAND"]
+
+# Tipos de inventário que ocupam as duas mãos (contam duas vezes no nível médio)
+TWO_HAND_TYPES = {"TWOHWEAPON", "RANGED", "RANGEDRIGHT"}
+
+class EquipmentStore:
+    """
+    Equipamentos de muitos personagens normalizados em arrays.
+
+    Cada item equipado vira uma linha com o índice do personagem, o slot, o
+    ID e o nível do item e o conjunto (set) ao qual pertence.
+    """
+
+    def __init__(self):
+        self.characters = []
+        self._character = array.array("i")
+        self._slot = array.array("b")
+        self._item_id = array.array("i")
+        self._item_level = array.array("h")
+        self._set_id = array.array("i")
+        self._set_bonuses = array.array("b")
+        self._two_hand = array.array("b")
+
+    def __len__(self):
+        return len(self.characters)
+
+    def add_character(self, character, equipment):
+        """
+        Adiciona os equipamentos de um personagem.
+
+        Args:
+            character (dict): Identificação do personagem (ex: Name, Realm)
+            equipment (list): Itens no formato retornado por get_character_equipment
+        """
+        index = len(self.characters)
+        self.characters.append(character)
+        two_hand = False
+        for item in equipment:
+            slot = _SLOT_INDEX.get(item.get("Slot Type"))
+            if slot is None:
+                continue
+            self._character.append(index)
+            self._slot.append(slot)
+            self._item_id.append(int(item.get("Item ID") or 0))
+            self._item_level.append(int(item.get("Item Level") or 0))
+            self._set_id.append(int(item.get("Set ID") or 0))
+            self._set_bonuses.append(int(item.get("Set Active Bonuses") or 0))
+            if slot == _MAIN_HAND and item.get("Inventory Type") in TWO_HAND_TYPES:
+                two_hand = True
+        self._two_hand.append(two_hand)
+
+    def to_frame(self):
+        """
+        Retorna todos os itens em formato colunar.
+
+        Returns:
+            DataFrame: character, slot, item_id, item_level, set_id e set_bonuses
+        """
+        return pd.DataFrame({
+            "character": np.frombuffer(self._character, dtype=np.int32),
+            "slot": pd.Categorical.from_codes(np.frombuffer(self._slot, dtype=np.int8), categories=EQUIPMENT_SLOTS),
+            "item_id": np.frombuffer(self._item_id, dtype=np.int32),
+            "item_level": np.frombuffer(self._item_level, dtype=np.int16),
+            "set_id": np.frombuffer(self._set_id, dtype=np.int32),
+            "set_bonuses": np.frombuffer(self._set_bonuses, dtype=np.int8),
+        })
+
+    def item_level_matrix(self):
+        """
+        Monta a matriz personagem x slot com o nível de cada item (NaN para slot vazio).
+
+        Armas de duas mãos também ocupam a mão secundária, como no cálculo da Blizzard.
+
+        Returns:
+            np.ndarray: Matriz float (personagens x EQUIPMENT_SLOTS)
+        """
+        matrix = np.full((len(self.characters), len(EQUIPMENT_SLOTS)), np.nan)
+        matrix[np.frombuffer(self._character, dtype=np.int32), np.frombuffer(self._slot, dtype=np.int8)] = \
+            np.frombuffer(self._item_level, dtype=np.int16)
+
+        two_hand = np.frombuffer(self._two_hand, dtype=np.int8).astype(bool)
+        fill = two_hand & np.isnan(matrix[:, _OFF_HAND])
+        matrix[fill, _OFF_HAND] = matrix[fill, _MAIN_HAND]
+        return matrix
+
+    def set_pieces(self):
+        """
+        Conta as peças de cada conjunto (set) equipadas por personagem.
+
+        Returns:
+            DataFrame: character, set_id, pieces e active_bonuses
+        """
+        frame = self.to_frame()
+        frame = frame[frame["set_id"] > 0]
+        return (
+            frame.groupby(["character", "set_id"], sort=True)
+            .agg(pieces=("item_id", "size"), active_bonuses=("set_bonuses", "max"))
+            .reset_index()
+        )
+
+    def summary(self):
+        """
+        Calcula o resumo de equipamentos de todos os personagens de uma vez.
+
+        Returns:
+            list: Um dicionário por personagem com nível de item médio, menor
+                  nível, slot mais fraco, slots vazios e peças de conjunto
+        """
+        matrix = self.item_level_matrix()
+        empty = np.isnan(matrix)
+        filled = np.where(empty, 0, matrix)
+        # Slots vazios contam como nível 0, como no nível equipado da Blizzard
+        average = filled.sum(axis=1) / len(EQUIPMENT_SLOTS)
+        lowest = np.where(empty, np.inf, matrix)
+        lowest_slot = lowest.argmin(axis=1)
+        lowest_level = lowest.min(axis=1)
+
+        slots = np.array(EQUIPMENT_SLOTS)
+        pieces = self.set_pieces()
+        sets_by_character = {
+            character: group[["set_id", "pieces", "active_bonuses"]].to_dict("records")
+            for character, group in pieces.groupby("character")
+        }
+
+        rows = []
+        for index, character in enumerate(self.characters):
+            has_items = not empty[index].all()
+            rows.append({
+                **character,
+                "Average Item Level": round(float(average[index]), 2),
+                "Lowest Item Level": int(lowest_level[index]) if has_items else None,
+                "Lowest Slot": str(slots[lowest_slot[index]]) if has_items else None,
+                "Empty Slots": slots[empty[index]].tolist(),
+                "Set Pieces": [
+                    {key: int(value) for key, value in entry.items()}
+                    for entry in sets_by_character.get(index, [])
+                ],
+            })
+        return rows
+
+    def slot_report(self):
+        """
+        Resume cada slot no conjunto de personagens (nível médio e mínimo e quantos estão vazios).
+
+        Returns:
+            list: Um dicionário por slot
+        """
+        matrix = self.item_level_matrix()
+        empty = np.isnan(matrix)
+        counts = (~empty).sum(axis=0)
+        average = np.where(empty, 0, matrix).sum(axis=0) / np.maximum(counts, 1)
+        minimum = np.where(empty, np.inf, matrix).min(axis=0, initial=np.inf)
+        return [
+            {
+                "Slot": slot,
+                "Average Item Level": round(float(average[index]), 2) if counts[index] else None,
+                "Min Item Level": int(minimum[index]) if counts[index] else None,
+                "Empty Count": int(empty[:, index].sum()),
+            }
+            for index, slot in enumerate(EQUIPMENT_SLOTS)
+        ]
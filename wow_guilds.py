@@ -0,0 +1,145 @@
+import os
+import re
+import threading
+import time
+
+import local_cache
+
+# Número de snapshots mantidos por guilda
+GUILD_SNAPSHOT_HISTORY = int(os.getenv("WOW_GUILD_SNAPSHOT_HISTORY", "30"))
+
+# Campos comparados entre snapshots para detectar mudanças de um membro
+TRACKED_FIELDS = ("Rank", "Level", "Class", "Race")
+
+_guild_locks = {}
+_guild_locks_guard = threading.Lock()
+
+def _safe_name(name):
+    """Converte um nome em um componente de caminho seguro."""
+    return re.sub(r"[^\w\-]+", "-", str(name).strip().lower()).strip("-") or "_"
+
+def _guild_root(region, realm_slug, guild_name):
+    """Diretório com os snapshots do roster de uma guilda."""
+    return os.path.dirname(local_cache.cache_path(
+        "wow", "guilds", region, _safe_name(realm_slug), _safe_name(guild_name), "index.json"
+    ))
+
+def _guild_lock(region, realm_slug, guild_name):
+    """Lock que serializa a atualização do index.json de uma guilda."""
+    key = (region, _safe_name(realm_slug), _safe_name(guild_name))
+    with _guild_locks_guard:
+        return _guild_locks.setdefault(key, threading.Lock())
+
+def _member_key(member):
+    """Chave que identifica um membro entre snapshots (nome + reino)."""
+    realm = member.get("Realm Slug") or member.get("Realm") or ""
+    return f"{str(member.get('Name', '')).lower()}@{str(realm).lower()}"
+
+def list_guild_snapshots(region, realm_slug, guild_name):
+    """
+    Lista os snapshots de roster gravados para uma guilda.
+
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        realm_slug (str): Slug do reino
+        guild_name (str): Nome da guilda
+
+    Returns:
+        list: Snapshots (id, created_at, member_count), do mais antigo ao mais recente
+    """
+    return local_cache.read_json(os.path.join(_guild_root(region, realm_slug, guild_name), "index.json"), [])
+
+def load_guild_snapshot(region, realm_slug, guild_name, snapshot_id=None):
+    """
+    Lê um snapshot do roster de uma guilda.
+
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        realm_slug (str): Slug do reino
+        guild_name (str): Nome da guilda
+        snapshot_id (str): ID do snapshot (padrão: o mais recente)
+
+    Returns:
+        list: Membros no formato de get_guild_members (ou None se não existir)
+    """
+    if snapshot_id is None:
+        snapshots = list_guild_snapshots(region, realm_slug, guild_name)
+        if not snapshots:
+            return None
+        snapshot_id = snapshots[-1]["id"]
+    path = os.path.join(_guild_root(region, realm_slug, guild_name), f"{_safe_name(snapshot_id)}.json")
+    return local_cache.read_json(path)
+
+def save_guild_snapshot(region, realm_slug, guild_name, members):
+    """
+    Grava um snapshot do roster, a menos que seja igual ao mais recente.
+
+    A leitura e a regravação do index.json são feitas com o lock da guilda,
+    então gravações simultâneas da mesma guilda não perdem snapshots.
+
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        realm_slug (str): Slug do reino
+        guild_name (str): Nome da guilda
+        members (list): Membros no formato de get_guild_members
+
+    Returns:
+        str: ID do snapshot que representa o roster informado
+    """
+    root = _guild_root(region, realm_slug, guild_name)
+    with _guild_lock(region, realm_slug, guild_name):
+        snapshots = list_guild_snapshots(region, realm_slug, guild_name)
+
+        if snapshots:
+            latest = load_guild_snapshot(region, realm_slug, guild_name, snapshots[-1]["id"])
+            if latest is not None and not any(diff_guild_rosters(latest, members).values()):
+                return snapshots[-1]["id"]
+
+        now = time.time()
+        # IDs em milissegundos, sempre crescentes mesmo com duas gravações no mesmo milissegundo
+        snapshot_id = str(max(int(now * 1000), int(snapshots[-1]["id"]) + 1 if snapshots else 0))
+        local_cache.write_json(os.path.join(root, f"{snapshot_id}.json"), members)
+
+        snapshots.append({"id": snapshot_id, "created_at": now, "member_count": len(members)})
+        expired, snapshots = snapshots[:-GUILD_SNAPSHOT_HISTORY], snapshots[-GUILD_SNAPSHOT_HISTORY:]
+        local_cache.write_json(os.path.join(root, "index.json"), snapshots)
+
+    for snapshot in expired:
+        try:
+            os.remove(os.path.join(root, f"{snapshot['id']}.json"))
+        except OSError:
+            pass
+    return snapshot_id
+
+def diff_guild_rosters(old_members, new_members):
+    """
+    Compara dois rosters de guilda.
+
+    Args:
+        old_members (list): Roster anterior
+        new_members (list): Roster atual
+
+    Returns:
+        dict: joined (novos membros), left (membros que saíram) e changed
+              (membros com mudança de rank, nível, classe ou raça)
+    """
+    old_by_key = {_member_key(member): member for member in old_members}
+    new_by_key = {_member_key(member): member for member in new_members}
+
+    joined = [member for key, member in new_by_key.items() if key not in old_by_key]
+    left = [member for key, member in old_by_key.items() if key not in new_by_key]
+
+    changed = []
+    for key, member in new_by_key.items():
+        previous = old_by_key.get(key)
+        if previous is None:
+            continue
+        changes = {
+            field: {"from": previous.get(field), "to": member.get(field)}
+            for field in TRACKED_FIELDS
+            if previous.get(field) != member.get(field)
+        }
+        if changes:
+            changed.append({"Name": member.get("Name"), "Realm": member.get("Realm"), "Changes": changes})
+
+    return {"joined": joined, "left": left, "changed": changed}
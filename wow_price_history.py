@@ -0,0 +1,246 @@
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+import numpy as np
+import pandas as pd
+
+import local_cache
+
+# Dias durante os quais os pontos horários são mantidos antes de virarem um resumo diário
+HOURLY_RETENTION_DAYS = int(os.getenv("AUCTION_HISTORY_HOURLY_DAYS", "7"))
+
+# Colunas de cada ponto da série (uma linha por item por snapshot)
+POINT_COLUMNS = ("timestamp", "item_id", "min", "median", "total_quantity", "auction_count")
+
+def _history_root(region, connected_realm_id):
+    """Diretório com a série histórica de preços de um reino conectado."""
+    return os.path.dirname(local_cache.cache_path(
+        "wow", "price_history", region, connected_realm_id, "meta.json"
+    ))
+
+def _day(timestamp):
+    """Data (UTC, AAAA-MM-DD) de um timestamp Unix."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d")
+
+def _days_between(start, end):
+    """Datas (AAAA-MM-DD) de start até end, inclusive."""
+    first = datetime.fromtimestamp(start, tz=timezone.utc).date()
+    last = datetime.fromtimestamp(end, tz=timezone.utc).date()
+    return [(first + timedelta(days=offset)).isoformat() for offset in range((last - first).days + 1)]
+
+def snapshot_timestamp(meta):
+    """
+    Momento a que um snapshot de leilões se refere.
+
+    Usa o cabeçalho Last-Modified da API e, na falta dele, o momento do download.
+
+    Args:
+        meta (dict): Metadados do snapshot
+
+    Returns:
+        float: Timestamp Unix
+    """
+    if meta.get("last_modified"):
+        try:
+            return parsedate_to_datetime(meta["last_modified"]).timestamp()
+        except (TypeError, ValueError):
+            pass
+    return meta.get("fetched_at", time.time())
+
+def _save_partition(path, frame):
+    """Grava um DataFrame de pontos como .npz (uma entrada por coluna)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp.npz"
+    np.savez_compressed(tmp_path, **{column: frame[column].to_numpy() for column in frame.columns})
+    os.replace(tmp_path, path)
+
+def _load_partition(path, item_ids=None):
+    """Lê uma partição .npz, opcionalmente apenas as linhas dos itens informados."""
+    with np.load(path, allow_pickle=False) as data:
+        frame = pd.DataFrame({column: data[column] for column in data.files})
+    if item_ids is not None:
+        frame = frame[np.isin(frame["item_id"].to_numpy(), item_ids)]
+    return frame
+
+def record_snapshot(region, connected_realm_id, meta, price_index):
+    """
+    Acrescenta à série histórica os preços de um snapshot de leilões.
+
+    Cada snapshot vira um arquivo na partição horária do seu dia; snapshots
+    já registrados (mesmo Last-Modified ou mais antigos) são ignorados. Em
+    seguida os dias mais antigos que HOURLY_RETENTION_DAYS são resumidos.
+
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        connected_realm_id: ID do reino conectado (ou wow_auctions.COMMODITIES)
+        meta (dict): Metadados do snapshot
+        price_index (DataFrame): Índice de preços do snapshot (ver wow_auctions.build_price_index)
+
+    Returns:
+        bool: True se o snapshot foi acrescentado
+    """
+    root = _history_root(region, connected_realm_id)
+    history = local_cache.read_json(os.path.join(root, "meta.json"), {})
+    timestamp = snapshot_timestamp(meta)
+    if timestamp <= history.get("last_timestamp", float("-inf")):
+        return False
+
+    points = pd.DataFrame({
+        "timestamp": np.full(len(price_index), int(timestamp), dtype=np.int64),
+        "item_id": price_index["item_id"].to_numpy().astype(np.int32),
+        "min": price_index["min"].to_numpy().astype(np.float64),
+        "median": price_index["median"].to_numpy().astype(np.float64),
+        "total_quantity": price_index["total_quantity"].to_numpy().astype(np.int64),
+        "auction_count": price_index["auction_count"].to_numpy().astype(np.int64),
+    })
+    _save_partition(os.path.join(root, "hourly", _day(timestamp), f"{int(timestamp)}.npz"), points)
+
+    history["last_timestamp"] = timestamp
+    local_cache.write_json(os.path.join(root, "meta.json"), history)
+
+    downsample(region, connected_realm_id)
+    return True
+
+def _rollup(points):
+    """
+    Resume pontos horários em um ponto diário por item.
+
+    Returns:
+        DataFrame: day (timestamp da meia-noite UTC), item_id, min, median,
+                   total_quantity e auction_count (médias do dia) e samples
+    """
+    day = points["timestamp"].to_numpy() // 86400 * 86400
+    grouped = points.assign(timestamp=day).groupby(["timestamp", "item_id"], sort=True)
+    daily = grouped.agg(
+        min=("min", "min"),
+        median=("median", "median"),
+        total_quantity=("total_quantity", "mean"),
+        auction_count=("auction_count", "mean"),
+        samples=("min", "size"),
+    ).reset_index()
+    daily["total_quantity"] = daily["total_quantity"].round().astype(np.int64)
+    daily["auction_count"] = daily["auction_count"].round().astype(np.int64)
+    daily["samples"] = daily["samples"].astype(np.int64)
+    return daily
+
+def _load_hourly_day(directory, item_ids=None):
+    """Lê todos os pontos horários de um dia."""
+    files = sorted(name for name in os.listdir(directory) if name.endswith(".npz") and ".tmp" not in name)
+    frames = [_load_partition(os.path.join(directory, name), item_ids) for name in files]
+    if not frames:
+        return pd.DataFrame({column: [] for column in POINT_COLUMNS})
+    return pd.concat(frames, ignore_index=True)
+
+def downsample(region, connected_realm_id, retention_days=HOURLY_RETENTION_DAYS):
+    """
+    Converte os dias horários mais antigos que retention_days em resumos diários.
+
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        connected_realm_id: ID do reino conectado (ou wow_auctions.COMMODITIES)
+        retention_days (int): Dias de pontos horários mantidos
+
+    Returns:
+        list: Dias resumidos
+    """
+    hourly_root = os.path.join(_history_root(region, connected_realm_id), "hourly")
+    if not os.path.isdir(hourly_root):
+        return []
+
+    cutoff = _day(time.time() - retention_days * 86400)
+    rolled = []
+    for day in sorted(os.listdir(hourly_root)):
+        if day >= cutoff:
+            break
+        directory = os.path.join(hourly_root, day)
+        daily_path = os.path.join(_history_root(region, connected_realm_id), "daily", f"{day}.npz")
+        points = _load_hourly_day(directory)
+        if os.path.exists(daily_path):
+            # Pontos que chegaram depois de o dia já ter sido resumido
+            existing = _load_partition(daily_path)
+            points = pd.concat([_expand_daily(existing), points], ignore_index=True)
+        if len(points):
+            _save_partition(daily_path, _rollup(points))
+        local_cache.remove_tree(directory)
+        rolled.append(day)
+    return rolled
+
+def _expand_daily(daily):
+    """Converte um resumo diário de volta em pontos, preservando o número de amostras."""
+    repeats = daily["samples"].to_numpy()
+    return pd.DataFrame({column: np.repeat(daily[column].to_numpy(), repeats) for column in POINT_COLUMNS})
+
+def query(region, connected_realm_id, item_ids, start, end=None, resolution="daily"):
+    """
+    Consulta a série de preços de itens em um intervalo de tempo.
+
+    Apenas as partições dos dias do intervalo são lidas.
+
+    Args:
+        region (str): Região do servidor (us, eu, etc.)
+        connected_realm_id: ID do reino conectado (ou wow_auctions.COMMODITIES)
+        item_ids (list): IDs dos itens
+        start (float): Início do intervalo (timestamp Unix)
+        end (float): Fim do intervalo (padrão: agora)
+        resolution (str): "daily" (resumos diários, incluindo os dias ainda horários)
+                          ou "hourly" (apenas os pontos horários ainda mantidos)
+
+    Returns:
+        DataFrame: Pontos ordenados por item e tempo
+    """
+    end = end if end is not None else time.time()
+    root = _history_root(region, connected_realm_id)
+    item_ids = np.asarray(list(item_ids), dtype=np.int64)
+
+    frames = []
+    for day in _days_between(start, end):
+        hourly_dir = os.path.join(root, "hourly", day)
+        hourly = _load_hourly_day(hourly_dir, item_ids) if os.path.isdir(hourly_dir) else None
+        if resolution == "hourly":
+            if hourly is not None:
+                frames.append(hourly)
+            continue
+
+        daily_path = os.path.join(root, "daily", f"{day}.npz")
+        if os.path.exists(daily_path):
+            frames.append(_load_partition(daily_path, item_ids))
+        if hourly is not None and len(hourly):
+            frames.append(_rollup(hourly))
+
+    if not frames:
+        columns = POINT_COLUMNS if resolution == "hourly" else POINT_COLUMNS + ("samples",)
+        return pd.DataFrame({column: [] for column in columns})
+
+    points = pd.concat(frames, ignore_index=True)
+    if resolution != "hourly":
+        # Um mesmo dia pode ter resumo gravado e pontos horários novos
+        points = _rollup(_expand_daily(points)) if points.duplicated(["timestamp", "item_id"]).any() else points
+    else:
+        points = points[(points["timestamp"] >= start) & (points["timestamp"] <= end)]
+    return points.sort_values(["item_id", "timestamp"], kind="stable").reset_index(drop=True)
+
+def history_to_records(points):
+    """
+    Converte pontos da série na lista de dicionários retornada pelas ferramentas.
+
+    Args:
+        points (DataFrame): Resultado de query
+
+    Returns:
+        dict: {ID do item: lista de pontos com data e preços em gold}
+    """
+    series = {}
+    for row in points.itertuples(index=False):
+        entry = {
+            "Time": datetime.fromtimestamp(int(row.timestamp), tz=timezone.utc).isoformat(),
+            "Min Price (Gold)": round(row.min / 10000, 4),
+            "Median Price (Gold)": round(row.median / 10000, 4),
+            "Total Quantity": int(row.total_quantity),
+            "Auction Count": int(row.auction_count),
+        }
+        if hasattr(row, "samples"):
+            entry["Samples"] = int(row.samples)
+        series.setdefault(int(row.item_id), []).append(entry)
+    return series